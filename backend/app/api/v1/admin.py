@@ -0,0 +1,55 @@
+"""Admin API endpoints."""
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_cache
+from app.core.config import get_settings
+from app.core.database import engine, get_db, pool_stats, read_engine
+from app.core.timescale import storage_report
+
+settings = get_settings()
+
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Let a request through only with the configured ADMIN_API_KEY."""
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API disabled (ADMIN_API_KEY not set)")
+    if x_admin_key is None or not secrets.compare_digest(
+        x_admin_key.encode(), settings.ADMIN_API_KEY.encode(),
+    ):
+        raise HTTPException(status_code=401, detail="Invalid or missing X-Admin-Key")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+
+@router.get("/storage")
+async def get_storage(db: AsyncSession = Depends(get_db)):
+    """Get table and chunk sizes, before and after compression."""
+    return await storage_report(db)
+
+
+@router.get("/pool")
+async def get_pool():
+    """Get connection pool usage: checked out, overflow, checkout wait and timeouts."""
+    stats = pool_stats(engine)
+    if read_engine is not engine:
+        stats["replica"] = pool_stats(read_engine)
+    return stats
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Get result cache hits, misses and computations in this worker."""
+    return get_cache().stats()
+
+
+@router.delete("/cache")
+async def invalidate_cache(
+    prefix: str = Query("", description="Key prefix, e.g. forecast:USD/LYD"),
+):
+    """Drop cached results whose key starts with ``prefix`` (everything by default)."""
+    return {"invalidated": await get_cache().invalidate_prefix(prefix)}
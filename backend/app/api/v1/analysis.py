@@ -4,7 +4,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.services.analysis import AnalysisService
 from app.schemas.data import AnalysisResponseSchema
 
@@ -14,7 +14,7 @@ router = APIRouter()
 @router.get("/complete", response_model=AnalysisResponseSchema)
 async def get_complete_analysis(
     currency_pair: str = Query("USD/LYD"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get complete analysis including:
@@ -35,7 +35,7 @@ async def get_complete_analysis(
 @router.get("/signal")
 async def get_signal(
     currency_pair: str = Query("USD/LYD"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get buy/sell signal for a currency pair."""
     analysis_service = AnalysisService()
@@ -53,7 +53,7 @@ async def get_signal(
 
 @router.get("/panic-index")
 async def get_panic_index(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get current market panic index."""
     analysis_service = AnalysisService()
@@ -1,44 +1,177 @@
 """Data API endpoints."""
+import base64
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, literal_column, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models.data import TickData, DailyData, TelegramMessage
-from app.schemas.data import TickDataSchema, DailyDataSchema, TelegramMessageSchema
+from app.core.database import ReadSessionLocal, get_read_db
+from app.core.timescale import fetch_ohlc
+from app.models.data import Channel, TickData, DailyData, TelegramMessage
+from app.services.export import COLUMNAR_FORMATS, MEDIA_TYPES, arrow_available, export_chunks
+from app.services.price_state import Quote, get_price_state
+from app.schemas.data import (
+    TickDataSchema,
+    DailyDataSchema,
+    OHLCBarSchema,
+    TelegramMessageSchema,
+)
 
 router = APIRouter()
 
 
+def encode_cursor(timestamp: datetime, tick_id: int) -> str:
+    """Opaque keyset cursor for the tick just after (older than) this one."""
+    raw = f"{timestamp.isoformat()}|{tick_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; 400 on anything it did not produce."""
+    try:
+        timestamp, tick_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(tick_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def tick_range(currency_pair: str, start: datetime, end: Optional[datetime] = None) -> list:
+    """Filters for a pair's ticks from ``start`` (inclusive) to ``end`` (exclusive)."""
+    filters = [TickData.currency_pair == currency_pair, TickData.timestamp >= start]
+    if end is not None:
+        filters.append(TickData.timestamp < end)
+    return filters
+
+
+def select_ticks(*columns):
+    """SELECT of tick rows, with their channel's name as ``source_channel``."""
+    return (
+        select(
+            TickData.id, TickData.timestamp, TickData.currency_pair, TickData.price,
+            TickData.price_type, Channel.name.label("source_channel"), TickData.message_id,
+            *columns,
+        )
+        .select_from(TickData)
+        .join(Channel, Channel.id == TickData.source_channel)
+    )
+
+
 @router.get("/tick", response_model=list[TickDataSchema])
 async def get_tick_data(
+    response: Response,
     currency_pair: str = Query("USD/LYD"),
     hours: int = Query(24, ge=1, le=168),
-    db: AsyncSession = Depends(get_db),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(1000, ge=1, le=5000),
+    include_raw: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get tick data for the last N hours."""
-    cutoff = datetime.now() - timedelta(hours=hours)
+    """
+    Get tick data, newest first, optionally with each tick's message text.
     
-    result = await db.execute(
-        select(TickData)
-        .where(TickData.currency_pair == currency_pair)
-        .where(TickData.timestamp >= cutoff)
-        .order_by(TickData.timestamp.desc())
-        .limit(1000)
+    Covers the last N hours, or ``start``..``end`` when given. A full page
+    sets ``X-Next-Cursor``; pass it back as ``cursor`` for the next (older)
+    page, which seeks on (timestamp, id) instead of using an offset.
+    """
+    query = (
+        select_ticks()
+        .where(*tick_range(currency_pair, start or datetime.now() - timedelta(hours=hours), end))
+        .order_by(TickData.timestamp.desc(), TickData.id.desc())
+        .limit(limit)
     )
+    if cursor:
+        query = query.where(
+            tuple_(TickData.timestamp, TickData.id) < tuple_(*decode_cursor(cursor))
+        )
     
-    records = result.scalars().all()
-    return records
+    if not include_raw:
+        ticks = [TickDataSchema.model_validate(row) for row in (await db.execute(query)).all()]
+    else:
+        # Message text lives once in telegram_messages; join it only on request
+        result = await db.execute(
+            query.add_columns(TelegramMessage.text)
+            .outerjoin(
+                TelegramMessage,
+                and_(
+                    TelegramMessage.channel == Channel.name,
+                    TelegramMessage.message_id == TickData.message_id,
+                ),
+            )
+        )
+        ticks = [
+            TickDataSchema.model_validate(row).model_copy(update={"raw_message": row.text})
+            for row in result.all()
+        ]
+    
+    if len(ticks) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(ticks[-1].timestamp, ticks[-1].id)
+    return ticks
+
+
+def export_response(
+    table: str,
+    export_format: str,
+    currency_pair: str,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> StreamingResponse:
+    """Stream an export from a read session of its own, open for the whole response."""
+    if export_format in COLUMNAR_FORMATS and not arrow_available():
+        raise HTTPException(status_code=501, detail=f"{export_format} export needs pyarrow")
+    
+    async def chunks() -> AsyncIterator[bytes]:
+        async with ReadSessionLocal() as session:
+            async for chunk in export_chunks(
+                session, table, export_format, currency_pair, start, end,
+            ):
+                yield chunk
+    
+    filename = f"{table}_{currency_pair.replace('/', '')}.{export_format}"
+    return StreamingResponse(
+        chunks(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/tick/export")
+async def export_tick_data(
+    currency_pair: str = Query("USD/LYD"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    export_format: Literal["ndjson", "csv", "arrow", "parquet"] = Query("ndjson", alias="format"),
+):
+    """
+    Stream ticks oldest first as NDJSON, CSV, Arrow IPC or Parquet.
+    
+    Defaults to the last 24 hours; server memory stays constant whatever the
+    range, since rows are sent in batches as they are read.
+    """
+    start = start or datetime.now() - timedelta(hours=24)
+    return export_response("tick", export_format, currency_pair, start, end)
+
+
+@router.get("/daily/export")
+async def export_daily_data(
+    currency_pair: str = Query("USD/LYD"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    export_format: Literal["ndjson", "csv", "arrow", "parquet"] = Query("arrow", alias="format"),
+):
+    """Stream daily bars oldest first (all history by default) in any export format."""
+    return export_response("daily", export_format, currency_pair, start, end)
 
 
 @router.get("/daily", response_model=list[DailyDataSchema])
 async def get_daily_data(
     currency_pair: str = Query("USD/LYD"),
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get daily data for the last N days."""
     cutoff = datetime.now() - timedelta(days=days)
@@ -54,21 +187,42 @@ async def get_daily_data(
     return records
 
 
+@router.get("/ohlc", response_model=list[OHLCBarSchema])
+async def get_ohlc_data(
+    currency_pair: str = Query("USD/LYD"),
+    resolution: Literal["1m", "5m", "1h"] = Query("5m"),
+    hours: int = Query(24, ge=1, le=720),
+    limit: int = Query(1000, ge=1, le=5000),
+    price_type: Literal["buy", "sell", "mid"] = Query("mid"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get intraday OHLC bars of one side for the last N hours (oldest first)."""
+    end = datetime.now()
+    start = end - timedelta(hours=hours)
+    
+    return await fetch_ohlc(db, currency_pair, resolution, start, end, limit, price_type)
+
+
 @router.get("/messages", response_model=list[TelegramMessageSchema])
 async def get_telegram_messages(
     hours: int = Query(24, ge=1, le=168),
     limit: int = Query(100, ge=1, le=500),
-    db: AsyncSession = Depends(get_db),
+    price_only: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get recent Telegram messages."""
+    """Get recent Telegram messages, optionally only those quoting prices."""
     cutoff = datetime.now() - timedelta(hours=hours)
     
-    result = await db.execute(
+    query = (
         select(TelegramMessage)
         .where(TelegramMessage.timestamp >= cutoff)
         .order_by(TelegramMessage.timestamp.desc())
         .limit(limit)
     )
+    if price_only:
+        # A literal, not a bound parameter, so it matches the partial index
+        query = query.where(TelegramMessage.contains_price == literal_column("1"))
+    result = await db.execute(query)
     
     records = result.scalars().all()
     return records
@@ -77,25 +231,51 @@ async def get_telegram_messages(
 @router.get("/latest-price")
 async def get_latest_price(
     currency_pair: str = Query("USD/LYD"),
-    db: AsyncSession = Depends(get_db),
+    price_type: Optional[Literal["buy", "sell", "mid"]] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get the latest price for a currency pair."""
-    result = await db.execute(
-        select(TickData)
-        .where(TickData.currency_pair == currency_pair)
-        .order_by(TickData.timestamp.desc())
-        .limit(1)
-    )
+    """
+    Get the latest price for a currency pair, of any side or of one side.
     
-    record = result.scalar_one_or_none()
+    Served from the in-memory quote store where the scraper runs (hydrated
+    at startup), otherwise from the newest tick in the database.
+    """
+    price_state = get_price_state()
+    if price_state.hydrated:
+        quote = price_state.latest(currency_pair, price_type)
+        served_from = "memory"
+    else:
+        query = (
+            select_ticks()
+            .where(TickData.currency_pair == currency_pair)
+            .order_by(TickData.timestamp.desc())
+            .limit(1)
+        )
+        if price_type:
+            query = query.where(TickData.price_type == price_type)
+        record = (await db.execute(query)).one_or_none()
+        quote = record and Quote(
+            record.currency_pair, record.price_type, record.price,
+            record.timestamp, record.source_channel,
+        )
+        served_from = "database"
     
-    if not record:
-        return {"currency_pair": currency_pair, "price": None, "timestamp": None}
+    if not quote:
+        return {
+            "currency_pair": currency_pair,
+            "price": None,
+            "timestamp": None,
+            "stale": True,
+            "served_from": served_from,
+        }
     
     return {
         "currency_pair": currency_pair,
-        "price": record.price,
-        "price_type": record.price_type,
-        "timestamp": record.timestamp.isoformat(),
-        "source": record.source_channel,
+        "price": quote.price,
+        "price_type": quote.price_type,
+        "timestamp": quote.timestamp.isoformat(),
+        "source": quote.source_channel,
+        "age_seconds": round(price_state.age_seconds(quote), 1),
+        "stale": price_state.is_stale(quote),
+        "served_from": served_from,
     }
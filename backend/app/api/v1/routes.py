@@ -1,10 +1,11 @@
 """API v1 routes."""
 from fastapi import APIRouter
 
-from app.api.v1 import data, analysis, websocket
+from app.api.v1 import data, analysis, websocket, admin
 
 api_router = APIRouter()
 
 api_router.include_router(data.router, prefix="/data", tags=["data"])
 api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"])
 api_router.include_router(websocket.router, prefix="/ws", tags=["websocket"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
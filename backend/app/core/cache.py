@@ -0,0 +1,247 @@
+"""Result cache with TTLs, explicit invalidation and single-flight computation."""
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class MemoryBackend:
+    """Per-process backend: a dict of (expiry, value). Nothing is shared between workers."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._data: dict[str, tuple[float, bytes]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> bool:
+        if only_if_absent and self._live(key) is not None:
+            return False
+        self._data[key] = (self.clock() + ttl, value)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self._data.pop(key, None) is not None for key in keys)
+
+    async def keys(self, prefix: str) -> list[str]:
+        return [key for key in list(self._data) if key.startswith(prefix) and self._live(key)]
+
+
+class RedisBackend:
+    """Backend on a ``redis.asyncio`` client, shared by every worker using the same server."""
+
+    def __init__(self, client):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        import redis.asyncio as redis
+        return cls(redis.Redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float, only_if_absent: bool = False) -> bool:
+        return bool(await self.client.set(key, value, px=int(ttl * 1000), nx=only_if_absent))
+
+    async def delete(self, *keys: str) -> int:
+        return await self.client.delete(*keys) if keys else 0
+
+    async def keys(self, prefix: str) -> list[str]:
+        return [
+            key.decode() if isinstance(key, bytes) else key
+            async for key in self.client.scan_iter(match=f"{prefix}*")
+        ]
+
+
+class Cache:
+    """
+    JSON result cache in front of expensive computations.
+
+    Features:
+    - TTL per entry; explicit invalidation by key or prefix
+    - Single flight: concurrent misses for a key run one computation, within
+      a worker (a shared future) and across workers (a lock entry in the
+      backend; the others poll for the result until the lock expires)
+    - Fails open: backend errors are logged and the value is computed directly
+    - Hit/miss/compute counters
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        namespace: str = "terminal",
+        lock_ttl: Optional[float] = None,
+        poll_interval: float = 0.05,
+    ):
+        """Initialize the cache (in-process backend unless one is given)."""
+        self.backend = backend or MemoryBackend()
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl if lock_ttl is not None else settings.CACHE_LOCK_TTL_SECONDS
+        self.poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.computes = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def _read(self, key: str) -> tuple[bool, Any]:
+        try:
+            raw = await self.backend.get(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return False, None
+        return (False, None) if raw is None else (True, json.loads(raw))
+
+    async def get(self, key: str) -> Any:
+        """Return the cached value for ``key``, or None."""
+        return (await self._read(key))[1]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a JSON-serializable value for ``ttl`` seconds."""
+        try:
+            await self.backend.set(self._key(key), json.dumps(value).encode(), ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def invalidate(self, key: str) -> int:
+        """Drop one entry; returns how many were dropped."""
+        return await self.invalidate_keys([self._key(key)])
+
+    async def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with ``prefix``; returns how many."""
+        try:
+            keys = await self.backend.keys(self._key(prefix))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache scan failed for {prefix}: {e}")
+            return 0
+        return await self.invalidate_keys(keys)
+
+    async def invalidate_keys(self, keys: list[str]) -> int:
+        """Drop entries by their full (namespaced) keys."""
+        if not keys:
+            return 0
+        try:
+            return await self.backend.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache invalidation failed: {e}")
+            return 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        should_cache: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """Return the cached value, or compute it once (per key, across workers) and cache it."""
+        found, value = await self._read(key)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        # The computation is a task of its own, so cancelling the caller that
+        # started it (e.g. a disconnected client) does not fail the others
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_once(key, compute, ttl, should_cache))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._computed(key, done))
+        return await asyncio.shield(task)
+
+    def _computed(self, key: str, task: asyncio.Task):
+        """Forget a finished computation."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Callers re-raise it; don't warn when they have all gone
+            task.exception()
+
+    async def _compute_once(self, key, compute, ttl, should_cache) -> Any:
+        """Compute under the backend lock, or wait for the worker that holds it."""
+        lock_key = self._key(f"lock:{key}")
+        token = uuid.uuid4().hex.encode()
+        deadline = time.monotonic() + self.lock_ttl
+        while True:
+            try:
+                locked = await self.backend.set(lock_key, token, self.lock_ttl, only_if_absent=True)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Cache lock failed for {key}: {e}")
+                locked = True  # compute without coordination
+            if locked:
+                break
+            await asyncio.sleep(self.poll_interval)
+            found, value = await self._read(key)
+            if found:
+                self.hits += 1
+                return value
+            if time.monotonic() >= deadline:
+                # The holder died or is too slow; stop waiting for it
+                break
+
+        try:
+            self.computes += 1
+            value = await compute()
+            if should_cache(value):
+                await self.set(key, value, ttl)
+            return value
+        finally:
+            try:
+                # Only release our own lock (it may have expired and been retaken)
+                if await self.backend.get(lock_key) == token:
+                    await self.backend.delete(lock_key)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        """Return cache statistics."""
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "computes": self.computes,
+            "errors": self.errors,
+            "inflight": len(self._inflight),
+        }
+
+
+_cache: Optional[Cache] = None
+
+
+def get_cache() -> Cache:
+    """Return the process-wide Cache on the configured backend."""
+    global _cache
+    if _cache is None:
+        if settings.CACHE_BACKEND == "redis":
+            _cache = Cache(RedisBackend.from_url(settings.REDIS_URL))
+        else:
+            _cache = Cache(MemoryBackend())
+    return _cache
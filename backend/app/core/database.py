@@ -1,21 +1,104 @@
 """Database session and engine setup."""
+import time
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import exc, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import get_settings
+from app.core.metrics import LatencyRecorder
 
 settings = get_settings()
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how often they time out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyRecorder()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.record(time.perf_counter() - started)
+
+
+def engine_options(url: str) -> dict:
+    """Pool and driver options from settings for an engine on ``url``."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    options = {
+        "poolclass": InstrumentedPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        # asyncpg's own prepared statement cache and SQLAlchemy's one on top
+        # of it; both must be 0 behind pgbouncer in transaction mode
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """Return live pool usage: checked out connections, overflow and checkout wait."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedPool):
+        return {"pool": type(pool).__name__}
+
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "capacity": pool.size() + pool._max_overflow,
+        "timeouts": pool.timeouts,
+        "checkout_wait": pool.checkout_wait.snapshot(),
+    }
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    """Create an async engine on ``url`` with the configured pool options."""
+    return create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        future=True,
+        **engine_options(url),
+    )
+
+
+# Primary engine: ingestion, syncs and anything that writes
+engine = create_engine_for(settings.DATABASE_URL)
+
+# Read-only API work goes to the replica when one is configured
+read_engine = (
+    create_engine_for(settings.DATABASE_READ_URL)
+    if settings.DATABASE_READ_URL else engine
 )
 
-# Create async session maker
+# Create async session makers
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -24,6 +107,14 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
@@ -31,9 +122,18 @@ class Base(DeclarativeBase):
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Get database session."""
+    """Get database session on the primary."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get read-only database session (the replica if DATABASE_READ_URL is set)."""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
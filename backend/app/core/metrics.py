@@ -0,0 +1,48 @@
+"""Lightweight in-process metrics helpers."""
+from collections import deque
+from typing import Optional
+
+
+class LatencyRecorder:
+    """
+    Bounded recorder for latency samples (in seconds).
+
+    Keeps the most recent ``maxlen`` samples so percentiles reflect current
+    behaviour and memory stays constant for long-running services.
+    """
+
+    def __init__(self, maxlen: int = 2048):
+        """Initialize the recorder."""
+        self.samples: deque[float] = deque(maxlen=maxlen)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Record a single latency sample."""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the given percentile (0-100) of the retained samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    def snapshot(self) -> dict:
+        """Return a summary in milliseconds, suitable for JSON responses."""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(50)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
@@ -0,0 +1,416 @@
+"""TimescaleDB setup (hypertables, continuous aggregates) and OHLC bar queries."""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import get_settings
+from app.models.data import TickData
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class OHLCResolution:
+    """A bar size: its continuous aggregate, bucket SQL and refresh policy."""
+
+    view: str
+    interval: str
+    # Plain PostgreSQL bucket expression over tick_data.timestamp
+    truncate: str
+    start_offset: str
+    end_offset: str
+    schedule: str
+
+
+OHLC_RESOLUTIONS = {
+    "1m": OHLCResolution(
+        view="tick_ohlc_1m",
+        interval="1 minute",
+        truncate="date_trunc('minute', timestamp)",
+        start_offset="2 hours",
+        end_offset="1 minute",
+        schedule="1 minute",
+    ),
+    "5m": OHLCResolution(
+        view="tick_ohlc_5m",
+        interval="5 minutes",
+        truncate=(
+            "date_trunc('hour', timestamp)"
+            " + floor(date_part('minute', timestamp) / 5) * interval '5 minutes'"
+        ),
+        start_offset="6 hours",
+        end_offset="5 minutes",
+        schedule="5 minutes",
+    ),
+    "1h": OHLCResolution(
+        view="tick_ohlc_1h",
+        interval="1 hour",
+        truncate="date_trunc('hour', timestamp)",
+        start_offset="3 days",
+        end_offset="1 hour",
+        schedule="30 minutes",
+    ),
+}
+
+HYPERTABLES = [
+    ("tick_data", "timestamp", "1 day"),
+    ("daily_data", "date", "7 days"),
+]
+
+# Set by setup_timescale; read by the OHLC queries and the storage report
+_timescale_ready = False
+_aggregates_ready = False
+
+
+def timescale_available() -> bool:
+    """True if the TimescaleDB extension is installed and set up."""
+    return settings.TIMESCALE_ENABLED and _timescale_ready
+
+
+def aggregates_available() -> bool:
+    """True if OHLC bars can be read from the continuous aggregates."""
+    return settings.TIMESCALE_ENABLED and _aggregates_ready
+
+
+def continuous_aggregate_sql(resolution: OHLCResolution) -> str:
+    """CREATE statement for one OHLC continuous aggregate."""
+    # materialized_only = false: the newest, not yet refreshed buckets are
+    # computed from raw ticks at query time, so charts are never stale
+    return f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {resolution.view}
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            time_bucket(INTERVAL '{resolution.interval}', timestamp) AS bucket,
+            currency_pair,
+            price_type,
+            first(price, timestamp) AS open,
+            max(price) AS high,
+            min(price) AS low,
+            last(price, timestamp) AS close,
+            count(*) AS ticks
+        FROM tick_data
+        GROUP BY bucket, currency_pair, price_type
+        WITH NO DATA;
+    """
+
+
+def refresh_policy_sql(resolution: OHLCResolution) -> str:
+    """Refresh policy for one OHLC continuous aggregate."""
+    return f"""
+        SELECT add_continuous_aggregate_policy('{resolution.view}',
+            start_offset => INTERVAL '{resolution.start_offset}',
+            end_offset => INTERVAL '{resolution.end_offset}',
+            schedule_interval => INTERVAL '{resolution.schedule}',
+            if_not_exists => TRUE
+        );
+    """
+
+
+def compression_sql(days: int) -> list[str]:
+    """
+    Statements enabling native compression of tick_data chunks older than ``days``.
+
+    Segmenting by currency_pair keeps each pair's ticks together, so a
+    pair's cold range decompresses only its own segments.
+    """
+    return [
+        """
+        ALTER TABLE tick_data SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'currency_pair',
+            timescaledb.compress_orderby = 'timestamp DESC'
+        );
+        """,
+        f"""
+        SELECT add_compression_policy('tick_data',
+            compress_after => INTERVAL '{days} days',
+            if_not_exists => TRUE
+        );
+        """,
+    ]
+
+
+async def _compression_enabled(conn: AsyncConnection, table: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT compression_enabled FROM timescaledb_information.hypertables "
+            "WHERE hypertable_name = :table"
+        ),
+        {"table": table},
+    )
+    return bool(result.scalar())
+
+
+async def _apply_compression(conn: AsyncConnection):
+    """Enable or remove the tick_data compression policy per settings."""
+    days = settings.TIMESCALE_COMPRESS_AFTER_DAYS
+    if days <= 0:
+        await conn.execute(text(
+            "SELECT remove_compression_policy('tick_data', if_exists => TRUE);"
+        ))
+        return
+
+    alter, policy = compression_sql(days)
+    # Compression settings cannot be re-applied once chunks are compressed
+    if not await _compression_enabled(conn, "tick_data"):
+        await conn.execute(text(alter))
+    # A changed interval replaces the old policy
+    await conn.execute(text(
+        "SELECT remove_compression_policy('tick_data', if_exists => TRUE);"
+    ))
+    await conn.execute(text(policy))
+    logger.info(f"tick_data chunks older than {days} days will be compressed")
+
+
+async def _view_exists(conn: AsyncConnection, view: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT 1 FROM timescaledb_information.continuous_aggregates "
+            "WHERE view_name = :view"
+        ),
+        {"view": view},
+    )
+    return result.first() is not None
+
+
+async def _view_has_column(conn: AsyncConnection, view: str, column: str) -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = :view AND column_name = :column"
+        ),
+        {"view": view, "column": column},
+    )
+    return result.first() is not None
+
+
+async def setup_timescale(engine: AsyncEngine) -> bool:
+    """
+    Enable TimescaleDB, create hypertables, compression and OHLC continuous aggregates.
+
+    Runs in autocommit mode so a missing extension cannot roll back anything
+    else (and so the initial aggregate refresh, which cannot run inside a
+    transaction, works). Returns False if TimescaleDB is unavailable.
+    """
+    global _timescale_ready, _aggregates_ready
+
+    if not settings.TIMESCALE_ENABLED:
+        logger.info("TimescaleDB disabled; OHLC bars use plain GROUP BY queries")
+        return False
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;"))
+        except Exception as e:
+            logger.warning(f"TimescaleDB not available (using standard tables): {e}")
+            return False
+
+        for table, column, chunk in HYPERTABLES:
+            try:
+                await conn.execute(text(f"""
+                    SELECT create_hypertable('{table}', '{column}',
+                        if_not_exists => TRUE,
+                        migrate_data => TRUE,
+                        chunk_time_interval => INTERVAL '{chunk}'
+                    );
+                """))
+            except Exception as e:
+                logger.warning(f"Could not create hypertable {table}: {e}")
+        _timescale_ready = True
+
+        try:
+            await _apply_compression(conn)
+        except Exception as e:
+            logger.warning(f"Could not set up tick_data compression: {e}")
+
+        try:
+            for resolution in OHLC_RESOLUTIONS.values():
+                created = not await _view_exists(conn, resolution.view)
+                if not created and not await _view_has_column(conn, resolution.view, "price_type"):
+                    # Bars of older versions mixed buy, sell and mid ticks; rebuild them
+                    await conn.execute(text(f"DROP MATERIALIZED VIEW {resolution.view} CASCADE;"))
+                    created = True
+                await conn.execute(text(continuous_aggregate_sql(resolution)))
+                if created:
+                    # Materialize existing history once; the policy keeps up after
+                    await conn.execute(text(
+                        f"CALL refresh_continuous_aggregate('{resolution.view}', NULL, NULL);"
+                    ))
+                await conn.execute(text(refresh_policy_sql(resolution)))
+        except Exception as e:
+            logger.warning(f"Could not create OHLC continuous aggregates: {e}")
+            return False
+
+    logger.info("TimescaleDB hypertables and OHLC continuous aggregates ready")
+    _aggregates_ready = True
+    return True
+
+
+def ohlc_sql(resolution: OHLCResolution, use_aggregate: bool) -> str:
+    """
+    SELECT of the latest ``:limit`` bars of one side (``:price_type``) of a
+    pair between ``:start`` and ``:end``.
+    """
+    if use_aggregate:
+        source = f"""
+            SELECT bucket, open, high, low, close, ticks
+            FROM {resolution.view}
+            WHERE currency_pair = :currency_pair AND price_type = :price_type
+              AND bucket >= :start AND bucket < :end
+        """
+    else:
+        # Same bars straight from tick_data: one row per bucket, not per tick
+        source = f"""
+            SELECT
+                {resolution.truncate} AS bucket,
+                (array_agg(price ORDER BY timestamp))[1] AS open,
+                max(price) AS high,
+                min(price) AS low,
+                (array_agg(price ORDER BY timestamp DESC))[1] AS close,
+                count(*) AS ticks
+            FROM tick_data
+            WHERE currency_pair = :currency_pair AND price_type = :price_type
+              AND timestamp >= :start AND timestamp < :end
+            GROUP BY 1
+        """
+    return f"""
+        SELECT * FROM ({source}) AS bars
+        ORDER BY bucket DESC
+        LIMIT :limit
+    """
+
+
+async def fetch_ohlc(
+    session: AsyncSession,
+    currency_pair: str,
+    resolution: str,
+    start: datetime,
+    end: datetime,
+    limit: int,
+    price_type: str = "mid",
+) -> list[dict]:
+    """Return OHLC bars of one side in time order, from the aggregates when available."""
+    use_aggregate = aggregates_available()
+    # Pair and side are stored as SMALLINT codes; bind them with the columns' types
+    columns = TickData.__table__.c
+    statement = text(ohlc_sql(OHLC_RESOLUTIONS[resolution], use_aggregate)).bindparams(
+        bindparam("currency_pair", type_=columns.currency_pair.type),
+        bindparam("price_type", type_=columns.price_type.type),
+    )
+    result = await session.execute(
+        statement,
+        {
+            "currency_pair": currency_pair,
+            "price_type": price_type,
+            "start": start,
+            "end": end,
+            "limit": limit,
+        },
+    )
+    bars = [
+        {
+            "timestamp": row.bucket,
+            "open": row.open,
+            "high": row.high,
+            "low": row.low,
+            "close": row.close,
+            "ticks": row.ticks,
+        }
+        for row in result
+    ]
+    bars.reverse()
+    return bars
+
+
+CHUNK_SIZES_SQL = """
+    SELECT
+        c.hypertable_name,
+        c.chunk_name,
+        c.range_start,
+        c.range_end,
+        c.is_compressed,
+        s.before_compression_total_bytes,
+        s.after_compression_total_bytes,
+        CASE WHEN c.is_compressed THEN s.after_compression_total_bytes
+             ELSE pg_total_relation_size(format('%I.%I', c.chunk_schema, c.chunk_name)::regclass)
+        END AS total_bytes
+    FROM timescaledb_information.chunks c
+    LEFT JOIN LATERAL chunk_compression_stats(
+        format('%I.%I', c.hypertable_schema, c.hypertable_name)::regclass
+    ) s ON s.chunk_schema = c.chunk_schema AND s.chunk_name = c.chunk_name
+    WHERE c.hypertable_name IN ('tick_data', 'daily_data')
+    ORDER BY c.hypertable_name, c.range_start
+"""
+
+TABLE_SIZES_SQL = """
+    SELECT
+        relname AS table_name,
+        pg_total_relation_size(c.oid) AS total_bytes
+    FROM pg_class c
+    WHERE relname IN ('tick_data', 'daily_data', 'telegram_messages') AND relkind = 'r'
+"""
+
+
+async def storage_report(session: AsyncSession) -> dict:
+    """
+    Report table sizes and, with TimescaleDB, per-chunk sizes before and
+    after compression.
+    """
+    report = {
+        "timescale": timescale_available(),
+        "policies": {
+            "compress_after_days": settings.TIMESCALE_COMPRESS_AFTER_DAYS,
+            "telegram_messages_retention_days": settings.TELEGRAM_MESSAGES_RETENTION_DAYS,
+        },
+        "tables": {},
+        "hypertables": {},
+        "chunks": [],
+    }
+
+    # A hypertable's parent table is empty; its size is the sum of its chunks
+    for row in await session.execute(text(TABLE_SIZES_SQL)):
+        report["tables"][row.table_name] = {"total_bytes": row.total_bytes}
+
+    if not report["timescale"]:
+        return report
+
+    for row in await session.execute(text(CHUNK_SIZES_SQL)):
+        before = row.before_compression_total_bytes
+        after = row.after_compression_total_bytes
+        report["chunks"].append({
+            "hypertable": row.hypertable_name,
+            "chunk": row.chunk_name,
+            "range_start": row.range_start,
+            "range_end": row.range_end,
+            "compressed": row.is_compressed,
+            "total_bytes": row.total_bytes,
+            "before_compression_bytes": before,
+            "after_compression_bytes": after,
+        })
+
+        table = report["hypertables"].setdefault(row.hypertable_name, {
+            "chunks": 0,
+            "compressed_chunks": 0,
+            "total_bytes": 0,
+            "before_compression_bytes": 0,
+            "after_compression_bytes": 0,
+        })
+        table["chunks"] += 1
+        table["total_bytes"] += row.total_bytes or 0
+        if row.is_compressed and before is not None:
+            table["compressed_chunks"] += 1
+            table["before_compression_bytes"] += before
+            table["after_compression_bytes"] += after or 0
+
+    for name, table in report["hypertables"].items():
+        report["tables"].setdefault(name, {})["total_bytes"] = table["total_bytes"]
+        table["compression_ratio"] = (
+            round(table["before_compression_bytes"] / table["after_compression_bytes"], 2)
+            if table["after_compression_bytes"] else None
+        )
+    return report
@@ -5,13 +5,21 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
 
+from app.core.cache import get_cache
 from app.core.config import get_settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, pool_stats
+from app.core.timescale import setup_timescale
 from app.api.v1.routes import api_router
+from app.models.data import Channel
 from app.services.telegram_scraper import TelegramPriceScraper
 from app.services.fulus_sync import FulusSyncService
+from app.services.panic_index import get_panic_window
+from app.services.price_state import get_price_state
+from app.services.rsi import get_rsi_engine
+from app.services.tick_buffer import get_tick_buffers
+from app.services.retention import RetentionService
+from app.services.text_processor import get_text_processor
 from app.api.websocket import ws_manager
 
 # Configure logging
@@ -26,6 +34,7 @@ settings = get_settings()
 # Global service instances
 telegram_scraper: TelegramPriceScraper = None
 fulus_sync: FulusSyncService = None
+retention: RetentionService = None
 
 
 async def init_database():
@@ -33,35 +42,14 @@ async def init_database():
     async with engine.begin() as conn:
         # Create tables
         await conn.run_sync(Base.metadata.create_all)
-        
-        # Enable TimescaleDB extension and create hypertables
-        try:
-            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;"))
-            
-            # Create hypertable for tick_data
-            await conn.execute(text("""
-                SELECT create_hypertable('tick_data', 'timestamp', 
-                    if_not_exists => TRUE,
-                    chunk_time_interval => INTERVAL '1 day'
-                );
-            """))
-            
-            # Create hypertable for daily_data
-            await conn.execute(text("""
-                SELECT create_hypertable('daily_data', 'date',
-                    if_not_exists => TRUE,
-                    chunk_time_interval => INTERVAL '7 days'
-                );
-            """))
-            
-            logger.info("TimescaleDB hypertables created successfully")
-        except Exception as e:
-            logger.warning(f"Could not create hypertables (using standard tables): {e}")
+    
+    # Hypertables and OHLC continuous aggregates (skipped without TimescaleDB)
+    await setup_timescale(engine)
 
 
 async def start_background_services():
     """Start background services."""
-    global telegram_scraper, fulus_sync
+    global telegram_scraper, fulus_sync, retention
     
     # Initialize Telegram scraper only if credentials are provided
     if settings.TELEGRAM_API_ID and settings.TELEGRAM_API_HASH:
@@ -88,6 +76,11 @@ async def start_background_services():
     # Run initial sync
     asyncio.create_task(run_initial_sync())
     
+    # Purge Telegram messages past their retention period
+    retention = RetentionService()
+    if retention.retention_days > 0:
+        asyncio.create_task(run_periodic_retention())
+    
     logger.info("Background services started")
 
 
@@ -97,7 +90,13 @@ async def run_telegram_scraper():
         from app.core.database import AsyncSessionLocal
         
         async with AsyncSessionLocal() as session:
+            # Serve latest prices, recent ticks and the panic index from memory from here on
+            await get_price_state().hydrate(session)
+            await get_panic_window().hydrate(session)
+            await get_tick_buffers().load(session)
+            get_rsi_engine().load(get_tick_buffers())
             await telegram_scraper.set_db_session(session)
+            await telegram_scraper.writer.preload(Channel)
             await telegram_scraper.start_listening()
     except Exception as e:
         logger.error(f"Error in Telegram scraper: {e}", exc_info=True)
@@ -136,12 +135,27 @@ async def run_periodic_sync():
         await asyncio.sleep(settings.FULUS_SYNC_INTERVAL_HOURS * 3600)
 
 
+async def run_periodic_retention():
+    """Run periodic retention of Telegram messages."""
+    from app.core.database import AsyncSessionLocal
+
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                await retention.set_db_session(session)
+                await retention.purge_telegram_messages()
+        except Exception as e:
+            logger.error(f"Error in retention run: {e}", exc_info=True)
+        await asyncio.sleep(settings.RETENTION_INTERVAL_HOURS * 3600)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     logger.info("Starting Libyan Financial Terminal API")
     await init_database()
+    await get_text_processor().start()
     await start_background_services()
     
     yield
@@ -150,6 +164,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down API")
     if telegram_scraper:
         await telegram_scraper.stop()
+    await get_text_processor().stop()
 
 
 # Create FastAPI app
@@ -186,7 +201,19 @@ async def root():
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    health_data = {"status": "healthy"}
+    if telegram_scraper:
+        health_data["ingest"] = telegram_scraper.get_stats()
+    health_data["text_processing"] = get_text_processor().stats()
+    health_data["database_pool"] = pool_stats(engine)
+    health_data["price_state"] = get_price_state().stats()
+    health_data["tick_buffers"] = get_tick_buffers().stats()
+    health_data["rsi"] = get_rsi_engine().stats()
+    health_data["panic_window"] = get_panic_window().stats()
+    health_data["cache"] = get_cache().stats()
+    if retention:
+        health_data["retention"] = retention.get_stats()
+    return health_data
 
 
 if __name__ == "__main__":
@@ -2,10 +2,22 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Float, Integer, DateTime, Text, Index, func
+from sqlalchemy import (
+    String, Float, Integer, SmallInteger, DateTime, Text, Index, Identity, bindparam, event,
+    func, select, text as sql_text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.models.types import CodedString, LookupKey
+
+# Append-only vocabularies: a value's SMALLINT code is its 1-based position
+CURRENCY_PAIRS = (
+    "USD/LYD", "EUR/LYD", "GBP/LYD", "TRY/LYD", "EGP/LYD",
+    "TND/LYD", "AED/LYD", "SAR/LYD", "CNY/LYD",
+)
+PRICE_TYPES = ("buy", "sell", "mid")
 
 
 class TickData(Base):
@@ -13,13 +25,20 @@ class TickData(Base):
     
     __tablename__ = "tick_data"
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    currency_pair: Mapped[str] = mapped_column(String(10), nullable=False, index=True)
+    # Identity rather than autoincrement, which SQLite rejects on composite keys
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    # Part of the primary key: a hypertable's unique keys must include its time column
+    timestamp: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    # Pair, side and channel are SMALLINT keys. Pair and side read and write as
+    # strings; the channel is written by name but reads as its ``channels`` id
+    currency_pair: Mapped[str] = mapped_column(
+        CodedString(CURRENCY_PAIRS), nullable=False, index=True,
+    )
     price: Mapped[float] = mapped_column(Float, nullable=False)
-    price_type: Mapped[str] = mapped_column(String(10), nullable=False)  # 'buy' or 'sell'
-    source_channel: Mapped[str] = mapped_column(String(100), nullable=False)
-    raw_message: Mapped[str] = mapped_column(Text, nullable=False)
+    price_type: Mapped[str] = mapped_column(CodedString(PRICE_TYPES), nullable=False)
+    source_channel: Mapped[int] = mapped_column(LookupKey("channels"), nullable=False)
+    # With source_channel, references telegram_messages (channel, message_id),
+    # which holds the message text
     message_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
     __table_args__ = (
@@ -35,8 +54,9 @@ class DailyData(Base):
     
     __tablename__ = "daily_data"
     
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    # Part of the primary key: a hypertable's unique keys must include its time column
+    date: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
     currency_pair: Mapped[str] = mapped_column(String(10), nullable=False, index=True)
     open: Mapped[float] = mapped_column(Float, nullable=False)
     high: Mapped[float] = mapped_column(Float, nullable=False)
@@ -45,8 +65,10 @@ class DailyData(Base):
     volume: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     source: Mapped[str] = mapped_column(String(50), default="fulus.ly")
     
+    # One row per pair and day; FulusSyncService upserts on it
     __table_args__ = (
         Index('ix_daily_data_date_pair', 'date', 'currency_pair'),
+        Index('uq_daily_data_pair_date', 'currency_pair', 'date', unique=True),
     )
     
     def __repr__(self) -> str:
@@ -59,7 +81,7 @@ class TelegramMessage(Base):
     __tablename__ = "telegram_messages"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    # Keep index=True here, it's the modern SQLAlchemy way
+    # The btree serves newest-first reads (ORDER BY timestamp DESC LIMIT n)
     timestamp: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
     channel: Mapped[str] = mapped_column(String(100), nullable=False)
     message_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -67,10 +89,83 @@ class TelegramMessage(Base):
     sentiment_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     contains_price: Mapped[bool] = mapped_column(Integer, default=0)
 
-    # REMOVE OR COMMENT OUT THE ENTIRE __table_args__ BLOCK BELOW
-    # __table_args__ = (
-    #     Index('ix_telegram_messages_timestamp', 'timestamp'),
-    # )
+    __table_args__ = (
+        # One row per post; the scraper inserts with ON CONFLICT DO NOTHING on it
+        Index('uq_telegram_messages_channel_message', 'channel', 'message_id', unique=True),
+        # Unordered time range scans (retention purges). Rows arrive in time
+        # order, so BRIN keeps one summary per block range: a few pages however
+        # large the table. It cannot return rows in order, hence the btree too
+        Index('ix_telegram_messages_timestamp_brin', 'timestamp', postgresql_using='brin'),
+        # Newest price-bearing messages, read straight off the index in order
+        Index(
+            'ix_telegram_messages_price_timestamp', 'timestamp',
+            postgresql_where=sql_text('contains_price = 1'),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TelegramMessage(id={self.id}, channel={self.channel})>"
+
+
+class Channel(Base):
+    """
+    Lookup table of Telegram channel names referenced by tick data.
+
+    Ids are assigned by ``insert_channels``, not a sequence: an identity
+    column loses a value on every conflicting insert and a SMALLINT one runs
+    out within days of ingest.
+    """
+
+    __tablename__ = "channels"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
 
     def __repr__(self) -> str:
-        return f"<TelegramMessage(id={self.id}, channel={self.channel})>"
\ No newline at end of file
+        return f"<Channel(id={self.id}, name={self.name})>"
+
+
+def insert_channels():
+    """
+    INSERT for ``channels`` rows given by name, taking the next id in the table.
+
+    Known names are skipped by ON CONFLICT DO NOTHING and consume nothing. A
+    concurrent insert taking the same id also makes the row a no-op; ticks
+    queued with it then fail NOT NULL and their batch is retried.
+    """
+    channels = Channel.__table__
+    next_id = select(func.coalesce(func.max(channels.c.id), 0) + 1).scalar_subquery()
+    # A Core insert: ORM bulk inserts do not take INSERT ... SELECT
+    return pg_insert(channels).from_select(
+        ["id", "name"], select(next_id, bindparam("name", type_=String)),
+    ).on_conflict_do_nothing()
+
+
+class CurrencyPair(Base):
+    """Lookup table of CURRENCY_PAIRS codes, for reading tick_data in SQL."""
+
+    __tablename__ = "currency_pairs"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(10), nullable=False, unique=True)
+
+
+class PriceType(Base):
+    """Lookup table of PRICE_TYPES codes, for reading tick_data in SQL."""
+
+    __tablename__ = "price_types"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(10), nullable=False, unique=True)
+
+
+def _seed(values: tuple[str, ...]):
+    def seed(target, connection, **kw):
+        connection.execute(target.insert(), [
+            {"id": code, "name": name} for code, name in enumerate(values, start=1)
+        ])
+    return seed
+
+
+event.listen(CurrencyPair.__table__, "after_create", _seed(CURRENCY_PAIRS))
+event.listen(PriceType.__table__, "after_create", _seed(PRICE_TYPES))
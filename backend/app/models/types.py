@@ -0,0 +1,62 @@
+"""Column types that store repeated strings as SMALLINT keys."""
+from sqlalchemy import Integer, SmallInteger, String, column, select, table, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+
+class CodedString(TypeDecorator):
+    """
+    A string from a fixed vocabulary, stored as its 1-based SMALLINT position.
+
+    The vocabulary is append-only: a value's code is its position, so values
+    must never be reordered or removed once rows use them.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, values: tuple[str, ...]):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values, start=1)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # Unknown values match no rows in filters and fail NOT NULL on insert
+        return self._codes.get(value)
+
+    def process_literal_param(self, value, dialect):
+        code = self.process_bind_param(value, dialect)
+        return "NULL" if code is None else str(code)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.values[value - 1]
+
+
+class LookupKey(TypeDecorator):
+    """
+    A string stored as the SMALLINT id of its row in a ``(id, name)`` lookup table.
+
+    Bound values are looked up in SQL as ``(SELECT id FROM <table> WHERE
+    name = :value)``, so inserts and filters use plain strings. Selected
+    columns are the raw id: readers that want the name join the lookup table
+    once per query rather than running a subquery per row. The lookup row
+    must exist before a row referencing it is inserted.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, lookup_table: str):
+        super().__init__()
+        self.lookup_table = lookup_table
+        self._lookup = table(lookup_table, column("id", Integer), column("name", String))
+
+    def bind_expression(self, bindvalue):
+        return (
+            select(self._lookup.c.id)
+            .where(self._lookup.c.name == type_coerce(bindvalue, String))
+            .scalar_subquery()
+        )
@@ -14,7 +14,8 @@ class TickDataSchema(BaseModel):
     price: float
     price_type: str
     source_channel: str
-    raw_message: str
+    # Only filled when requested (include_raw); joined from telegram_messages
+    raw_message: Optional[str] = None
     message_id: Optional[int] = None
     
     model_config = {"from_attributes": True}
@@ -36,6 +37,17 @@ class DailyDataSchema(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class OHLCBarSchema(BaseModel):
+    """Schema for an intraday OHLC bar built from tick data."""
+    
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    ticks: int
+
+
 class PriceUpdateSchema(BaseModel):
     """Schema for real-time price updates via WebSocket."""
     
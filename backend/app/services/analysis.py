@@ -9,9 +9,16 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from openai import AsyncOpenAI
 
+from app.core.cache import get_cache
 from app.core.config import get_settings
 from app.models.data import TickData, TelegramMessage
+from app.services import sentiment
 from app.services.forecasting import ForecastingService
+from app.services.panic_index import get_panic_window, window_query
+from app.services.price_state import get_price_state
+from app.services.rsi import get_rsi_engine
+from app.services.tick_buffer import get_tick_buffers
+from app.services.text_processor import get_text_processor
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -22,18 +29,17 @@ class AnalysisService:
     Complete analysis service combining forecasting, signals, and AI reasoning.
     
     Features:
-    - RSI-based buy/sell signals
-    - Market panic index from sentiment
+    - RSI-based buy/sell signals, from the incremental RSI engine (or the
+      in-memory tick buffers) when loaded
+    - Market panic index from sentiment, from the streaming window when hydrated
+    - Current price from the in-memory latest quotes when hydrated
+    - Analysis and panic index results cached (optionally in Redis)
     - AI reasoning using LLM
     - Complete market analysis
     """
     
     # Volatility keywords for panic index
-    PANIC_KEYWORDS = [
-        'أزمة', 'انهيار', 'crisis', 'collapse', 'panic',
-        'shortage', 'نقص', 'liquidity', 'سيولة',
-        'black market', 'السوق السوداء', 'inflation', 'تضخم',
-    ]
+    PANIC_KEYWORDS = sentiment.PANIC_KEYWORDS
     
     def __init__(self):
         """Initialize analysis service."""
@@ -51,6 +57,11 @@ class AnalysisService:
     
     async def get_current_price(self, currency_pair: str) -> Optional[float]:
         """Get the most recent price for a currency pair."""
+        price_state = get_price_state()
+        if price_state.hydrated:
+            quote = price_state.latest(currency_pair)
+            return quote.price if quote else None
+        
         if not self.db_session:
             return None
         
@@ -68,34 +79,38 @@ class AnalysisService:
         currency_pair: str,
         period: int = 14,
     ) -> Optional[float]:
-        """Calculate RSI indicator."""
-        if not self.db_session:
-            return None
+        """Calculate RSI indicator over the last 30 days of ticks."""
+        # Kept current tick by tick (in the scraper's process): a lookup
+        rsi = get_rsi_engine().rsi(currency_pair, period)
+        if rsi is not None:
+            return rsi
         
-        # Get recent tick data
         cutoff = datetime.now() - timedelta(days=30)
         
-        result = await self.db_session.execute(
-            select(TickData)
-            .where(TickData.currency_pair == currency_pair)
-            .where(TickData.timestamp >= cutoff)
-            .order_by(TickData.timestamp)
-        )
-        
-        records = result.scalars().all()
+        # Held in memory (in the scraper's process): no query
+        window = get_tick_buffers().window(currency_pair, cutoff)
+        if window is not None:
+            prices = pd.Series(window.prices, copy=False)
+        else:
+            if not self.db_session:
+                return None
+            
+            result = await self.db_session.execute(
+                select(TickData)
+                .where(TickData.currency_pair == currency_pair)
+                .where(TickData.timestamp >= cutoff)
+                .order_by(TickData.timestamp)
+            )
+            
+            records = result.scalars().all()
+            prices = pd.Series([r.price for r in records], dtype=float)
         
-        if len(records) < period + 1:
-            logger.warning(f"Insufficient data for RSI calculation: {len(records)}")
+        if len(prices) < period + 1:
+            logger.warning(f"Insufficient data for RSI calculation: {len(prices)}")
             return 50.0  # Neutral RSI
         
-        # Convert to DataFrame
-        data = pd.DataFrame([
-            {"timestamp": r.timestamp, "price": r.price}
-            for r in records
-        ])
-        
         # Calculate RSI
-        rsi_indicator = RSIIndicator(close=data["price"], window=period)
+        rsi_indicator = RSIIndicator(close=prices, window=period)
         rsi = rsi_indicator.rsi()
         
         return float(rsi.iloc[-1]) if not pd.isna(rsi.iloc[-1]) else 50.0
@@ -104,37 +119,42 @@ class AnalysisService:
         """
         Calculate market panic index based on Telegram message sentiment.
         
-        Returns a value between 0 (calm) and 100 (panic).
+        Returns a value between 0 (calm) and 100 (panic): the share of the
+        last PANIC_WINDOW_MESSAGES messages within PANIC_WINDOW_HOURS that
+        mention a panic keyword. Read from the streaming window when it is
+        hydrated; otherwise computed from the database and cached (shared by
+        every worker with a Redis cache) for CACHE_PANIC_INDEX_TTL_SECONDS.
         """
+        panic_window = get_panic_window()
+        if panic_window.hydrated:
+            return panic_window.index()
+        
         if not self.db_session:
             return 0.0
         
-        # Get last 100 messages
-        cutoff = datetime.now() - timedelta(hours=24)
-        
-        result = await self.db_session.execute(
-            select(TelegramMessage)
-            .where(TelegramMessage.timestamp >= cutoff)
-            .order_by(TelegramMessage.timestamp.desc())
-            .limit(100)
+        return await get_cache().get_or_compute(
+            "panic_index",
+            self._compute_market_panic_index,
+            settings.CACHE_PANIC_INDEX_TTL_SECONDS,
         )
+    
+    async def _compute_market_panic_index(self) -> float:
+        """Panic index over the same window of messages, from the database."""
+        panic_window = get_panic_window()
+        result = await self.db_session.execute(window_query(
+            select(TelegramMessage.text), panic_window.max_messages, panic_window.max_age,
+        ))
         
-        messages = result.scalars().all()
+        texts = result.scalars().all()
         
-        if not messages:
+        if not texts:
             return 0.0
         
-        # Count panic keywords
-        panic_count = 0
-        for message in messages:
-            text_lower = message.text.lower()
-            for keyword in self.PANIC_KEYWORDS:
-                if keyword.lower() in text_lower:
-                    panic_count += 1
-                    break
+        # Count panic keywords (in the process pool if offloading is enabled)
+        panic_count = await get_text_processor().count_panic(list(texts))
         
         # Calculate index (0-100)
-        panic_index = min((panic_count / len(messages)) * 100, 100)
+        panic_index = min((panic_count / len(texts)) * 100, 100)
         
         return round(panic_index, 2)
     
@@ -284,7 +304,17 @@ Provide a clear, actionable summary of market conditions and the reasoning behin
         Perform complete analysis for a currency pair.
         
         Returns comprehensive analysis with forecast, signals, and AI reasoning.
+        Cached per pair for CACHE_ANALYSIS_TTL_SECONDS; concurrent requests
+        (across workers with a Redis cache) share one computation.
         """
+        return await get_cache().get_or_compute(
+            f"analysis:{currency_pair}",
+            lambda: self._analyze(currency_pair),
+            settings.CACHE_ANALYSIS_TTL_SECONDS,
+        )
+    
+    async def _analyze(self, currency_pair: str) -> dict:
+        """Compute the complete analysis for a currency pair."""
         # Get current price
         current_price = await self.get_current_price(currency_pair)
         
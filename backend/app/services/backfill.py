@@ -0,0 +1,110 @@
+"""Checkpoints and command-line entry point for Telegram history backfills."""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class BackfillCheckpoints:
+    """
+    Per-channel, per-range resume points for ``TelegramPriceScraper.backfill``.
+
+    Stores the id of the last message written for each (channel, start
+    date, end date) in a JSON file, so backfilling another range of a
+    channel does not start past that range's messages. The file is
+    rewritten atomically after every batch, so a crash never leaves a
+    checkpoint ahead of the data in the database.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Load checkpoints from ``path`` (if it exists); an empty path keeps them in memory."""
+        self.path = settings.SCRAPER_BACKFILL_CHECKPOINT_PATH if path is None else path
+        self.positions: dict[str, int] = {}
+
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.positions = {k: int(v) for k, v in json.load(f).items()}
+
+    @staticmethod
+    def key(channel: str, start_date: datetime, end_date: Optional[datetime] = None) -> str:
+        """Checkpoint key of a channel's range (an open-ended range has no end)."""
+        end = end_date.isoformat() if end_date else ""
+        return f"{channel}|{start_date.isoformat()}|{end}"
+
+    def get(self, key: str) -> int:
+        """Return the last message id written for a checkpoint key (0 if none)."""
+        return self.positions.get(key, 0)
+
+    def set(self, key: str, message_id: int):
+        """Advance a checkpoint and persist it."""
+        self.positions[key] = max(message_id, self.get(key))
+        self.save()
+
+    def save(self):
+        """Write checkpoints to disk atomically."""
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.positions, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+async def run_backfill(args: argparse.Namespace):
+    """Connect with the configured account and backfill the requested range."""
+    from app.core.database import AsyncSessionLocal
+    from app.services.telegram_scraper import TelegramPriceScraper
+
+    scraper = TelegramPriceScraper(
+        api_id=settings.TELEGRAM_API_ID,
+        api_hash=settings.TELEGRAM_API_HASH,
+        phone=settings.TELEGRAM_PHONE,
+        session_name=settings.TELEGRAM_SESSION_NAME,
+        channels=args.channels or settings.TELEGRAM_CHANNELS,
+    )
+
+    async with AsyncSessionLocal() as session:
+        await scraper.set_db_session(session)
+        try:
+            results = await scraper.backfill(
+                start_date=args.start,
+                end_date=args.end,
+                concurrency=args.concurrency,
+                batch_size=args.batch_size,
+                checkpoints=BackfillCheckpoints(args.checkpoints),
+            )
+        finally:
+            await scraper.stop()
+
+    for channel, counts in results.items():
+        print(f"{channel}: {counts}")
+
+
+def main():
+    """Parse arguments and run the backfill."""
+    parser = argparse.ArgumentParser(description="Backfill Telegram channel history")
+    parser.add_argument("--start", type=datetime.fromisoformat, required=True)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--channels", nargs="*", default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--checkpoints", default=None, help="Checkpoint JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_backfill(args))
+
+
+if __name__ == "__main__":
+    main()
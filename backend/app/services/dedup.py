@@ -0,0 +1,125 @@
+"""Duplicate suppression for incoming Telegram messages."""
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Zero-width/bidi marks and tatweel vary between reposts without changing the content
+_INVISIBLE = dict.fromkeys(
+    map(ord, "\u200b\u200c\u200d\u200e\u200f\u2066\u2067\u2068\u2069\ufeff\u0640")
+)
+
+
+class MessageDeduplicator:
+    """
+    Bounded in-memory front that drops duplicate messages before any DB work.
+
+    Features:
+    - Exact duplicates by (channel, message_id), kept in an LRU
+    - Forwards and reposts by a hash of the normalized text, within a time window
+    - Memory bounded by ``max_ids`` and ``max_hashes`` entries
+    - Counters of suppressed duplicates
+
+    The LRU is only a fast path: the unique index on
+    ``telegram_messages (channel, message_id)`` remains the source of truth.
+    """
+
+    BY_ID = "id"
+    BY_TEXT = "text"
+
+    def __init__(
+        self,
+        max_ids: Optional[int] = None,
+        max_hashes: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the deduplicator."""
+        self.max_ids = max_ids or settings.SCRAPER_DEDUP_MAX_IDS
+        self.max_hashes = max_hashes or settings.SCRAPER_DEDUP_MAX_HASHES
+        self.window_seconds = (
+            window_seconds if window_seconds is not None
+            else settings.SCRAPER_DEDUP_TEXT_WINDOW_SECONDS
+        )
+        self.clock = clock
+
+        self._ids: OrderedDict[tuple, None] = OrderedDict()
+        self._hashes: OrderedDict[bytes, float] = OrderedDict()
+
+        self.suppressed_by_id = 0
+        self.suppressed_by_text = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so cosmetic differences do not defeat the hash."""
+        text = unicodedata.normalize("NFKC", text).translate(_INVISIBLE).lower()
+        return " ".join(text.split())
+
+    @classmethod
+    def text_hash(cls, text: str) -> bytes:
+        """Return a short hash of the normalized text."""
+        return hashlib.blake2b(cls.normalize(text).encode("utf-8"), digest_size=8).digest()
+
+    def check(
+        self,
+        channel: str,
+        message_id: int,
+        text: str,
+        now: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Return BY_ID or BY_TEXT if the message is a duplicate, else None.
+
+        A message that is not a duplicate is remembered. ``now`` (seconds)
+        overrides the clock, e.g. with post times during a backfill.
+        """
+        now = self.clock() if now is None else now
+
+        key = (channel, message_id)
+        if key in self._ids:
+            self._ids.move_to_end(key)
+            self.suppressed_by_id += 1
+            return self.BY_ID
+
+        self._ids[key] = None
+        if len(self._ids) > self.max_ids:
+            self._ids.popitem(last=False)
+
+        if not text or not text.strip():
+            return None
+
+        digest = self.text_hash(text)
+        self._expire(now)
+        seen = self._hashes.get(digest)
+        if seen is not None and abs(now - seen) <= self.window_seconds:
+            self.suppressed_by_text += 1
+            return self.BY_TEXT
+
+        self._hashes[digest] = now
+        self._hashes.move_to_end(digest)
+        if len(self._hashes) > self.max_hashes:
+            self._hashes.popitem(last=False)
+        return None
+
+    def _expire(self, now: float):
+        """Forget text hashes older than the window."""
+        while self._hashes:
+            digest, seen = next(iter(self._hashes.items()))
+            if now - seen <= self.window_seconds:
+                break
+            del self._hashes[digest]
+
+    def stats(self) -> dict:
+        """Return suppression counters and memory usage."""
+        return {
+            "suppressed_by_id": self.suppressed_by_id,
+            "suppressed_by_text": self.suppressed_by_text,
+            "suppressed_total": self.suppressed_by_id + self.suppressed_by_text,
+            "tracked_ids": len(self._ids),
+            "tracked_hashes": len(self._hashes),
+        }
@@ -0,0 +1,300 @@
+"""
+Streaming export of tick and daily history as NDJSON, CSV, Arrow or Parquet.
+
+Rows are read as plain tuples through a server-side cursor, ``batch_size`` at
+a time, and each batch is encoded and handed on before the next is fetched,
+so memory stays flat however long the range. Arrow IPC and Parquet need
+``pyarrow`` (``pip install -e ".[export]"``); each batch becomes one Arrow
+record batch or Parquet row group, built column by column.
+
+Usage (from backend/):
+    python -m app.services.export tick --start 2024-01-01 --format parquet --output ticks.parquet
+    python -m app.services.export daily --currency-pair EUR/LYD --format arrow --output eur.arrow
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.data import Channel, DailyData, TickData
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only the columnar formats need it
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip, and per Arrow batch / Parquet row group
+DEFAULT_BATCH_SIZE = 5000
+
+FORMATS = ("ndjson", "csv", "arrow", "parquet")
+COLUMNAR_FORMATS = ("arrow", "parquet")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """
+    An exportable table: its model, time column, sort key and (column, kind)
+    pairs, plus the (id, name) lookup table of each column stored as a key.
+    """
+
+    model: type
+    time_column: str
+    order_by: tuple[str, ...]
+    columns: tuple[tuple[str, str], ...]
+    lookups: tuple[tuple[str, type], ...] = ()
+
+    @property
+    def names(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+
+EXPORT_TABLES = {
+    "tick": ExportTable(
+        model=TickData,
+        time_column="timestamp",
+        order_by=("timestamp", "id"),
+        columns=(
+            ("timestamp", "timestamp"), ("id", "int"), ("currency_pair", "string"),
+            ("price", "float"), ("price_type", "string"), ("source_channel", "string"),
+            ("message_id", "int"),
+        ),
+        lookups=(("source_channel", Channel),),
+    ),
+    "daily": ExportTable(
+        model=DailyData,
+        time_column="date",
+        order_by=("date",),  # unique per pair
+        columns=(
+            ("date", "timestamp"), ("currency_pair", "string"), ("open", "float"),
+            ("high", "float"), ("low", "float"), ("close", "float"), ("volume", "float"),
+            ("source", "string"),
+        ),
+    ),
+}
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed, i.e. Arrow and Parquet exports work."""
+    return pa is not None
+
+
+def arrow_schema(table: ExportTable) -> "pa.Schema":
+    """Arrow schema for an export table."""
+    kinds = {
+        "timestamp": pa.timestamp("us"),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "string": pa.string(),
+    }
+    return pa.schema([(name, kinds[kind]) for name, kind in table.columns])
+
+
+def export_query(
+    table: ExportTable,
+    currency_pair: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Plain-column SELECT for a pair's rows from ``start`` to ``end`` (exclusive), oldest first."""
+    model = table.model
+    time_column = getattr(model, table.time_column)
+    lookups = dict(table.lookups)
+    query = select(*(
+        lookups[name].name.label(name) if name in lookups else getattr(model, name)
+        for name in table.names
+    )).select_from(model)
+    for name, lookup in table.lookups:
+        query = query.join(lookup, lookup.id == getattr(model, name))
+    query = (
+        query.where(model.currency_pair == currency_pair)
+        .order_by(*(getattr(model, name) for name in table.order_by))
+    )
+    if start is not None:
+        query = query.where(time_column >= start)
+    if end is not None:
+        query = query.where(time_column < end)
+    return query
+
+
+class _ChunkSink:
+    """Write-only file that hands back what was written since the last ``drain``."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet records absolute offsets in its footer
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _TextEncoder:
+    """NDJSON lines or CSV rows (with a header row)."""
+
+    def __init__(self, table: ExportTable, export_format: str):
+        self.names = table.names
+        self.export_format = export_format
+
+    def begin(self) -> bytes:
+        if self.export_format == "csv":
+            return (",".join(self.names) + "\n").encode()
+        return b""
+
+    def encode(self, rows: list) -> bytes:
+        buffer = io.StringIO()
+        if self.export_format == "csv":
+            csv.writer(buffer, lineterminator="\n").writerows(
+                (row[0].isoformat(), *row[1:]) for row in rows
+            )
+        else:
+            for row in rows:
+                record = dict(zip(self.names, row))
+                record[self.names[0]] = row[0].isoformat()
+                buffer.write(json.dumps(record) + "\n")
+        return buffer.getvalue().encode()
+
+    def end(self) -> bytes:
+        return b""
+
+
+class _ArrowEncoder:
+    """Arrow IPC stream or Parquet file, one record batch / row group per batch."""
+
+    def __init__(self, table: ExportTable, export_format: str):
+        self.schema = arrow_schema(table)
+        self.sink = _ChunkSink()
+        new_writer = pq.ParquetWriter if export_format == "parquet" else pa.ipc.new_stream
+        self.writer = new_writer(pa.PythonFile(self.sink, mode="w"), self.schema)
+
+    def begin(self) -> bytes:
+        return self.sink.drain()
+
+    def encode(self, rows: list) -> bytes:
+        columns = zip(*rows)
+        self.writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema,
+        ))
+        return self.sink.drain()
+
+    def end(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+async def export_chunks(
+    session: AsyncSession,
+    table: str,
+    export_format: str,
+    currency_pair: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Yield an export of ``table`` ("tick" or "daily") in ``export_format``.
+
+    Raises RuntimeError, on first iteration, for a columnar format without
+    pyarrow; check ``arrow_available()`` before starting a response.
+    """
+    spec = EXPORT_TABLES[table]
+    if export_format in COLUMNAR_FORMATS:
+        if not arrow_available():
+            raise RuntimeError(f"{export_format} export needs pyarrow (pip install pyarrow)")
+        encoder = _ArrowEncoder(spec, export_format)
+    else:
+        encoder = _TextEncoder(spec, export_format)
+
+    query = export_query(spec, currency_pair, start, end)
+    result = await session.stream(query.execution_options(yield_per=batch_size))
+
+    header = encoder.begin()
+    if header:
+        yield header
+    async for rows in result.partitions():
+        yield encoder.encode(rows)
+    footer = encoder.end()
+    if footer:
+        yield footer
+
+
+async def run_export(args: argparse.Namespace) -> int:
+    """Write one export to ``args.output``; returns bytes written."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.core.database import ReadSessionLocal, create_engine_for
+
+    engine = create_engine_for(args.database_url) if args.database_url else None
+    session_factory = (
+        async_sessionmaker(engine, class_=AsyncSession) if engine else ReadSessionLocal
+    )
+    written = 0
+    try:
+        async with session_factory() as session:
+            with open(args.output, "wb") as f:
+                async for chunk in export_chunks(
+                    session, args.table, args.format, args.currency_pair,
+                    args.start, args.end, args.batch_size,
+                ):
+                    written += f.write(chunk)
+    finally:
+        if engine is not None:
+            await engine.dispose()
+    return written
+
+
+def main():
+    """Parse arguments and run the export."""
+    parser = argparse.ArgumentParser(description="Export tick or daily history")
+    parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+    parser.add_argument("--currency-pair", default="USD/LYD")
+    parser.add_argument("--start", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--database-url", default=None, help="Defaults to the read database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    written = asyncio.run(run_export(args))
+    logger.info(f"Wrote {written:,} bytes of {args.table} data to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
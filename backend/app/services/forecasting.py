@@ -3,14 +3,19 @@ from datetime import datetime, timedelta
 from typing import Optional
 import logging
 
+import numpy as np
 import pandas as pd
 from prophet import Prophet
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_cache
+from app.core.config import get_settings
 from app.models.data import DailyData, TickData
+from app.services.tick_buffer import TickWindow, get_tick_buffers
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class ForecastingService:
@@ -21,7 +26,8 @@ class ForecastingService:
     - Time series forecasting for currency rates
     - 24h and 48h predictions
     - Confidence intervals
-    - Uses historical data from TimescaleDB
+    - Uses historical data from TimescaleDB (recent ticks from memory when loaded)
+    - Caches forecasts (optionally in Redis, shared across workers)
     """
     
     def __init__(self):
@@ -81,6 +87,14 @@ class ForecastingService:
         """Aggregate tick data into daily format."""
         cutoff_date = datetime.now() - timedelta(days=days)
         
+        # Held in memory (in the scraper's process): no query
+        window = get_tick_buffers().window(currency_pair, cutoff_date)
+        if window is not None:
+            if not len(window.prices):
+                logger.warning(f"No tick data found for {currency_pair}")
+                return pd.DataFrame(columns=["ds", "y"])
+            return self._daily_means(window)
+        
         result = await self.db_session.execute(
             select(TickData)
             .where(TickData.currency_pair == currency_pair)
@@ -112,6 +126,17 @@ class ForecastingService:
         
         return daily_df
     
+    @staticmethod
+    def _daily_means(window: TickWindow) -> pd.DataFrame:
+        """Mean price per calendar day of a (time-ordered) tick window."""
+        days = window.timestamps.astype("datetime64[D]")
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        counts = np.diff(np.r_[starts, len(days)])
+        return pd.DataFrame({
+            "ds": days[starts].astype("datetime64[ns]"),
+            "y": np.add.reduceat(window.prices, starts) / counts,
+        })
+    
     def train_model(self, df: pd.DataFrame) -> Prophet:
         """Train Prophet model on historical data."""
         if len(df) < 2:
@@ -153,9 +178,21 @@ class ForecastingService:
         """
         Generate forecast for a currency pair.
         
+        Successful forecasts are cached per pair and horizon for
+        CACHE_FORECAST_TTL_SECONDS (shared by workers with a Redis cache).
+        
         Returns:
             Dictionary with forecast data and confidence intervals
         """
+        return await get_cache().get_or_compute(
+            f"forecast:{currency_pair}:{hours}",
+            lambda: self._forecast_currency(currency_pair, hours),
+            settings.CACHE_FORECAST_TTL_SECONDS,
+            should_cache=lambda result: "error" not in result,
+        )
+    
+    async def _forecast_currency(self, currency_pair: str, hours: int) -> dict:
+        """Train on recent history and forecast ``hours`` ahead."""
         try:
             # Get historical data
             df = await self.get_historical_data(currency_pair)
@@ -1,18 +1,23 @@
 """Fulus.ly API sync service for historical data."""
+import logging
 from datetime import datetime, timedelta
 from typing import Optional
-import logging
 
 import httpx
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import get_cache
 from app.core.config import get_settings
 from app.models.data import DailyData
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Rows per upsert statement: 8 parameters each, well under PostgreSQL's 32767
+UPSERT_BATCH_SIZE = 1000
+
 
 class FulusSyncService:
     """
@@ -130,28 +135,64 @@ class FulusSyncService:
         
         return data
     
-    async def save_daily_data(self, currency_pair: str, data: list[dict]):
-        """Save daily data to database."""
+    @staticmethod
+    def _daily_rows(currency_pair: str, data: list[dict]) -> list[dict]:
+        """Build ``daily_data`` rows, keeping the last record for each date."""
+        rows: dict[datetime, dict] = {}
+        for item in data:
+            date = datetime.strptime(item["date"], "%Y-%m-%d")
+            rows[date] = {
+                "date": date,
+                "currency_pair": currency_pair,
+                "open": item["open"],
+                "high": item["high"],
+                "low": item["low"],
+                "close": item["close"],
+                "volume": item.get("volume"),
+                "source": "fulus.ly",
+            }
+        return list(rows.values())
+    
+    async def save_daily_data(self, currency_pair: str, data: list[dict]) -> int:
+        """
+        Upsert daily data in bulk.
+        
+        Multi-row INSERT ... ON CONFLICT (currency_pair, date) DO UPDATE
+        statements, committed together, so re-syncing an overlapping range
+        or retrying a partial failure overwrites days instead of duplicating
+        them.
+        """
         if not self.db_session:
             logger.warning("No database session available")
-            return
+            return 0
         
-        for item in data:
-            daily = DailyData(
-                date=datetime.strptime(item["date"], "%Y-%m-%d"),
-                currency_pair=currency_pair,
-                open=item["open"],
-                high=item["high"],
-                low=item["low"],
-                close=item["close"],
-                volume=item.get("volume"),
-                source="fulus.ly",
-            )
-            
-            self.db_session.add(daily)
+        rows = self._daily_rows(currency_pair, data)
+        if not rows:
+            return 0
         
-        await self.db_session.commit()
-        logger.info(f"Saved {len(data)} daily records for {currency_pair}")
+        try:
+            for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                statement = pg_insert(DailyData).values(rows[start:start + UPSERT_BATCH_SIZE])
+                statement = statement.on_conflict_do_update(
+                    index_elements=["currency_pair", "date"],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in ("open", "high", "low", "close", "volume", "source")
+                    },
+                )
+                await self.db_session.execute(statement)
+            await self.db_session.commit()
+        except Exception:
+            await self.db_session.rollback()
+            raise
+        
+        # Forecasts and analyses of this pair were built on the old history
+        cache = get_cache()
+        await cache.invalidate_prefix(f"forecast:{currency_pair}:")
+        await cache.invalidate(f"analysis:{currency_pair}")
+        
+        logger.info(f"Saved {len(rows)} daily records for {currency_pair}")
+        return len(rows)
     
     async def sync_currency_pair(
         self,
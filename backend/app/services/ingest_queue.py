@@ -0,0 +1,134 @@
+"""Bounded ingestion queue between Telegram updates and processing workers."""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class IngestQueue:
+    """
+    Bounded asyncio queue drained by a pool of worker tasks.
+
+    Features:
+    - Receiving an update only costs an enqueue; parsing, DB writes and
+      WebSocket fan-out run on the workers
+    - Explicit backpressure policy when the queue is full:
+      'block' (wait for space), 'drop_oldest' or 'drop_newest'
+    - Queue depth, lag (enqueue to dequeue) and handling latency metrics
+    - Drains queued items on stop
+    """
+
+    POLICIES = ("block", "drop_oldest", "drop_newest")
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        maxsize: Optional[int] = None,
+        workers: Optional[int] = None,
+        policy: Optional[str] = None,
+    ):
+        """Initialize the queue."""
+        self.handler = handler
+        self.maxsize = maxsize or settings.SCRAPER_QUEUE_SIZE
+        self.workers = workers or settings.SCRAPER_WORKERS
+        self.policy = policy or settings.SCRAPER_QUEUE_POLICY
+
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy: {self.policy}")
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks: list[asyncio.Task] = []
+
+        self.lag = LatencyRecorder()
+        self.handling = LatencyRecorder()
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of items waiting for a worker."""
+        return self._queue.qsize()
+
+    async def start(self):
+        """Start the worker pool."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(i)) for i in range(self.workers)
+            ]
+
+    async def put(self, item: Any) -> bool:
+        """
+        Enqueue an item according to the backpressure policy.
+
+        Returns False if the item (or, for 'drop_oldest', an older item) was dropped.
+        """
+        entry = (time.perf_counter(), item)
+        accepted = True
+
+        if self._queue.full():
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return False
+            if self.policy == "drop_oldest":
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self.dropped += 1
+                    accepted = False
+                except asyncio.QueueEmpty:
+                    pass
+
+        await self._queue.put(entry)
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return accepted
+
+    async def _worker(self, index: int):
+        """Process items until cancelled."""
+        while True:
+            enqueued_at, item = await self._queue.get()
+            started = time.perf_counter()
+            self.lag.record(started - enqueued_at)
+            try:
+                await self.handler(item)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Ingest worker {index} failed: {e}", exc_info=True)
+            finally:
+                self.handling.record(time.perf_counter() - started)
+                self._queue.task_done()
+
+    async def stop(self, drain: bool = True):
+        """Stop the workers, optionally after processing everything queued."""
+        if drain and self._tasks:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        """Return queue and worker statistics."""
+        return {
+            "policy": self.policy,
+            "workers": self.workers,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "capacity": self.maxsize,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "lag": self.lag.snapshot(),
+            "handling": self.handling.snapshot(),
+        }
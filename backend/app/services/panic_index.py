@@ -0,0 +1,141 @@
+"""Streaming market panic index over a sliding window of Telegram messages."""
+import logging
+from bisect import insort
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.data import TelegramMessage
+from app.services import sentiment
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class PanicWindow:
+    """
+    Market panic index over the latest messages, maintained as they arrive.
+
+    Features:
+    - Each message is scored once, at ingest (one regex search)
+    - Count-based (``max_messages``) and/or time-based (``max_age_hours``)
+      window; the defaults are AnalysisService's last 100 messages of 24h
+    - Running panic/total counts: reads are O(1), eviction amortized O(1)
+    - Hydrated from ``telegram_messages`` at startup
+
+    Only the process running the scraper sees new messages; elsewhere the
+    window stays unhydrated and the index is computed from the database.
+    """
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = None,
+        max_age_hours: Optional[float] = None,
+    ):
+        """Initialize an empty, unhydrated window (0 lifts a bound)."""
+        self.max_messages = (
+            max_messages if max_messages is not None else settings.PANIC_WINDOW_MESSAGES
+        )
+        max_age_hours = (
+            max_age_hours if max_age_hours is not None else settings.PANIC_WINDOW_HOURS
+        )
+        if not self.max_messages and not max_age_hours:
+            raise ValueError("Panic window needs a message count or an age bound")
+        self.max_age = timedelta(hours=max_age_hours) if max_age_hours else None
+        # (timestamp, is_panic), oldest first
+        self._entries: deque[tuple[datetime, bool]] = deque()
+        self.panic = 0
+        self.hydrated = False
+        self.messages = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop_oldest(self):
+        _, is_panic = self._entries.popleft()
+        self.panic -= is_panic
+
+    def _evict(self, now: datetime):
+        """Drop messages older than the age bound."""
+        if self.max_age is None:
+            return
+        cutoff = now - self.max_age
+        while self._entries and self._entries[0][0] < cutoff:
+            self._pop_oldest()
+
+    def add(self, timestamp: datetime, is_panic: bool):
+        """Count a scored message in the window."""
+        self.messages += 1
+        entry = (timestamp, is_panic)
+        if not self._entries or timestamp >= self._entries[-1][0]:
+            self._entries.append(entry)
+        else:
+            # Out of order (backfill): older than the whole full window, it is not in it
+            if self.max_messages and len(self._entries) >= self.max_messages \
+                    and timestamp < self._entries[0][0]:
+                return
+            insort(self._entries, entry)
+        self.panic += is_panic
+        if self.max_messages and len(self._entries) > self.max_messages:
+            self._pop_oldest()
+        self._evict(self._entries[-1][0])
+
+    def add_text(self, timestamp: datetime, text: str):
+        """Score a message and count it."""
+        self.add(timestamp, sentiment.is_panic(text))
+
+    def index(self, now: Optional[datetime] = None) -> float:
+        """Share of panic messages in the window, 0-100 (0.0 when empty)."""
+        self._evict(now or datetime.now())
+        if not self._entries:
+            return 0.0
+        return round(min(self.panic / len(self._entries) * 100, 100), 2)
+
+    async def hydrate(self, session: AsyncSession):
+        """Load and score the messages currently in the window from the database."""
+        result = await session.execute(window_query(
+            select(TelegramMessage.timestamp, TelegramMessage.text),
+            self.max_messages, self.max_age,
+        ))
+        self._entries.clear()
+        self.panic = 0
+        for row in reversed(result.all()):
+            self.add_text(row.timestamp, row.text)
+        self.hydrated = True
+        logger.info(f"Hydrated panic window with {len(self._entries)} messages")
+
+    def stats(self) -> dict:
+        """Return window statistics."""
+        return {
+            "hydrated": self.hydrated,
+            "max_messages": self.max_messages,
+            "max_age_hours": self.max_age.total_seconds() / 3600 if self.max_age else None,
+            "window": len(self._entries),
+            "panic": self.panic,
+            "messages": self.messages,
+        }
+
+
+def window_query(query, max_messages: int, max_age: Optional[timedelta]):
+    """Restrict a ``telegram_messages`` select to a panic window, newest first."""
+    query = query.order_by(TelegramMessage.timestamp.desc())
+    if max_age is not None:
+        query = query.where(TelegramMessage.timestamp >= datetime.now() - max_age)
+    if max_messages:
+        query = query.limit(max_messages)
+    return query
+
+
+_panic_window: Optional[PanicWindow] = None
+
+
+def get_panic_window() -> PanicWindow:
+    """Return the process-wide PanicWindow."""
+    global _panic_window
+    if _panic_window is None:
+        _panic_window = PanicWindow()
+    return _panic_window
@@ -0,0 +1,385 @@
+"""Compiled price extraction engine for Telegram messages."""
+import re
+from collections import deque
+from typing import Optional
+
+# Regex patterns for price matching, in priority order
+PRICE_PATTERNS = [
+    # Arabic patterns – buy/sell keyword may appear between currency and price
+    r'(?:سعر|صرف)\s*(?:الدولار|اليورو|USD|EUR)\s*(?:الآن|شراء|بيع)?\s*:?\s*(\d+\.?\d*)',
+    r'(?:الدولار|اليورو)\s*(?:بـ|شراء|بيع)?\s*(\d+\.?\d*)',
+    # English pair notation – optional buy/sell/bid/ask label
+    r'(USD|EUR)/LYD\s*:?\s*(?:buy|sell|bid|ask|buying|selling)?\s*(\d+\.?\d*)',
+    # English standalone keywords
+    r'USD\s*(?:rate|price|buy|sell)?\s*:?\s*(\d+\.?\d*)',
+    r'EUR\s*(?:rate|price|buy|sell)?\s*:?\s*(\d+\.?\d*)',
+    # Price followed by currency
+    r'(\d+\.?\d*)\s*(?:LYD|دينار)',
+]
+
+# Literals (lower-cased) that must occur in the text for each pattern to match.
+# Used to skip patterns that cannot possibly match.
+PATTERN_ANCHORS = [
+    ('سعر', 'صرف'),
+    ('الدولار', 'اليورو'),
+    ('/lyd',),
+    ('usd',),
+    ('eur',),
+    ('lyd', 'دينار'),
+]
+
+# Buy/Sell indicators
+BUY_KEYWORDS = ['شراء', 'buy', 'bid', 'buying']
+SELL_KEYWORDS = ['بيع', 'sell', 'ask', 'selling']
+
+# Currency pair mapping, in priority order
+CURRENCY_MAP = {
+    'دولار': 'USD/LYD',
+    'يورو': 'EUR/LYD',
+    'USD': 'USD/LYD',
+    'EUR': 'EUR/LYD',
+}
+
+# Fallback keyword mapped to USD/LYD when no currency keyword is present
+DOLLAR_FALLBACK = 'dollar'
+
+# Characters ending a sentence; buy/sell keywords do not carry past them
+SENTENCE_BREAKS = '\n.!?؟؛'
+
+# Characters for which ``str.lower()`` and ``re.IGNORECASE`` disagree on the
+# ASCII letters used by PRICE_PATTERNS ('İ' lowers to 'i' + U+0307). When one
+# of them is present the anchors are not trusted and every pattern is tried.
+CASEFOLD_HAZARDS = ('\u0131', '\u017f', '\u0307')
+
+
+class PriceExtractor:
+    """
+    Precompiled, single-scan replacement for the PRICE_PATTERNS loop.
+
+    Features:
+    - One scan of the lower-cased text finds every currency keyword,
+      buy/sell keyword and pattern anchor
+    - Only patterns whose anchor was seen are searched, in priority order
+    - ``parse`` returns exactly what ``parse_price_reference`` returns
+    - ``extract_all`` / ``parse_many`` return every quote in a message
+    """
+
+    MAX_TOKENS = 500
+
+    def __init__(self):
+        """Build the token scanner and compile the price patterns."""
+        self._no_currency = len(CURRENCY_MAP) + 1
+        tokens: dict[str, dict] = {}
+
+        def token(text: str) -> dict:
+            return tokens.setdefault(text, self._empty_roles())
+
+        for priority, keyword in enumerate(CURRENCY_MAP):
+            token(keyword.lower())["currency"] = priority
+        token(DOLLAR_FALLBACK)["currency"] = len(CURRENCY_MAP)
+        for keyword in BUY_KEYWORDS:
+            token(keyword)["buy"] = 0
+        for keyword in SELL_KEYWORDS:
+            token(keyword)["sell"] = 0
+        for index, anchors in enumerate(PATTERN_ANCHORS):
+            for anchor in anchors:
+                token(anchor)["anchors"].add(index)
+        for char in CASEFOLD_HAZARDS:
+            token(char)["hazard"] = True
+
+        self._tokens = {
+            text: self._freeze(roles)
+            for text, roles in self._close_overlaps(tokens).items()
+        }
+        alternatives = sorted(self._tokens, key=len, reverse=True)
+        self._scanner = re.compile("|".join(re.escape(text) for text in alternatives))
+        self._digit = re.compile(r"\d")
+        self._quote_scanner = re.compile(
+            "(" + "|".join(re.escape(text) for text in alternatives) + r")|(\d+\.?\d*)"
+            + "|([" + re.escape(SENTENCE_BREAKS) + "])"
+        )
+        # "6.90/6.95": the next number belongs to the same buy/sell group
+        self._grouped = re.compile(r"\s*/\s*\d")
+        # "USD 50 dollars": an amount of the quoted currency, not a rate
+        self._currency_pairs = {keyword.lower(): pair for keyword, pair in CURRENCY_MAP.items()}
+        self._currency_pairs[DOLLAR_FALLBACK] = "USD/LYD"
+        self._amount = re.compile(
+            r"\s*(?:ال)?(" + "|".join(re.escape(text) for text in self._currency_pairs) + ")"
+        )
+        self._pairs = list(CURRENCY_MAP.values()) + ["USD/LYD"]
+        self._patterns = [re.compile(pattern, re.IGNORECASE) for pattern in PRICE_PATTERNS]
+
+    def _empty_roles(self) -> dict:
+        """Return the roles of a token that matches no keyword."""
+        return {
+            "buy": None, "sell": None, "currency": self._no_currency,
+            "anchors": set(), "hazard": False,
+        }
+
+    def _close_overlaps(self, base: dict[str, dict]) -> dict[str, dict]:
+        """
+        Make a non-overlapping scan see every keyword occurrence.
+
+        The scanner resumes after each match, so a keyword that starts inside
+        another match would be skipped. Keywords contained in a token are
+        folded into its roles, and keywords that overlap a token's tail get a
+        combined token (e.g. "usd" + "dollar" -> "usdollar").
+        """
+        tokens = {text: self._empty_roles() for text in base}
+        changed = True
+        while changed:
+            changed = False
+            for text in list(tokens):
+                for other in base:
+                    for offset in range(1, len(text)):
+                        tail = text[offset:]
+                        if len(other) > len(tail) and other.startswith(tail):
+                            combined = text[:offset] + other
+                            if combined not in tokens:
+                                tokens[combined] = self._empty_roles()
+                                changed = True
+            if len(tokens) > self.MAX_TOKENS:
+                raise ValueError("Price keywords overlap too much to build a scanner")
+
+        # Every token carries the roles of all keywords occurring inside it
+        for text, roles in tokens.items():
+            for other, other_roles in base.items():
+                offset = text.find(other)
+                while offset >= 0:
+                    self._merge(roles, other_roles, offset)
+                    offset = text.find(other, offset + 1)
+        return tokens
+
+    @staticmethod
+    def _merge(roles: dict, other: dict, offset: int):
+        """Add the roles of a keyword found at ``offset`` inside a token."""
+        for side in ("buy", "sell"):
+            if other[side] is not None:
+                position = offset + other[side]
+                if roles[side] is None or position < roles[side]:
+                    roles[side] = position
+        roles["currency"] = min(roles["currency"], other["currency"])
+        roles["anchors"] |= other["anchors"]
+        roles["hazard"] = roles["hazard"] or other["hazard"]
+
+    @staticmethod
+    def _freeze(roles: dict) -> tuple:
+        """Reduce roles to (side, currency priority, anchors, hazard)."""
+        buy, sell = roles["buy"], roles["sell"]
+        if buy is not None and (sell is None or buy < sell):
+            side = "buy"
+        elif sell is not None and (buy is None or sell < buy):
+            side = "sell"
+        elif buy is not None:
+            side = "mid"
+        else:
+            side = None
+        return side, roles["currency"], frozenset(roles["anchors"]), roles["hazard"]
+
+    def parse(self, text: str) -> Optional[dict]:
+        """
+        Parse price information from message text.
+
+        Returns dict with: currency_pair, price, price_type
+        """
+        side = None
+        currency = self._no_currency
+        anchors: set[int] = set()
+        hazard = False
+
+        for token in self._scanner.findall(text.lower()):
+            token_side, token_currency, token_anchors, token_hazard = self._tokens[token]
+            if side is None:
+                side = token_side
+            if token_currency < currency:
+                currency = token_currency
+            anchors |= token_anchors
+            hazard = hazard or token_hazard
+
+        return self._match(text, side, currency, anchors, hazard)
+
+    def _match(
+        self,
+        text: str,
+        side: Optional[str],
+        currency: int,
+        anchors: set[int],
+        hazard: bool,
+    ) -> Optional[dict]:
+        """Apply the priority-ordered patterns given what the token scan found."""
+        if currency == self._no_currency:
+            return None
+
+        # Extract price: first pattern (by priority) that matches anywhere
+        price = None
+        for index, pattern in enumerate(self._patterns):
+            if not hazard and index not in anchors:
+                continue
+            match = pattern.search(text)
+            if match:
+                groups = match.groups()
+                price_str = groups[-1] if groups else None
+                if price_str is None:
+                    continue
+                try:
+                    price = float(price_str)
+                    break
+                except ValueError:
+                    continue
+
+        if not price or price <= 0 or price > 100:  # Sanity check
+            return None
+
+        return {
+            "currency_pair": self._pairs[currency],
+            "price": price,
+            "price_type": side or "mid",
+        }
+
+    def extract_all(self, text: str) -> list[dict]:
+        """
+        Return every (pair, side, price) quote in a message, in text order.
+
+        Walks keywords and numbers in one scan. A currency keyword sets the
+        pair for the numbers after it; buy/sell keywords are queued for the
+        next number, so "buy 6.90 sell 6.95" and "buy/sell 6.90/6.95" both
+        give two quotes. Queued sides are dropped once a number is read
+        (unless it continues as "6.90/6.95") and at a sentence break, and
+        several queued sides only label a "/" group; a side may come before
+        its currency ("buy EUR 7.40"). A
+        number is only a quote if a currency or side keyword came since the
+        previous number, which keeps times and counts out, and never when the
+        current pair's currency follows it ("USD 50 dollars"). Unless the walk
+        finds several quotes, the result is ``parse``'s single quote, so
+        one-quote messages parse as before.
+        """
+        # Every pattern needs a digit; most chatter has none
+        if not self._digit.search(text):
+            return []
+
+        lowered = text.lower()
+        quotes = []
+        currency = None
+        sides: deque = deque()
+        armed = False
+        # What parse() needs, gathered in the same scan
+        first_side = None
+        best_currency = self._no_currency
+        anchors: set[int] = set()
+        hazard = False
+
+        for match in self._quote_scanner.finditer(lowered):
+            keyword, number, _ = match.groups()
+            if keyword:
+                token_side, token_currency, token_anchors, token_hazard = self._tokens[keyword]
+                if token_currency != self._no_currency:
+                    currency = self._pairs[token_currency]
+                    armed = True
+                    best_currency = min(best_currency, token_currency)
+                if token_side is not None:
+                    sides.append(token_side)
+                    first_side = first_side or token_side
+                anchors |= token_anchors
+                hazard = hazard or token_hazard
+                continue
+            if not number:
+                sides.clear()
+                continue
+
+            grouped = self._grouped.match(lowered, match.end()) is not None
+            if len(sides) > 1 and not grouped:
+                # "buy/sell: 6.90" does not say which side 6.90 is
+                sides.clear()
+            side = sides.popleft() if sides else None
+            if not grouped:
+                sides.clear()
+            if currency is None or not (armed or side):
+                continue
+            armed = False
+            amount = self._amount.match(lowered, match.end())
+            if amount and self._currency_pairs[amount.group(1)] == currency:
+                continue
+            try:
+                price = float(number)
+            except ValueError:
+                continue
+            if 0 < price <= 100:  # Sanity check
+                quotes.append({
+                    "currency_pair": currency,
+                    "price": price,
+                    "price_type": side or "mid",
+                })
+
+        if len(quotes) <= 1:
+            single = self._match(text, first_side, best_currency, anchors, hazard)
+            return [single] if single else []
+        return quotes
+
+    def parse_many(self, texts: list[str]) -> list[list[dict]]:
+        """Return every quote of each message (batch form of ``extract_all``)."""
+        extract = self.extract_all
+        return [extract(text) for text in texts]
+
+
+def parse_price_reference(text: str) -> Optional[dict]:
+    """
+    Original pattern-by-pattern parser.
+
+    Kept as the oracle for differential tests and benchmarks of PriceExtractor.
+    """
+    text_lower = text.lower()
+
+    # Determine currency pair
+    currency_pair = None
+    for keyword, pair in CURRENCY_MAP.items():
+        if keyword.lower() in text_lower:
+            currency_pair = pair
+            break
+
+    if not currency_pair:
+        # Default to USD/LYD if dollar mentioned
+        if 'dollar' in text_lower or 'دولار' in text:
+            currency_pair = 'USD/LYD'
+        else:
+            return None
+
+    # Extract price
+    price = None
+    for pattern in PRICE_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            groups = match.groups()
+            price_str = groups[-1] if groups else None
+            if price_str is None:
+                continue
+            try:
+                price = float(price_str)
+                break
+            except ValueError:
+                continue
+
+    if not price or price <= 0 or price > 100:  # Sanity check
+        return None
+
+    # Determine buy/sell: use whichever keyword appears first in the text
+    buy_pos = min(
+        (text_lower.find(kw) for kw in BUY_KEYWORDS if kw in text_lower),
+        default=-1,
+    )
+    sell_pos = min(
+        (text_lower.find(kw) for kw in SELL_KEYWORDS if kw in text_lower),
+        default=-1,
+    )
+
+    if buy_pos >= 0 and (sell_pos < 0 or buy_pos < sell_pos):
+        price_type = "buy"
+    elif sell_pos >= 0 and (buy_pos < 0 or sell_pos < buy_pos):
+        price_type = "sell"
+    else:
+        price_type = "mid"
+
+    return {
+        "currency_pair": currency_pair,
+        "price": price,
+        "price_type": price_type,
+    }
@@ -0,0 +1,130 @@
+"""In-process latest quote per currency pair and side."""
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.data import CURRENCY_PAIRS, PRICE_TYPES, Channel, TickData
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    """One accepted tick: the latest for its pair and side."""
+
+    currency_pair: str
+    price_type: str
+    price: float
+    timestamp: datetime
+    source_channel: str
+
+
+class LatestQuoteStore:
+    """
+    Latest quote per (currency pair, side), served from memory.
+
+    Features:
+    - Updated by the scraper as ticks are accepted (and by backfill)
+    - Hydrated from ``tick_data`` at startup, one indexed lookup per key
+    - Out-of-order updates never replace a newer quote
+    - Staleness: a quote older than ``stale_after_seconds`` is flagged
+
+    Only the process running the scraper sees live updates; elsewhere the
+    store stays unhydrated and readers fall back to the database.
+    """
+
+    def __init__(self, stale_after_seconds: Optional[float] = None):
+        """Initialize an empty, unhydrated store."""
+        self.stale_after_seconds = (
+            stale_after_seconds if stale_after_seconds is not None
+            else settings.PRICE_STALE_AFTER_SECONDS
+        )
+        self._quotes: dict[tuple[str, str], Quote] = {}
+        self.hydrated = False
+        self.updates = 0
+
+    def update(
+        self,
+        currency_pair: str,
+        price_type: str,
+        price: float,
+        timestamp: datetime,
+        source_channel: str,
+    ) -> bool:
+        """Record a quote unless a newer one is already held; returns whether it was kept."""
+        key = (currency_pair, price_type)
+        current = self._quotes.get(key)
+        if current is not None and current.timestamp > timestamp:
+            return False
+        self._quotes[key] = Quote(currency_pair, price_type, price, timestamp, source_channel)
+        self.updates += 1
+        return True
+
+    def latest(self, currency_pair: str, price_type: Optional[str] = None) -> Optional[Quote]:
+        """The newest quote for a pair, of one side or of any side."""
+        if price_type is not None:
+            return self._quotes.get((currency_pair, price_type))
+        quotes = [
+            quote for (pair, _), quote in self._quotes.items() if pair == currency_pair
+        ]
+        return max(quotes, key=lambda quote: quote.timestamp, default=None)
+
+    def age_seconds(self, quote: Quote, now: Optional[datetime] = None) -> float:
+        """Seconds since the quote's tick (naive local time, like ``tick_data``)."""
+        return max(((now or datetime.now()) - quote.timestamp).total_seconds(), 0.0)
+
+    def is_stale(self, quote: Quote, now: Optional[datetime] = None) -> bool:
+        """Whether the quote is older than ``stale_after_seconds``."""
+        return self.age_seconds(quote, now) > self.stale_after_seconds
+
+    async def hydrate(self, session: AsyncSession):
+        """Load the latest tick of every known pair and side from the database."""
+        for currency_pair in CURRENCY_PAIRS:
+            for price_type in PRICE_TYPES:
+                result = await session.execute(
+                    select(TickData.price, TickData.timestamp,
+                           Channel.name.label("source_channel"))
+                    .select_from(TickData)
+                    .join(Channel, Channel.id == TickData.source_channel)
+                    .where(TickData.currency_pair == currency_pair)
+                    .where(TickData.price_type == price_type)
+                    .order_by(TickData.timestamp.desc())
+                    .limit(1)
+                )
+                row = result.one_or_none()
+                if row is not None:
+                    self.update(currency_pair, price_type, row.price, row.timestamp,
+                                row.source_channel)
+        self.hydrated = True
+        logger.info(f"Hydrated latest quotes for {len(self._quotes)} pair/side keys")
+
+    def stats(self) -> dict:
+        """Return store statistics, with the age of each held quote."""
+        now = datetime.now()
+        return {
+            "hydrated": self.hydrated,
+            "keys": len(self._quotes),
+            "updates": self.updates,
+            "stale_after_seconds": self.stale_after_seconds,
+            "age_seconds": {
+                f"{pair} {side}": round(self.age_seconds(quote, now), 1)
+                for (pair, side), quote in sorted(self._quotes.items())
+            },
+        }
+
+
+_price_state: Optional[LatestQuoteStore] = None
+
+
+def get_price_state() -> LatestQuoteStore:
+    """Return the process-wide LatestQuoteStore."""
+    global _price_state
+    if _price_state is None:
+        _price_state = LatestQuoteStore()
+    return _price_state
@@ -0,0 +1,153 @@
+"""Per-channel token-bucket rate limiting for incoming Telegram messages."""
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        elapsed = max(now - self.updated, 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def try_take(self, now: float) -> bool:
+        """Take one token if available."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def time_until_token(self, now: float) -> float:
+        """Seconds until one full token is available."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class ChannelRateLimiter:
+    """
+    Token-bucket limiter keyed by channel (optionally by channel and pair).
+
+    Features:
+    - Only the channel (or pair) that bursts is throttled
+    - Over-limit messages are dropped or coalesced, never slept on
+    - Coalescing keeps the latest over-limit message per key and releases it
+      once the bucket refills
+    - Counters for passed, dropped and delayed messages
+    """
+
+    PASSED = "passed"
+    DROPPED = "dropped"
+    COALESCED = "coalesced"
+
+    POLICIES = ("drop", "coalesce")
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        policy: Optional[str] = None,
+        per_pair: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the limiter."""
+        self.rate = rate or 1.0 / settings.SCRAPER_BUFFER_SECONDS
+        self.burst = burst or settings.SCRAPER_RATE_BURST
+        self.policy = policy or settings.SCRAPER_RATE_POLICY
+        self.per_pair = settings.SCRAPER_RATE_PER_PAIR if per_pair is None else per_pair
+        self.clock = clock
+
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown rate limit policy: {self.policy}")
+
+        self.buckets: dict[Hashable, TokenBucket] = {}
+        self.pending: dict[Hashable, Any] = {}
+
+        self.passed = 0
+        self.dropped = 0
+        self.delayed = 0
+
+    def key(self, channel: str, currency_pair: Optional[str] = None) -> Hashable:
+        """Return the bucket key for a message."""
+        if self.per_pair:
+            return (channel, currency_pair)
+        return channel
+
+    def _bucket(self, key: Hashable, now: float) -> TokenBucket:
+        """Get or create the bucket for a key."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst, now)
+        return bucket
+
+    def admit(self, key: Hashable, item: Any) -> str:
+        """
+        Decide what happens to an incoming message.
+
+        Returns PASSED, DROPPED or COALESCED. A coalesced item is held until
+        ``release`` hands it back; it replaces any item already held for the key.
+        """
+        now = self.clock()
+        bucket = self._bucket(key, now)
+
+        # Keep order: a newer message must not overtake a held one
+        if key not in self.pending and bucket.try_take(now):
+            self.passed += 1
+            return self.PASSED
+
+        if self.policy == "drop":
+            self.dropped += 1
+            return self.DROPPED
+
+        if key in self.pending:
+            self.dropped += 1  # The superseded message is never processed
+        self.pending[key] = item
+        return self.COALESCED
+
+    def release_delay(self, key: Hashable) -> float:
+        """Seconds until the item held for ``key`` can be released."""
+        now = self.clock()
+        return self._bucket(key, now).time_until_token(now)
+
+    def release(self, key: Hashable) -> Optional[Any]:
+        """Hand back the item held for ``key`` if its bucket has a token."""
+        if key not in self.pending:
+            return None
+        now = self.clock()
+        if not self._bucket(key, now).try_take(now):
+            return None
+        self.delayed += 1
+        return self.pending.pop(key)
+
+    def discard_pending(self) -> int:
+        """Drop every held item (used on shutdown)."""
+        count = len(self.pending)
+        self.dropped += count
+        self.pending.clear()
+        return count
+
+    def stats(self) -> dict:
+        """Return limiter counters."""
+        return {
+            "policy": self.policy,
+            "passed": self.passed,
+            "dropped": self.dropped,
+            "delayed": self.delayed,
+            "pending": len(self.pending),
+            "tracked_keys": len(self.buckets),
+        }
@@ -0,0 +1,87 @@
+"""Retention of Telegram messages kept for sentiment analysis."""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.data import TelegramMessage
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class RetentionService:
+    """
+    Service for deleting Telegram messages past their retention period.
+
+    telegram_messages is a plain table (its unique (channel, message_id)
+    key does not include the timestamp, so it cannot be a hypertable and
+    TimescaleDB retention policies do not apply); this does the same job.
+
+    Features:
+    - Configurable retention in days (0 keeps messages forever)
+    - Deletes in small batches so the scraper's inserts are never blocked for long
+    - Counts of deleted rows for monitoring
+    """
+
+    def __init__(
+        self,
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Initialize the retention service."""
+        self.retention_days = (
+            retention_days if retention_days is not None
+            else settings.TELEGRAM_MESSAGES_RETENTION_DAYS
+        )
+        self.batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+        self.db_session: Optional[AsyncSession] = None
+
+        self.runs = 0
+        self.deleted = 0
+        self.last_run: Optional[datetime] = None
+
+    async def set_db_session(self, session: AsyncSession):
+        """Set database session."""
+        self.db_session = session
+
+    async def purge_telegram_messages(self, now: Optional[datetime] = None) -> int:
+        """Delete messages older than the retention period; return the row count."""
+        if not self.db_session or self.retention_days <= 0:
+            return 0
+
+        cutoff = (now or datetime.now()) - timedelta(days=self.retention_days)
+        deleted = 0
+        while True:
+            expired = (
+                select(TelegramMessage.id)
+                .where(TelegramMessage.timestamp < cutoff)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            result = await self.db_session.execute(
+                delete(TelegramMessage).where(TelegramMessage.id.in_(expired))
+            )
+            await self.db_session.commit()
+            deleted += result.rowcount or 0
+            if (result.rowcount or 0) < self.batch_size:
+                break
+
+        self.runs += 1
+        self.deleted += deleted
+        self.last_run = now or datetime.now()
+        if deleted:
+            logger.info(f"Deleted {deleted} Telegram messages older than {cutoff:%Y-%m-%d}")
+        return deleted
+
+    def get_stats(self) -> dict:
+        """Return retention statistics."""
+        return {
+            "retention_days": self.retention_days,
+            "runs": self.runs,
+            "deleted": self.deleted,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+        }
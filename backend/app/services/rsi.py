@@ -0,0 +1,181 @@
+"""Incremental RSI per currency pair and period, updated as ticks arrive."""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.models.data import CURRENCY_PAIRS
+from app.services.tick_buffer import TickBuffers
+
+logger = logging.getLogger(__name__)
+
+# Periods tracked from startup; others from their first request
+DEFAULT_PERIODS = (14,)
+# Days of ticks calculate_rsi reads
+RSI_DAYS = 30
+# A series older than its window by this much is rebuilt from the buffer
+REBUILD_AFTER = timedelta(hours=24)
+
+
+class WilderRSI:
+    """
+    RSI of one price series, updated in O(1) per price.
+
+    Wilder smoothing exactly as ``ta.momentum.RSIIndicator`` computes it:
+    exponential means (alpha = 1/period, ``adjust=False``) of gains and
+    losses, both starting at 0 on the first price.
+    """
+
+    __slots__ = ("period", "alpha", "count", "last_price", "avg_gain", "avg_loss", "origin")
+
+    def __init__(self, period: int, origin: Optional[datetime] = None):
+        """Start an empty series; ``origin`` is when its history begins."""
+        self.period = period
+        self.alpha = 1.0 / period
+        self.count = 0
+        self.last_price = 0.0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.origin = origin
+
+    @classmethod
+    def from_prices(
+        cls, period: int, prices: np.ndarray, origin: Optional[datetime] = None,
+    ) -> "WilderRSI":
+        """Build the state of a whole series at once (vectorized, like ``ta``)."""
+        series = cls(period, origin)
+        if len(prices):
+            changes = pd.Series(np.diff(prices, prepend=prices[0]))
+            smooth = dict(alpha=series.alpha, adjust=False)
+            series.avg_gain = float(changes.clip(lower=0.0).ewm(**smooth).mean().iloc[-1])
+            series.avg_loss = float((-changes).clip(lower=0.0).ewm(**smooth).mean().iloc[-1])
+            series.last_price = float(prices[-1])
+            series.count = len(prices)
+        return series
+
+    def update(self, price: float):
+        """Fold in the next price."""
+        if self.count:
+            change = price - self.last_price
+            keep = 1.0 - self.alpha
+            self.avg_gain = keep * self.avg_gain + self.alpha * (change if change > 0 else 0.0)
+            self.avg_loss = keep * self.avg_loss + self.alpha * (-change if change < 0 else 0.0)
+        self.last_price = price
+        self.count += 1
+
+    @property
+    def value(self) -> Optional[float]:
+        """The current RSI; None until ``period + 1`` prices (calculate_rsi's minimum)."""
+        if self.count <= self.period:
+            return None
+        if self.avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+
+class RSIEngine:
+    """
+    Live RSI per (currency pair, period), kept current as ticks arrive.
+
+    Features:
+    - O(1) update per accepted tick and O(1) reads
+    - Rebuilt from the in-memory tick buffers: at startup for DEFAULT_PERIODS,
+      on first request for other periods, and daily as the window slides
+    - A pair whose ticks arrive out of order (backfill) is dropped; it is
+      rebuilt once its tick buffer covers the window again
+
+    Between rebuilds a series also remembers ticks up to a day older than
+    calculate_rsi's 30-day window; their weight is (1 - 1/period) ** n after
+    n newer ticks, so results agree with ``RSIIndicator`` to ~1e-9 once a
+    pair has a few hundred ticks in the window. Unloaded (outside the
+    scraper's process), ``rsi`` returns None and callers recompute.
+    """
+
+    def __init__(self, periods: tuple[int, ...] = DEFAULT_PERIODS, days: int = RSI_DAYS):
+        """Initialize an unloaded engine."""
+        self.periods = periods
+        self.days = days
+        self.tick_buffers: Optional[TickBuffers] = None
+        self._series: dict[str, dict[int, WilderRSI]] = {}
+        self.updates = 0
+        self.rebuilds = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.tick_buffers is not None
+
+    def load(self, tick_buffers: TickBuffers):
+        """Build every pair's series from loaded tick buffers, then follow them."""
+        self.tick_buffers = tick_buffers
+        self._series.clear()
+        for currency_pair in CURRENCY_PAIRS:
+            for period in self.periods:
+                self._build(currency_pair, period)
+        logger.info(
+            f"Built RSI for {sum(len(s) for s in self._series.values())} pair/period series"
+        )
+
+    def _build(self, currency_pair: str, period: int) -> Optional[WilderRSI]:
+        """(Re)build a series from the buffer, or forget it if the buffer is incomplete."""
+        origin = datetime.now() - timedelta(days=self.days)
+        window = self.tick_buffers.window(currency_pair, origin)
+        if window is None:
+            self._series.get(currency_pair, {}).pop(period, None)
+            return None
+        series = WilderRSI.from_prices(period, window.prices, origin)
+        self._series.setdefault(currency_pair, {})[period] = series
+        self.rebuilds += 1
+        return series
+
+    def update(self, currency_pair: str, price: float):
+        """Fold an accepted tick into the pair's series."""
+        for series in self._series.get(currency_pair, {}).values():
+            series.update(price)
+        self.updates += 1
+
+    def discard(self, currency_pair: str):
+        """Forget a pair's series (its ticks are no longer in order)."""
+        self._series.pop(currency_pair, None)
+
+    def rsi(self, currency_pair: str, period: int = 14) -> Optional[float]:
+        """
+        Current RSI of a pair (50.0, neutral, on too few ticks).
+
+        Returns None when it cannot be served from memory.
+        """
+        if not self.loaded:
+            return None
+        series = self._series.get(currency_pair, {}).get(period)
+        stale_before = datetime.now() - timedelta(days=self.days) - REBUILD_AFTER
+        if series is None or series.origin < stale_before:
+            series = self._build(currency_pair, period)
+            if series is None:
+                return None
+        value = series.value
+        return 50.0 if value is None else value
+
+    def stats(self) -> dict:
+        """Return engine statistics with every tracked value."""
+        return {
+            "loaded": self.loaded,
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+            "rsi": {
+                f"{pair} {period}": None if series.value is None else round(series.value, 2)
+                for pair, by_period in sorted(self._series.items())
+                for period, series in sorted(by_period.items())
+            },
+        }
+
+
+_rsi_engine: Optional[RSIEngine] = None
+
+
+def get_rsi_engine() -> RSIEngine:
+    """Return the process-wide RSIEngine."""
+    global _rsi_engine
+    if _rsi_engine is None:
+        _rsi_engine = RSIEngine()
+    return _rsi_engine
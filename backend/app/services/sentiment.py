@@ -0,0 +1,22 @@
+"""Keyword-based market sentiment scoring for Telegram messages."""
+import re
+
+# Volatility keywords for panic index
+PANIC_KEYWORDS = [
+    'أزمة', 'انهيار', 'crisis', 'collapse', 'panic',
+    'shortage', 'نقص', 'liquidity', 'سيولة',
+    'black market', 'السوق السوداء', 'inflation', 'تضخم',
+]
+
+# One alternation instead of a substring test per keyword
+PANIC_PATTERN = re.compile("|".join(re.escape(k.lower()) for k in PANIC_KEYWORDS))
+
+
+def is_panic(text: str) -> bool:
+    """Return True if the text mentions any panic keyword."""
+    return PANIC_PATTERN.search(text.lower()) is not None
+
+
+def count_panic(texts: list[str]) -> int:
+    """Return how many of ``texts`` mention a panic keyword."""
+    return sum(1 for text in texts if is_panic(text))
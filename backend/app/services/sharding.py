@@ -0,0 +1,317 @@
+"""Sharded Telegram ingestion: channels split across several Telegram accounts."""
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Callable, Optional
+
+from telethon import TelegramClient, events
+from telethon.tl.functions.channels import JoinChannelRequest, LeaveChannelRequest
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def assign_shard(channel: str, shards: list[str]) -> str:
+    """
+    Pick the shard for a channel by rendezvous (highest random weight) hashing.
+
+    The choice only depends on the channel and the set of shards, and adding
+    or removing a shard only moves the channels that belong to it.
+    """
+    def weight(shard: str) -> bytes:
+        return hashlib.blake2b(f"{shard}:{channel}".encode("utf-8"), digest_size=8).digest()
+
+    return max(shards, key=weight)
+
+
+def assign_channels(channels: list[str], shards: list[str]) -> dict[str, list[str]]:
+    """Map every shard to the channels it should listen to."""
+    assignment: dict[str, list[str]] = {shard: [] for shard in shards}
+    for channel in channels:
+        assignment[assign_shard(channel, shards)].append(channel)
+    return assignment
+
+
+class IngestShard:
+    """
+    One Telegram account's client session and the channels it listens to.
+
+    Telegram sends an account updates for every channel it has joined, and
+    the ``chats`` filter of ``events.NewMessage`` only drops them in the
+    client, so a shard joins the channels it is given and leaves the ones
+    taken from it.
+    """
+
+    def __init__(self, name: str, client: TelegramClient, on_event: Callable):
+        """Initialize the shard; it is not connected yet."""
+        self.name = name
+        self.client = client
+        self.on_event = on_event
+        self.channels: list[str] = []
+
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.last_message_at: Optional[float] = None
+        self.throughput = 0.0
+        self._last_count = 0
+        self._last_sample = time.monotonic()
+
+    @property
+    def connected(self) -> bool:
+        """True if the client session is up."""
+        return bool(self.client.is_connected())
+
+    async def start(self, phone: Optional[str] = None):
+        """Connect the client session."""
+        await self.client.start(phone=phone)
+
+    async def _handle(self, event):
+        """Count an update and hand it to the shared ingestion queue."""
+        self.received += 1
+        self.last_message_at = time.monotonic()
+        if not await self.on_event(event):
+            self.dropped += 1
+
+    async def _membership(self, request, channel: str) -> bool:
+        """Join or leave one channel; False if Telegram refused."""
+        try:
+            await self.client(request(channel))
+            return True
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Ingest shard {self.name} could not update {channel}: {e}")
+            return False
+
+    async def subscribe(self, channels: list[str]):
+        """Listen to exactly ``channels`` (replaces the previous subscription)."""
+        wanted = sorted(channels)
+        if self.connected:
+            for channel in set(self.channels) - set(wanted):
+                await self._membership(LeaveChannelRequest, channel)
+            wanted = [
+                channel for channel in wanted
+                if channel in self.channels or await self._membership(JoinChannelRequest, channel)
+            ]
+        self.client.remove_event_handler(self._handle)
+        self.channels = wanted
+        if self.channels:
+            self.client.add_event_handler(self._handle, events.NewMessage(chats=self.channels))
+
+    def sample(self, now: float):
+        """Update the messages/sec rate since the previous sample."""
+        elapsed = now - self._last_sample
+        if elapsed > 0:
+            self.throughput = (self.received - self._last_count) / elapsed
+        self._last_count = self.received
+        self._last_sample = now
+
+    async def stop(self):
+        """Unsubscribe and disconnect."""
+        self.client.remove_event_handler(self._handle)
+        await self.client.disconnect()
+
+    def stats(self) -> dict:
+        """Return health and throughput for this shard."""
+        return {
+            "connected": self.connected,
+            "channels": len(self.channels),
+            "received": self.received,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "messages_per_second": round(self.throughput, 2),
+            "seconds_since_last_message": (
+                round(time.monotonic() - self.last_message_at, 1)
+                if self.last_message_at is not None else None
+            ),
+        }
+
+
+class ShardedIngestion:
+    """
+    Splits the scraper's channels across several Telegram accounts.
+
+    Features:
+    - One account per shard (TELEGRAM_SHARD_PHONES), each joined only to
+      its own channels, so every account receives a share of the updates
+    - Channels are assigned to shards by rendezvous hashing
+    - All shards feed the scraper's single ingestion queue, so dedup, rate
+      limiting and batched writes are shared
+    - A health check reconnects dropped sessions and moves the channels of
+      unhealthy shards to healthy ones, moving them back on recovery
+    - Per-shard health and throughput statistics
+    """
+
+    def __init__(
+        self,
+        scraper,
+        shard_count: Optional[int] = None,
+        client_factory: Optional[Callable[[int], TelegramClient]] = None,
+        health_interval: Optional[float] = None,
+        phones: Optional[list[str]] = None,
+    ):
+        """
+        Initialize the shards.
+
+        Shard ``i`` signs in as ``phones[i]``. Sessions of one account all
+        receive that account's full update stream, so by default each shard
+        needs its own account. ``client_factory(index)`` returns the client
+        for a shard; by default each shard uses its own session file,
+        ``<session_name>_shard<index>``.
+        """
+        self.scraper = scraper
+        self.shard_count = shard_count or settings.TELEGRAM_SHARDS
+        self.phones = list(phones if phones is not None else settings.TELEGRAM_SHARD_PHONES)
+        if client_factory is None:
+            self._check_accounts(self.shard_count)
+        self.client_factory = client_factory or self._default_client
+        self.health_interval = (
+            health_interval if health_interval is not None
+            else settings.TELEGRAM_SHARD_HEALTH_SECONDS
+        )
+
+        self.shards: dict[str, IngestShard] = {}
+        self.rebalances = 0
+        self._healthy: set[str] = set()
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._stopped = asyncio.Event()
+
+    def _check_accounts(self, shard_count: int):
+        """Require a distinct account for each of ``shard_count`` shards."""
+        accounts = self.phones[:shard_count]
+        if len(accounts) < shard_count or len(set(accounts)) < len(accounts):
+            raise ValueError(
+                f"{shard_count} ingest shards need {shard_count} distinct Telegram accounts "
+                f"in TELEGRAM_SHARD_PHONES, got {len(set(accounts))}"
+            )
+
+    def _default_client(self, index: int) -> TelegramClient:
+        """Create a client with a per-shard session file."""
+        return TelegramClient(
+            f"{self.scraper.session_name}_shard{index}",
+            self.scraper.api_id,
+            self.scraper.api_hash,
+        )
+
+    async def _on_event(self, event) -> bool:
+        """Enqueue an update for the scraper's workers."""
+        accepted = await self.scraper.ingest_queue.put(event)
+        if not accepted:
+            logger.warning("Ingest queue full, dropped a message")
+        return accepted
+
+    async def _add_shard(self, index: int):
+        """Create and connect one shard."""
+        name = f"shard{index}"
+        shard = IngestShard(name, self.client_factory(index), self._on_event)
+        await shard.start(phone=self.phones[index] if index < len(self.phones) else None)
+        self.shards[name] = shard
+        logger.info(f"Started ingest shard {name}")
+
+    async def start(self):
+        """Connect every shard, subscribe them and start health checks."""
+        for index in range(self.shard_count):
+            await self._add_shard(index)
+        await self.rebalance()
+        if self.health_interval:
+            self._monitor_task = asyncio.create_task(self._monitor())
+
+    def assignment(self) -> dict[str, list[str]]:
+        """Return the channels each shard currently listens to."""
+        return {name: list(shard.channels) for name, shard in self.shards.items()}
+
+    async def rebalance(self, channels: Optional[list[str]] = None) -> dict[str, list[str]]:
+        """
+        Reassign channels over the healthy shards and resubscribe the ones that changed.
+
+        Shards join the channels they gain and leave the ones they lose.
+
+        Pass ``channels`` to change the monitored set (e.g. new exchange houses).
+        """
+        if channels is not None:
+            self.scraper.channels = list(channels)
+
+        healthy = [name for name, shard in self.shards.items() if shard.connected]
+        self._healthy = set(healthy)
+        if not healthy:
+            logger.error("No healthy ingest shards; channels are not being monitored")
+            healthy_assignment = {}
+        else:
+            healthy_assignment = assign_channels(self.scraper.channels, healthy)
+
+        moved = 0
+        for name, shard in self.shards.items():
+            wanted = sorted(healthy_assignment.get(name, []))
+            if wanted != shard.channels:
+                moved += len(set(wanted) - set(shard.channels))
+                await shard.subscribe(wanted)
+        if moved:
+            self.rebalances += 1
+            logger.info(f"Rebalanced ingest shards ({moved} channel moves)")
+        return self.assignment()
+
+    async def add_shards(self, count: int = 1):
+        """Add shards at runtime; only the channels they now own move to them."""
+        if self.client_factory == self._default_client:
+            self._check_accounts(self.shard_count + count)
+        for index in range(self.shard_count, self.shard_count + count):
+            await self._add_shard(index)
+        self.shard_count += count
+        await self.rebalance()
+
+    async def check_health(self):
+        """Reconnect dropped shards, sample throughput and rebalance if health changed."""
+        now = time.monotonic()
+        for name, shard in self.shards.items():
+            shard.sample(now)
+            if shard.connected:
+                continue
+            try:
+                await shard.client.connect()
+                shard.reconnects += 1
+                logger.info(f"Reconnected ingest shard {name}")
+            except Exception as e:
+                shard.errors += 1
+                logger.warning(f"Ingest shard {name} is down: {e}")
+
+        healthy = {name for name, shard in self.shards.items() if shard.connected}
+        if healthy != self._healthy:
+            await self.rebalance()
+
+    async def _monitor(self):
+        """Run health checks until stopped."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"Shard health check failed: {e}", exc_info=True)
+
+    async def run(self):
+        """Start the shards and run until stopped."""
+        await self.start()
+        await self._stopped.wait()
+
+    async def stop(self):
+        """Stop health checks and disconnect every shard."""
+        self._stopped.set()
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+        for shard in self.shards.values():
+            await shard.stop()
+        logger.info("Stopped ingest shards")
+
+    def stats(self) -> dict:
+        """Return per-shard health and throughput."""
+        return {
+            "shards": {name: shard.stats() for name, shard in self.shards.items()},
+            "healthy": sum(shard.connected for shard in self.shards.values()),
+            "rebalances": self.rebalances,
+        }
@@ -1,7 +1,6 @@
 """Telegram price scraper using Telethon."""
 import asyncio
-import re
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Callable
 import logging
 
@@ -9,7 +8,19 @@ from telethon import TelegramClient, events
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
-from app.models.data import TickData, TelegramMessage
+from app.models.data import Channel, TickData, TelegramMessage, insert_channels
+from app.services import price_parser
+from app.services.backfill import BackfillCheckpoints
+from app.services.dedup import MessageDeduplicator
+from app.services.ingest_queue import IngestQueue
+from app.services.panic_index import get_panic_window
+from app.services.price_state import get_price_state
+from app.services.rsi import get_rsi_engine
+from app.services.tick_buffer import get_tick_buffers
+from app.services.rate_limiter import ChannelRateLimiter
+from app.services.sharding import ShardedIngestion
+from app.services.text_processor import get_text_processor
+from app.services.write_behind import WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -21,38 +32,31 @@ class TelegramPriceScraper:
     
     Features:
     - Connects to Telegram using Telethon
-    - Monitors specified channels for price updates
-    - Parses Arabic and English price formats
+    - Monitors specified channels for price updates, optionally split
+      across several Telegram accounts (TELEGRAM_SHARDS)
+    - Bounded ingestion queue with a worker pool off the Telethon update path
+    - Parses Arabic and English price formats (optionally in a process pool),
+      keeping every buy/sell quote of each currency in a message
     - Handles buy/sell price distinctions
-    - Rate limiting with buffer
-    - Saves to TimescaleDB
+    - Drops duplicate and forwarded messages before parsing
+    - Per-channel token-bucket rate limiting
+    - Concurrent, resumable historical backfill
+    - Batched write-behind saves to TimescaleDB
+    - Keeps the in-memory latest quote per pair and side current
     """
     
     # Regex patterns for price matching
-    PRICE_PATTERNS = [
-        # Arabic patterns – buy/sell keyword may appear between currency and price
-        r'(?:سعر|صرف)\s*(?:الدولار|اليورو|USD|EUR)\s*(?:الآن|شراء|بيع)?\s*:?\s*(\d+\.?\d*)',
-        r'(?:الدولار|اليورو)\s*(?:بـ|شراء|بيع)?\s*(\d+\.?\d*)',
-        # English pair notation – optional buy/sell/bid/ask label
-        r'(USD|EUR)/LYD\s*:?\s*(?:buy|sell|bid|ask|buying|selling)?\s*(\d+\.?\d*)',
-        # English standalone keywords
-        r'USD\s*(?:rate|price|buy|sell)?\s*:?\s*(\d+\.?\d*)',
-        r'EUR\s*(?:rate|price|buy|sell)?\s*:?\s*(\d+\.?\d*)',
-        # Price followed by currency
-        r'(\d+\.?\d*)\s*(?:LYD|دينار)',
-    ]
+    PRICE_PATTERNS = price_parser.PRICE_PATTERNS
     
     # Buy/Sell indicators
-    BUY_KEYWORDS = ['شراء', 'buy', 'bid', 'buying']
-    SELL_KEYWORDS = ['بيع', 'sell', 'ask', 'selling']
+    BUY_KEYWORDS = price_parser.BUY_KEYWORDS
+    SELL_KEYWORDS = price_parser.SELL_KEYWORDS
     
     # Currency pair mapping
-    CURRENCY_MAP = {
-        'دولار': 'USD/LYD',
-        'يورو': 'EUR/LYD',
-        'USD': 'USD/LYD',
-        'EUR': 'EUR/LYD',
-    }
+    CURRENCY_MAP = price_parser.CURRENCY_MAP
+    
+    # Compiled single-scan extraction engine shared by all instances
+    extractor = price_parser.PriceExtractor()
     
     def __init__(
         self,
@@ -61,19 +65,47 @@ class TelegramPriceScraper:
         phone: Optional[str] = None,
         session_name: str = "scraper_session",
         channels: Optional[list[str]] = None,
+        client: Optional[TelegramClient] = None,
     ):
-        """Initialize the Telegram scraper."""
+        """
+        Initialize the Telegram scraper.
+        
+        ``client`` may be any object with the TelegramClient methods used here;
+        pass one to test or benchmark against a fake history source.
+        """
         self.api_id = api_id
         self.api_hash = api_hash
         self.phone = phone
         self.session_name = session_name
         self.channels = channels or settings.TELEGRAM_CHANNELS
         
-        self.client: Optional[TelegramClient] = None
+        self.client: Optional[TelegramClient] = client
         self.db_session: Optional[AsyncSession] = None
         self.ws_callback: Optional[Callable] = None
-        self.last_message_time = datetime.now()
-        self.buffer_seconds = settings.SCRAPER_BUFFER_SECONDS
+        self.deduplicator = MessageDeduplicator()
+        self.text_processor = get_text_processor()
+        self.price_state = get_price_state()
+        self.tick_buffers = get_tick_buffers()
+        self.rsi_engine = get_rsi_engine()
+        self.panic_window = get_panic_window()
+        self.rate_limiter = ChannelRateLimiter()
+        self.ingest_queue = IngestQueue(self.handle_message)
+        # The unique (channel, message_id) index is the source of truth; ticks
+        # of messages that already exist are skipped with them. Ticks store
+        # their channel as a key into ``channels``, so that row goes first;
+        # known channels are remembered and not inserted again
+        self.writer = WriteBehindBuffer(
+            conflict_keys={
+                Channel: ("name",),
+                TelegramMessage: ("channel", "message_id"),
+            },
+            dependents={TickData: (TelegramMessage, ("source_channel", "message_id"))},
+            remembered=(Channel,),
+            inserts={Channel: insert_channels},
+        )
+        self.sharding: Optional[ShardedIngestion] = None
+        self._release_timers: dict = {}
+        self._background_tasks: set[asyncio.Task] = set()
         
     async def connect(self):
         """Connect to Telegram."""
@@ -84,6 +116,7 @@ class TelegramPriceScraper:
     async def set_db_session(self, session: AsyncSession):
         """Set database session."""
         self.db_session = session
+        await self.writer.set_db_session(session)
         
     def set_websocket_callback(self, callback: Callable):
         """Set callback for WebSocket emissions."""
@@ -95,66 +128,42 @@ class TelegramPriceScraper:
         
         Returns dict with: currency_pair, price, price_type
         """
-        text_lower = text.lower()
-        
-        # Determine currency pair
-        currency_pair = None
-        for keyword, pair in self.CURRENCY_MAP.items():
-            if keyword.lower() in text_lower:
-                currency_pair = pair
-                break
-        
-        if not currency_pair:
-            # Default to USD/LYD if dollar mentioned
-            if 'dollar' in text_lower or 'دولار' in text:
-                currency_pair = 'USD/LYD'
-            else:
-                return None
-        
-        # Extract price
-        price = None
-        for pattern in self.PRICE_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Some patterns capture a leading currency code as group 1 and
-                # the price as the final group (e.g. "(USD|EUR)/LYD … (\d+…)").
-                # Using groups[-1] always selects the price regardless of how
-                # many groups the pattern has.
-                groups = match.groups()
-                price_str = groups[-1] if groups else None
-                if price_str is None:
-                    continue
-                try:
-                    price = float(price_str)
-                    break
-                except ValueError:
-                    continue
-        
-        if not price or price <= 0 or price > 100:  # Sanity check
-            return None
-        
-        # Determine buy/sell: use whichever keyword appears first in the text
-        # so "شراء 6.80 بيع 6.90" is correctly labelled "buy".
-        buy_pos = min(
-            (text_lower.find(kw) for kw in self.BUY_KEYWORDS if kw in text_lower),
-            default=-1,
-        )
-        sell_pos = min(
-            (text_lower.find(kw) for kw in self.SELL_KEYWORDS if kw in text_lower),
-            default=-1,
-        )
-
-        if buy_pos >= 0 and (sell_pos < 0 or buy_pos < sell_pos):
-            price_type = "buy"
-        elif sell_pos >= 0 and (buy_pos < 0 or sell_pos < buy_pos):
-            price_type = "sell"
-        else:
-            price_type = "mid"
-        
+        return self.extractor.parse(text)
+    
+    @staticmethod
+    def _tick_row(
+        currency_pair: str,
+        price: float,
+        price_type: str,
+        source_channel: str,
+        message_id: int,
+        timestamp: Optional[datetime] = None,
+    ) -> dict:
+        """Build a ``tick_data`` row; its text stays in ``telegram_messages``."""
         return {
+            "timestamp": timestamp or datetime.now(),
             "currency_pair": currency_pair,
             "price": price,
             "price_type": price_type,
+            "source_channel": source_channel,
+            "message_id": message_id,
+        }
+    
+    @staticmethod
+    def _message_row(
+        channel: str,
+        message_id: int,
+        text: str,
+        contains_price: bool,
+        timestamp: Optional[datetime] = None,
+    ) -> dict:
+        """Build a ``telegram_messages`` row."""
+        return {
+            "timestamp": timestamp or datetime.now(),
+            "channel": channel,
+            "message_id": message_id,
+            "text": text,
+            "contains_price": contains_price,
         }
     
     async def save_tick_data(
@@ -163,32 +172,20 @@ class TelegramPriceScraper:
         price: float,
         price_type: str,
         source_channel: str,
-        raw_message: str,
         message_id: int,
     ):
-        """Save tick data to database."""
+        """Queue tick data for the next batched write."""
         if not self.db_session:
             logger.warning("No database session available")
             return
         
-        tick = TickData(
-            timestamp=datetime.now(),
-            currency_pair=currency_pair,
-            price=price,
-            price_type=price_type,
-            source_channel=source_channel,
-            raw_message=raw_message,
-            message_id=message_id,
-        )
-        
-        try:
-            self.db_session.add(tick)
-            await self.db_session.commit()
-            logger.info(f"Saved tick: {currency_pair} @ {price}")
-        except Exception as e:
-            await self.db_session.rollback()
-            logger.error(f"Error saving tick data: {e}", exc_info=True)
-            raise
+        await self.writer.put_many([
+            (Channel, {"name": source_channel}),
+            (TickData, self._tick_row(
+                currency_pair, price, price_type, source_channel, message_id,
+            )),
+        ])
+        logger.info(f"Queued tick: {currency_pair} @ {price}")
         
     async def save_message(
         self,
@@ -197,36 +194,16 @@ class TelegramPriceScraper:
         text: str,
         contains_price: bool,
     ):
-        """Save Telegram message for sentiment analysis."""
+        """Queue Telegram message for sentiment analysis."""
         if not self.db_session:
             return
         
-        message = TelegramMessage(
-            timestamp=datetime.now(),
-            channel=channel,
-            message_id=message_id,
-            text=text,
-            contains_price=contains_price,
-        )
-        
-        try:
-            self.db_session.add(message)
-            await self.db_session.commit()
-        except Exception as e:
-            await self.db_session.rollback()
-            logger.error(f"Error saving message: {e}", exc_info=True)
-            raise
+        await self.writer.put(TelegramMessage, self._message_row(
+            channel, message_id, text, contains_price,
+        ))
         
     async def handle_message(self, event):
         """Handle incoming Telegram message."""
-        # Rate limiting buffer
-        now = datetime.now()
-        time_diff = (now - self.last_message_time).total_seconds()
-        if time_diff < self.buffer_seconds:
-            await asyncio.sleep(self.buffer_seconds - time_diff)
-        
-        self.last_message_time = datetime.now()
-        
         # Get message details
         message = event.message
         text = message.text or ""
@@ -234,26 +211,64 @@ class TelegramPriceScraper:
         
         logger.info(f"Message from {channel}: {text[:50]}...")
         
-        # Parse price
-        price_data = self.parse_price(text)
+        # Skip repeats and forwards before any parsing or DB work
+        duplicate = self.deduplicator.check(channel, message.id, text)
+        if duplicate:
+            logger.debug(f"Duplicate ({duplicate}) message {message.id} from {channel}")
+            return
+        
+        # Parse every quote in the message and score it for the panic index
+        quotes, is_panic = await self.text_processor.analyze(text)
         
-        # Save message for sentiment analysis
-        await self.save_message(
-            channel=channel,
-            message_id=message.id,
-            text=text,
-            contains_price=price_data is not None,
+        # Rate limit per channel (or channel and first pair); never sleep here
+        key = self.rate_limiter.key(
+            channel, quotes[0]["currency_pair"] if quotes else None
         )
+        item = (channel, message.id, text, quotes, is_panic)
+        decision = self.rate_limiter.admit(key, item)
+        
+        if decision == ChannelRateLimiter.PASSED:
+            await self.process_message(*item)
+        elif decision == ChannelRateLimiter.COALESCED:
+            self._schedule_release(key)
+        else:
+            logger.debug(f"Rate limit dropped message {message.id} from {channel}")
+    
+    async def process_message(
+        self,
+        channel: str,
+        message_id: int,
+        text: str,
+        quotes: list[dict],
+        is_panic: bool,
+    ):
+        """Save a parsed and scored message and emit its quotes, if any."""
+        now = datetime.now()
+        if not self.db_session:
+            logger.warning("No database session available")
+        else:
+            # Message (for sentiment analysis) and ticks go in the same flush, so
+            # ticks are skipped whenever their message turns out to be a duplicate
+            rows = [(TelegramMessage, self._message_row(
+                channel, message_id, text, bool(quotes), now,
+            ))]
+            if quotes:
+                rows.append((Channel, {"name": channel}))
+            for price_data in quotes:
+                rows.append((TickData, self._tick_row(
+                    price_data["currency_pair"], price_data["price"],
+                    price_data["price_type"], channel, message_id, now,
+                )))
+                logger.info(f"Queued tick: {price_data['currency_pair']} @ {price_data['price']}")
+            await self.writer.put_many(rows)
+        
+        # Scored once, with the extraction; the panic index reads the running counts
+        self.panic_window.add(now, is_panic)
         
-        if price_data:
-            # Save tick data
-            await self.save_tick_data(
-                currency_pair=price_data["currency_pair"],
-                price=price_data["price"],
-                price_type=price_data["price_type"],
-                source_channel=channel,
-                raw_message=text,
-                message_id=message.id,
+        for price_data in quotes:
+            self._track_tick(
+                price_data["currency_pair"], price_data["price_type"],
+                price_data["price"], now, channel,
             )
             
             # Emit via WebSocket
@@ -261,34 +276,247 @@ class TelegramPriceScraper:
                 await self.ws_callback({
                     "type": "price_update",
                     "data": {
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": now.isoformat(),
                         "currency_pair": price_data["currency_pair"],
                         "price": price_data["price"],
                         "price_type": price_data["price_type"],
                         "source_channel": channel,
+                        "rsi": self.rsi_engine.rsi(price_data["currency_pair"]),
                     }
                 })
     
-    async def start_listening(self):
-        """Start listening to configured channels."""
+    def _track_tick(
+        self,
+        currency_pair: str,
+        price_type: str,
+        price: float,
+        timestamp: datetime,
+        channel: str,
+    ):
+        """Feed an accepted tick to the in-memory latest quotes, tick buffers and RSI."""
+        # Only replaces a quote older than this tick
+        self.price_state.update(currency_pair, price_type, price, timestamp, channel)
+        if self.tick_buffers.append(currency_pair, price_type, price, timestamp):
+            self.rsi_engine.update(currency_pair, price)
+        else:
+            # Older than buffered ticks (backfill): the series is out of order;
+            # it is rebuilt once the buffer covers the window again
+            self.rsi_engine.discard(currency_pair)
+    
+    def _schedule_release(self, key):
+        """Arrange for a coalesced message to be processed once its bucket refills."""
+        if key in self._release_timers:
+            return
+        delay = self.rate_limiter.release_delay(key)
+        loop = asyncio.get_running_loop()
+        self._release_timers[key] = loop.call_later(delay, self._release_coalesced, key)
+    
+    def _release_coalesced(self, key):
+        """Timer callback: process the latest coalesced message for a key."""
+        self._release_timers.pop(key, None)
+        item = self.rate_limiter.release(key)
+        if item is None:
+            if key in self.rate_limiter.pending:
+                self._schedule_release(key)
+            return
+        self._spawn(self.process_message(*item))
+    
+    def _spawn(self, coro):
+        """Run a coroutine in the background, logging failures."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+    
+    def _on_task_done(self, task: asyncio.Task):
+        """Forget a finished background task and log its error, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Error processing message: {task.exception()}", exc_info=task.exception())
+    
+    async def backfill(
+        self,
+        start_date: datetime,
+        end_date: Optional[datetime] = None,
+        channels: Optional[list[str]] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        checkpoints: Optional[BackfillCheckpoints] = None,
+    ) -> dict:
+        """
+        Load channel history between two dates into the database.
+        
+        Channels are paged concurrently (up to ``concurrency`` at a time).
+        Each batch is parsed and bulk-inserted, then the checkpoint of the
+        channel and range advances to the last message written, so an
+        interrupted run of the same range resumes where it stopped. Returns
+        per-channel message and tick counts.
+        """
         if not self.client:
             await self.connect()
         
-        # Register handler for new messages
+        # Checkpoints are keyed by the requested range, open-ended or not
+        requested_end = end_date
+        end_date = end_date or datetime.now()
+        channels = channels or self.channels
+        batch_size = batch_size or settings.SCRAPER_BACKFILL_BATCH_SIZE
+        checkpoints = checkpoints or BackfillCheckpoints()
+        semaphore = asyncio.Semaphore(concurrency or settings.SCRAPER_BACKFILL_CONCURRENCY)
+        # Separate from the live deduplicator: history is windowed by post time
+        deduplicator = MessageDeduplicator()
+        
+        async def run(channel: str) -> dict:
+            async with semaphore:
+                try:
+                    return await self._backfill_channel(
+                        channel, start_date, end_date, batch_size, checkpoints,
+                        checkpoints.key(channel, start_date, requested_end), deduplicator,
+                    )
+                except Exception as e:
+                    logger.error(f"Backfill failed for {channel}: {e}", exc_info=True)
+                    return {"messages": 0, "ticks": 0, "duplicates": 0, "error": str(e)}
+        
+        results = await asyncio.gather(*(run(channel) for channel in channels))
+        return dict(zip(channels, results))
+    
+    async def _backfill_channel(
+        self,
+        channel: str,
+        start_date: datetime,
+        end_date: datetime,
+        batch_size: int,
+        checkpoints: BackfillCheckpoints,
+        checkpoint: str,
+        deduplicator: MessageDeduplicator,
+    ) -> dict:
+        """Page through one channel's history in batches, resuming from ``checkpoint``."""
+        entity = await self.client.get_entity(channel)
+        name = getattr(entity, "username", None) or str(entity.id)
+        last_id = checkpoints.get(checkpoint)
+        counts = {"messages": 0, "ticks": 0, "duplicates": 0}
+        batch = []
+        
+        logger.info(f"Backfilling {channel} from {start_date} (after message {last_id})")
+        
+        async for message in self.client.iter_messages(
+            entity,
+            offset_date=self._to_utc(start_date),
+            reverse=True,
+            min_id=last_id,
+        ):
+            timestamp = self._to_local(message.date)
+            if timestamp > end_date:
+                break
+            if getattr(message, "text", None) is None:
+                continue
+            if deduplicator.check(name, message.id, message.text, now=message.date.timestamp()):
+                counts["duplicates"] += 1
+                continue
+            batch.append((message.id, message.text, timestamp))
+            if len(batch) >= batch_size:
+                await self._write_backfill_batch(name, batch, counts)
+                checkpoints.set(checkpoint, batch[-1][0])
+                batch = []
+        
+        if batch:
+            await self._write_backfill_batch(name, batch, counts)
+            checkpoints.set(checkpoint, batch[-1][0])
+        
+        logger.info(f"Backfilled {channel}: {counts['messages']} messages, {counts['ticks']} ticks")
+        return counts
+    
+    async def _write_backfill_batch(self, channel: str, batch: list, counts: dict):
+        """Parse and score a batch of (id, text, timestamp) and bulk-insert it."""
+        messages, ticks = [], []
+        analyzed = await self.text_processor.analyze_many([text for _, text, _ in batch])
+        for (message_id, text, timestamp), (quotes, _) in zip(batch, analyzed):
+            messages.append(self._message_row(
+                channel, message_id, text, bool(quotes), timestamp,
+            ))
+            for price_data in quotes:
+                ticks.append(self._tick_row(
+                    price_data["currency_pair"], price_data["price"],
+                    price_data["price_type"], channel, message_id, timestamp,
+                ))
+        
+        await self.writer.write_now({
+            Channel: [{"name": channel}] if ticks else [],
+            TelegramMessage: messages,
+            TickData: ticks,
+        })
+        for message, (_, is_panic) in zip(messages, analyzed):
+            self.panic_window.add(message["timestamp"], is_panic)
+        for tick in ticks:
+            self._track_tick(
+                tick["currency_pair"], tick["price_type"], tick["price"],
+                tick["timestamp"], channel,
+            )
+        counts["messages"] += len(messages)
+        counts["ticks"] += len(ticks)
+    
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        """Interpret a naive local datetime as an aware UTC one."""
+        return value.astimezone(timezone.utc)
+    
+    @staticmethod
+    def _to_local(value: datetime) -> datetime:
+        """Convert Telegram's aware UTC dates to the naive local time stored in the DB."""
+        if value.tzinfo is None:
+            return value
+        return value.astimezone().replace(tzinfo=None)
+    
+    async def start_listening(self, shard_count: Optional[int] = None):
+        """Start listening to configured channels, sharded if more than one shard."""
+        shard_count = shard_count or settings.TELEGRAM_SHARDS
+        
+        await self.writer.start()
+        await self.ingest_queue.start()
+        
+        if shard_count > 1:
+            self.sharding = ShardedIngestion(self, shard_count=shard_count)
+            logger.info(f"Listening to {len(self.channels)} channels on {shard_count} shards")
+            await self.sharding.run()
+            return
+        
+        if not self.client:
+            await self.connect()
+        
+        # Register handler for new messages; workers do the actual processing
         @self.client.on(events.NewMessage(chats=self.channels))
         async def message_handler(event):
-            try:
-                await self.handle_message(event)
-            except Exception as e:
-                logger.error(f"Error handling message: {e}", exc_info=True)
+            if not await self.ingest_queue.put(event):
+                logger.warning("Ingest queue full, dropped a message")
         
         logger.info(f"Listening to channels: {self.channels}")
         
         # Run until disconnected
         await self.client.run_until_disconnected()
     
+    def get_stats(self) -> dict:
+        """Return ingest pipeline statistics."""
+        return {
+            "shards": self.sharding.stats() if self.sharding else None,
+            "dedup": self.deduplicator.stats(),
+            "ingest_queue": self.ingest_queue.stats(),
+            "rate_limiter": self.rate_limiter.stats(),
+            "writer": self.writer.stats(),
+        }
+    
     async def stop(self):
-        """Stop the scraper."""
+        """Stop the scraper and flush pending writes."""
         if self.client:
             await self.client.disconnect()
             logger.info("Disconnected from Telegram")
+        if self.sharding:
+            await self.sharding.stop()
+        
+        await self.ingest_queue.stop()
+        
+        for timer in self._release_timers.values():
+            timer.cancel()
+        self._release_timers.clear()
+        self.rate_limiter.discard_pending()
+        
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        await self.writer.stop()
@@ -0,0 +1,214 @@
+"""CPU-bound text work (price parsing, panic scoring), inline or in a process pool."""
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import LatencyRecorder
+from app.services import sentiment
+from app.services.price_parser import PriceExtractor
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Built once per process (including each pool worker)
+_extractor = PriceExtractor()
+
+
+def extract_batch(texts: list[str]) -> list[list[dict]]:
+    """Extract every quote of a batch of messages; runs in a pool worker in 'process' mode."""
+    return _extractor.parse_many(texts)
+
+
+def analyze_batch(texts: list[str]) -> list[tuple[list[dict], bool]]:
+    """Quotes and panic flag of each message; runs in a pool worker in 'process' mode."""
+    return [
+        (quotes, sentiment.is_panic(text))
+        for text, quotes in zip(texts, _extractor.parse_many(texts))
+    ]
+
+
+def count_panic_batch(texts: list[str]) -> int:
+    """Count panic messages in a batch; runs in a pool worker in 'process' mode."""
+    return sentiment.count_panic(texts)
+
+
+class TextProcessor:
+    """
+    Runs regex-heavy text work either on the event loop or in a process pool.
+
+    Features:
+    - 'inline' mode: direct calls, no overhead (default)
+    - 'process' mode: work is sent to a process pool, so the event loop keeps
+      serving API requests and WebSocket fan-out during message floods
+    - Single-message analyses are micro-batched (by size or a short delay) to
+      amortize the inter-process round-trip
+    - Ingest scores panic keywords in the same pass as the price extraction
+    - Batch size and round-trip latency metrics
+    """
+
+    MODES = ("inline", "process")
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_delay: Optional[float] = None,
+    ):
+        """Initialize the processor; the pool is started on first use."""
+        self.mode = mode or settings.TEXT_PROCESSING_MODE
+        self.workers = workers or settings.TEXT_PROCESSING_WORKERS
+        self.batch_size = batch_size or settings.TEXT_PROCESSING_BATCH_SIZE
+        self.batch_delay = (
+            batch_delay if batch_delay is not None
+            else settings.TEXT_PROCESSING_BATCH_MS / 1000
+        )
+
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown text processing mode: {self.mode}")
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Single-message analyses waiting for the next batch
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set[asyncio.Task] = set()
+
+        self.round_trip = LatencyRecorder()
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def offloaded(self) -> bool:
+        """True if work runs in the process pool."""
+        return self.mode == "process"
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Create the pool lazily ('spawn', so workers do not inherit the event loop)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"Started text processing pool with {self.workers} workers")
+        return self._pool
+
+    async def _run(self, func, texts: list[str]):
+        """Run ``func(texts)`` in the pool and record the round-trip."""
+        started = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(self._get_pool(), func, texts)
+        self.round_trip.record(time.perf_counter() - started)
+        self.batches += 1
+        self.items += len(texts)
+        return result
+
+    async def start(self):
+        """Spawn the pool workers up front (no-op inline)."""
+        if self.offloaded:
+            await asyncio.gather(*(self._run(analyze_batch, []) for _ in range(self.workers)))
+
+    async def extract(self, text: str) -> list[dict]:
+        """Return every quote in one message, batched with concurrent callers in 'process' mode."""
+        if not self.offloaded:
+            return _extractor.extract_all(text)
+        quotes, _ = await self.analyze(text)
+        return quotes
+
+    async def analyze(self, text: str) -> tuple[list[dict], bool]:
+        """
+        Return every quote in one message and whether it mentions a panic
+        keyword, batched with concurrent callers in 'process' mode.
+        """
+        if not self.offloaded:
+            return analyze_batch([text])[0]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_delay, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        """Send the pending single-message analyses to the pool as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(analyze_batch, [text for text, _ in batch]))
+            self._in_flight.add(task)
+            task.add_done_callback(lambda done: self._resolve(batch, done))
+
+    def _resolve(self, batch: list[tuple[str, asyncio.Future]], done: asyncio.Task):
+        """Hand batch results (or its error) back to the waiting callers."""
+        self._in_flight.discard(done)
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if done.cancelled():
+                future.cancel()
+            elif done.exception():
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result()[i])
+
+    async def extract_many(self, texts: list[str]) -> list[list[dict]]:
+        """Return every quote of each message, split across the pool in 'process' mode."""
+        if not self.offloaded:
+            return extract_batch(texts)
+
+        chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._run(extract_batch, chunk) for chunk in chunks))
+        return [quotes for chunk in results for quotes in chunk]
+
+    async def analyze_many(self, texts: list[str]) -> list[tuple[list[dict], bool]]:
+        """Quotes and panic flag of each message, split across the pool in 'process' mode."""
+        if not self.offloaded:
+            return analyze_batch(texts)
+
+        chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._run(analyze_batch, chunk) for chunk in chunks))
+        return [analysis for chunk in results for analysis in chunk]
+
+    async def count_panic(self, texts: list[str]) -> int:
+        """Count messages that mention a panic keyword."""
+        if not self.offloaded:
+            return count_panic_batch(texts)
+        return await self._run(count_panic_batch, texts)
+
+    async def stop(self):
+        """Finish pending analyses and shut the pool down."""
+        self._dispatch()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        """Return mode, batching and round-trip statistics."""
+        return {
+            "mode": self.mode,
+            "workers": self.workers if self.offloaded else 0,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 1) if self.batches else 0.0,
+            "round_trip": self.round_trip.snapshot(),
+        }
+
+
+_text_processor: Optional[TextProcessor] = None
+
+
+def get_text_processor() -> TextProcessor:
+    """Return the process-wide TextProcessor (one pool shared by all services)."""
+    global _text_processor
+    if _text_processor is None:
+        _text_processor = TextProcessor()
+    return _text_processor
@@ -0,0 +1,242 @@
+"""Recent ticks per currency pair in fixed-capacity NumPy ring buffers."""
+import logging
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.data import CURRENCY_PAIRS, PRICE_TYPES, TickData
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Sides are stored as their position in PRICE_TYPES
+SIDE_CODES = {name: code for code, name in enumerate(PRICE_TYPES)}
+ONE_MICROSECOND = np.timedelta64(1, "us")
+
+
+class TickWindow(NamedTuple):
+    """Views of one pair's ticks, oldest first."""
+
+    timestamps: np.ndarray  # datetime64[us], naive local time like tick_data
+    prices: np.ndarray      # float64
+    sides: np.ndarray       # int8 position in PRICE_TYPES
+
+
+EMPTY_WINDOW = TickWindow(
+    np.empty(0, dtype="datetime64[us]"), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int8),
+)
+
+
+class TickRingBuffer:
+    """
+    The latest ``capacity`` ticks of one pair, in time order.
+
+    Every column is stored twice, back to back (slots ``i`` and
+    ``i + capacity``), so the latest ``n <= capacity`` ticks always form one
+    contiguous slice and windows are views, never copies. A view stays valid
+    until ``capacity`` more ticks have been appended; copy it to keep it.
+
+    Memory is fixed at allocation: 2 x (8 + 8 + 1) = 34 bytes per slot.
+    """
+
+    BYTES_PER_SLOT = 2 * (8 + 8 + 1)
+
+    def __init__(self, capacity: int):
+        """Allocate an empty buffer (coverage unknown until loaded)."""
+        self.capacity = capacity
+        self.timestamps = np.zeros(2 * capacity, dtype="datetime64[us]")
+        self.prices = np.zeros(2 * capacity, dtype=np.float64)
+        self.sides = np.zeros(2 * capacity, dtype=np.int8)
+        self.count = 0  # ticks ever appended
+        self.dropped = 0  # out-of-order ticks rejected
+        # Every tick at or after this time is held; None while that is unknown
+        self.complete_from: Optional[np.datetime64] = None
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.prices.nbytes + self.sides.nbytes
+
+    def _end(self) -> int:
+        """One past the newest tick, in the second copy."""
+        return self.count % self.capacity + self.capacity
+
+    def _missing(self, timestamp: np.datetime64):
+        """Record that a tick at ``timestamp`` is not held: coverage starts after it."""
+        after = timestamp + ONE_MICROSECOND
+        if self.complete_from is not None and after > self.complete_from:
+            self.complete_from = after
+
+    def append(self, timestamp: datetime, price: float, side: int) -> bool:
+        """Add the newest tick; older than the newest held, it is dropped instead."""
+        timestamp = np.datetime64(timestamp, "us")
+        end = self._end()
+        if self.count and timestamp < self.timestamps[end - 1]:
+            # e.g. backfilled history: windows reaching back past it are incomplete
+            self.dropped += 1
+            self._missing(timestamp)
+            return False
+        if self.count >= self.capacity:
+            self._missing(self.timestamps[end - self.capacity])  # oldest, overwritten below
+
+        slot = self.count % self.capacity
+        for index in (slot, slot + self.capacity):
+            self.timestamps[index] = timestamp
+            self.prices[index] = price
+            self.sides[index] = side
+        self.count += 1
+        return True
+
+    def load(
+        self,
+        timestamps: np.ndarray,
+        prices: np.ndarray,
+        sides: np.ndarray,
+        complete_from: datetime,
+    ):
+        """Replace the contents with time-ordered arrays (only their last ``capacity`` kept)."""
+        timestamps = np.asarray(timestamps, dtype="datetime64[us]")[-self.capacity:]
+        prices = np.asarray(prices, dtype=np.float64)[-self.capacity:]
+        sides = np.asarray(sides, dtype=np.int8)[-self.capacity:]
+        count = len(timestamps)
+        for offset in (0, self.capacity):
+            self.timestamps[offset:offset + count] = timestamps
+            self.prices[offset:offset + count] = prices
+            self.sides[offset:offset + count] = sides
+        self.count = count
+        self.dropped = 0
+        self.complete_from = np.datetime64(complete_from, "us")
+
+    def covers(self, since: datetime) -> bool:
+        """Whether every tick since ``since`` is held."""
+        return self.complete_from is not None and np.datetime64(since, "us") >= self.complete_from
+
+    def window(self, since: Optional[datetime] = None) -> TickWindow:
+        """Views of the held ticks at or after ``since`` (all of them by default)."""
+        end = self._end()
+        start = end - len(self)
+        if since is not None:
+            start += int(np.searchsorted(
+                self.timestamps[start:end], np.datetime64(since, "us"), side="left",
+            ))
+        return TickWindow(self.timestamps[start:end], self.prices[start:end], self.sides[start:end])
+
+
+class TickBuffers:
+    """
+    Recent ticks of every pair, held in memory for indicators and charts.
+
+    Features:
+    - One TickRingBuffer per pair, allocated on its first tick
+      (``TICK_BUFFER_CAPACITY`` slots of 34 bytes: 1.7 MB per pair at 50k)
+    - Appended to by the scraper as ticks are accepted
+    - Warm-loaded at startup from the last ``TICK_BUFFER_DAYS`` of ``tick_data``
+    - Zero-copy windows, only when they hold every tick of the requested span
+
+    Only the process running the scraper sees live ticks; elsewhere nothing is
+    loaded, ``window`` returns None and readers fall back to the database.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, days: Optional[int] = None):
+        """Initialize without any buffers."""
+        self.capacity = capacity or settings.TICK_BUFFER_CAPACITY
+        self.days = days or settings.TICK_BUFFER_DAYS
+        self._buffers: dict[str, TickRingBuffer] = {}
+        # Start of the warm-loaded span; None until loaded
+        self.loaded_from: Optional[datetime] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_from is not None
+
+    def _buffer(self, currency_pair: str) -> TickRingBuffer:
+        buffer = self._buffers.get(currency_pair)
+        if buffer is None:
+            buffer = self._buffers[currency_pair] = TickRingBuffer(self.capacity)
+            if self.loaded_from is not None:
+                # No ticks of this pair since the load
+                buffer.complete_from = np.datetime64(self.loaded_from, "us")
+        return buffer
+
+    def append(
+        self, currency_pair: str, price_type: str, price: float, timestamp: datetime,
+    ) -> bool:
+        """Add an accepted tick; returns whether it was kept (it is dropped if out of order)."""
+        return self._buffer(currency_pair).append(timestamp, price, SIDE_CODES[price_type])
+
+    def window(self, currency_pair: str, since: datetime) -> Optional[TickWindow]:
+        """Views of a pair's ticks since ``since``, or None if some of them are not held."""
+        buffer = self._buffers.get(currency_pair)
+        if buffer is None:
+            if self.loaded_from is not None and since >= self.loaded_from:
+                return EMPTY_WINDOW
+            return None
+        return buffer.window(since) if buffer.covers(since) else None
+
+    async def load(self, session: AsyncSession):
+        """Warm-load the latest ticks of every pair (up to capacity) from the database."""
+        cutoff = datetime.now() - timedelta(days=self.days)
+        self._buffers.clear()
+        self.loaded_from = cutoff
+        for currency_pair in CURRENCY_PAIRS:
+            result = await session.execute(
+                select(TickData.timestamp, TickData.price, TickData.price_type)
+                .where(TickData.currency_pair == currency_pair)
+                .where(TickData.timestamp >= cutoff)
+                .order_by(TickData.timestamp.desc())
+                .limit(self.capacity)
+            )
+            rows = result.all()[::-1]
+            if not rows:
+                continue
+            timestamps = np.array([row.timestamp for row in rows], dtype="datetime64[us]")
+            complete_from = (
+                cutoff if len(rows) < self.capacity
+                else (timestamps[0] + ONE_MICROSECOND).astype(datetime)
+            )
+            self._buffer(currency_pair).load(
+                timestamps,
+                np.array([row.price for row in rows], dtype=np.float64),
+                np.array([SIDE_CODES[row.price_type] for row in rows], dtype=np.int8),
+                complete_from,
+            )
+        logger.info(
+            f"Loaded {sum(len(b) for b in self._buffers.values())} ticks into "
+            f"{len(self._buffers)} pair buffers"
+        )
+
+    def stats(self) -> dict:
+        """Return buffer statistics: ticks held, coverage and memory per pair."""
+        return {
+            "loaded": self.loaded,
+            "capacity": self.capacity,
+            "bytes": sum(buffer.nbytes for buffer in self._buffers.values()),
+            "pairs": {
+                pair: {
+                    "ticks": len(buffer),
+                    "dropped": buffer.dropped,
+                    "complete_from": (
+                        buffer.complete_from.astype(datetime).isoformat()
+                        if buffer.complete_from is not None else None
+                    ),
+                }
+                for pair, buffer in sorted(self._buffers.items())
+            },
+        }
+
+
+_tick_buffers: Optional[TickBuffers] = None
+
+
+def get_tick_buffers() -> TickBuffers:
+    """Return the process-wide TickBuffers."""
+    global _tick_buffers
+    if _tick_buffers is None:
+        _tick_buffers = TickBuffers()
+    return _tick_buffers
@@ -0,0 +1,349 @@
+"""Write-behind batching stage for ingest inserts."""
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.metrics import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class WriteBehindBuffer:
+    """
+    Collects ORM rows in memory and writes them to the database in batches.
+
+    Features:
+    - One multi-row INSERT per table per flush, in a single transaction
+    - Flushes when the batch size is reached or the flush interval elapses
+    - Optional ON CONFLICT DO NOTHING per table, skipping dependent rows
+      (e.g. ticks of a message that already exists); a row repeating a
+      pending conflict key is dropped with the dependent rows queued with it
+    - Remembers the written keys of lookup tables, so known rows skip the INSERT
+    - Keeps failed batches for retry; new and retried rows are dropped past
+      a bounded number of pending rows
+    - Reports queue depth and flush latency
+    - Drains everything still pending on stop
+    """
+
+    def __init__(
+        self,
+        max_batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        conflict_keys: Optional[dict[type, tuple[str, ...]]] = None,
+        dependents: Optional[dict[type, tuple[type, tuple[str, ...]]]] = None,
+        remembered: tuple[type, ...] = (),
+        inserts: Optional[dict[type, Callable]] = None,
+    ):
+        """
+        Initialize the buffer.
+
+        ``conflict_keys`` maps a model to the unique columns used for
+        ON CONFLICT DO NOTHING. ``dependents`` maps a model to (parent model,
+        columns matching the parent's conflict key): its rows are dropped when
+        the parent row with the same key conflicted in the same batch.
+        ``remembered`` models (lookup tables) keep the conflict keys of every
+        row written or preloaded, and rows repeating them are not sent again.
+        ``inserts`` maps a model to a function building the statement used
+        instead of the default INSERT ... ON CONFLICT DO NOTHING; it returns
+        no rows, so such a model cannot have dependents.
+        """
+        self.max_batch_size = max_batch_size or settings.SCRAPER_WRITE_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else settings.SCRAPER_WRITE_FLUSH_SECONDS
+        )
+        self.max_pending = max_pending or settings.SCRAPER_WRITE_MAX_PENDING
+        self.conflict_keys = conflict_keys or {}
+        self.dependents = dependents or {}
+        self.inserts = inserts or {}
+        # Conflict keys known to exist in the database, per remembered model
+        self._known: dict[type, set] = {model: set() for model in remembered}
+
+        self.db_session: Optional[AsyncSession] = None
+        self._pending: dict[type, list[dict]] = {}
+        # Conflict keys of the pending rows, per model
+        self._pending_keys: dict[type, set] = {}
+        self._depth = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        self.flush_latency = LatencyRecorder()
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_conflicted = 0
+        self.max_depth = 0
+
+    async def set_db_session(self, session: AsyncSession):
+        """Set database session."""
+        self.db_session = session
+
+    async def preload(self, model: type) -> int:
+        """Remember the conflict keys already in ``model``'s table. Returns their count."""
+        table = model.__table__
+        keys = self.conflict_keys[model]
+        result = await self.db_session.execute(select(*(table.c[key] for key in keys)))
+        known = self._known.setdefault(model, set())
+        known.update(tuple(row) for row in result.all())
+        return len(known)
+
+    @property
+    def depth(self) -> int:
+        """Number of rows waiting to be written."""
+        return self._depth
+
+    async def start(self):
+        """Start the background flush loop."""
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, model: type, row: dict):
+        """Queue a row for insertion into ``model``'s table."""
+        await self.put_many([(model, row)])
+
+    async def put_many(self, rows: list[tuple[type, dict]]):
+        """
+        Queue related rows together so they always land in the same flush.
+
+        If a row repeats the conflict key of a pending row (the same message
+        queued twice), it is dropped along with its dependents among ``rows``.
+        The rows are dropped together when they would take the buffer past
+        ``max_pending`` (the database has been failing for a while).
+        """
+        if self._depth + len(rows) > self.max_pending:
+            self.rows_dropped += len(rows)
+            logger.error(f"Write-behind buffer full, dropped {len(rows)} rows")
+            return
+
+        batch: dict[type, list[dict]] = {}
+        for model, row in rows:
+            batch.setdefault(model, []).append(row)
+        batch, repeated = self._without_repeated(batch, self._pending_keys)
+        for model, model_rows in batch.items():
+            self._pending.setdefault(model, []).extend(model_rows)
+        self._depth += len(rows) - repeated
+        self.rows_conflicted += repeated
+        self.max_depth = max(self.max_depth, self._depth)
+
+        if self._depth >= self.max_batch_size:
+            if self._task is not None:
+                self._wakeup.set()
+            else:
+                await self.flush()
+
+    async def flush(self) -> int:
+        """Write all pending rows. Returns the number of rows written."""
+        async with self._flush_lock:
+            if not self._depth:
+                return 0
+            if not self.db_session:
+                logger.warning("No database session available")
+                return 0
+
+            batch, self._pending = self._pending, {}
+            count, self._depth = self._depth, 0
+            self._pending_keys = {}
+
+            try:
+                await self._execute(batch, count)
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(f"Error flushing {count} rows: {e}", exc_info=True)
+                self._requeue(batch, count)
+                return 0
+
+            logger.debug(f"Flushed {count} rows, {self._depth} pending")
+            return count
+
+    async def write_now(self, batch: dict[type, list[dict]]) -> int:
+        """
+        Write a batch immediately, bypassing the buffer.
+
+        Used for bulk loads that must know their rows are durable (e.g. before
+        advancing a checkpoint). Raises on failure.
+        """
+        if not self.db_session:
+            raise RuntimeError("No database session available")
+
+        count = sum(len(rows) for rows in batch.values())
+        if not count:
+            return 0
+        async with self._flush_lock:
+            await self._execute(batch, count)
+        return count
+
+    async def _execute(self, batch: dict[type, list[dict]], count: int):
+        """Insert a batch in one transaction and record its latency."""
+        started = time.perf_counter()
+        written = 0
+        conflicted: dict[type, set] = {}
+        learned: dict[type, set] = {}
+        # Tables with conflict keys go first so dependents can be filtered
+        models = sorted(batch, key=lambda model: model not in self.conflict_keys)
+        try:
+            for model in models:
+                rows = self._without_conflicted_parents(model, batch[model], conflicted)
+                if not rows:
+                    continue
+                keys = self.conflict_keys.get(model)
+                if keys and model in self._known:
+                    # Known rows exist already: skip them, keeping their dependents
+                    known = self._known[model]
+                    rows = [
+                        row for row in self._first_per_key(rows, keys)
+                        if tuple(row[key] for key in keys) not in known
+                    ]
+                    if not rows:
+                        continue
+                    learned[model] = {tuple(row[key] for key in keys) for row in rows}
+                if keys and model in self.inserts:
+                    await self.db_session.execute(self.inserts[model](), rows)
+                    written += len(rows)
+                elif keys:
+                    rows = self._first_per_key(rows, keys)
+                    table = model.__table__
+                    statement = (
+                        pg_insert(model)
+                        .on_conflict_do_nothing(index_elements=list(keys))
+                        .returning(*(table.c[key] for key in keys))
+                    )
+                    result = await self.db_session.execute(statement, rows)
+                    inserted = {tuple(row) for row in result.all()}
+                    conflicted[model] = {
+                        tuple(row[key] for key in keys) for row in rows
+                    } - inserted
+                    written += len(rows) - len(conflicted[model])
+                else:
+                    await self.db_session.execute(insert(model), rows)
+                    written += len(rows)
+            await self.db_session.commit()
+        except Exception:
+            await self.db_session.rollback()
+            raise
+
+        # Committed without error, so every row of these keys now exists
+        for model, keys in learned.items():
+            self._known[model] |= keys
+
+        self.flush_latency.record(time.perf_counter() - started)
+        self.flushes += 1
+        self.rows_written += written
+        self.rows_conflicted += count - written
+
+    def _without_repeated(
+        self,
+        batch: dict[type, list[dict]],
+        seen: dict[type, set],
+    ) -> tuple[dict[type, list[dict]], int]:
+        """
+        Drop rows whose conflict key is in ``seen`` and the dependents of
+        those keys in ``batch``; add the kept rows' keys to ``seen``.
+
+        Returns the kept rows and the number of rows dropped.
+        """
+        kept: dict[type, list[dict]] = {}
+        repeated: dict[type, set] = {}
+        dropped = 0
+        # Tables with conflict keys go first so dependents can be filtered
+        for model in sorted(batch, key=lambda model: model not in self.conflict_keys):
+            rows = batch[model]
+            keys = self.conflict_keys.get(model)
+            if keys:
+                known = seen.setdefault(model, set())
+                unique = []
+                for row in rows:
+                    key = tuple(row[k] for k in keys)
+                    if key in known:
+                        repeated.setdefault(model, set()).add(key)
+                    else:
+                        known.add(key)
+                        unique.append(row)
+                rows = unique
+            rows = self._without_conflicted_parents(model, rows, repeated)
+            dropped += len(batch[model]) - len(rows)
+            kept[model] = rows
+        return kept, dropped
+
+    @staticmethod
+    def _first_per_key(rows: list[dict], keys: tuple[str, ...]) -> list[dict]:
+        """Keep the first row for each conflict key (rows of one ``write_now`` batch)."""
+        unique: dict[tuple, dict] = {}
+        for row in rows:
+            unique.setdefault(tuple(row[key] for key in keys), row)
+        return list(unique.values())
+
+    def _without_conflicted_parents(
+        self,
+        model: type,
+        rows: list[dict],
+        conflicted: dict[type, set],
+    ) -> list[dict]:
+        """Drop dependent rows whose parent row already existed or was repeated."""
+        dependency = self.dependents.get(model)
+        if not dependency or not conflicted.get(dependency[0]):
+            return rows
+        parent, columns = dependency
+        skipped = conflicted[parent]
+        return [row for row in rows if tuple(row[c] for c in columns) not in skipped]
+
+    def _requeue(self, batch: dict[type, list[dict]], count: int):
+        """Put a failed batch back in front of newer rows, dropping it if full."""
+        if self._depth + count > self.max_pending:
+            self.rows_dropped += count
+            logger.error(f"Write-behind buffer full, dropped {count} rows")
+            return
+
+        # Newer copies of the failed batch's rows are dropped with their dependents
+        keys: dict[type, set] = {}
+        batch, _ = self._without_repeated(batch, keys)
+        newer, repeated = self._without_repeated(self._pending, keys)
+        for model, rows in newer.items():
+            batch.setdefault(model, []).extend(rows)
+        self._pending = batch
+        self._pending_keys = keys
+        self._depth += count - repeated
+        self.rows_conflicted += repeated
+
+    async def _run(self):
+        """Flush on size or time, whichever comes first."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def stop(self):
+        """Stop the flush loop and drain pending rows."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        """Return queue depth and flush statistics."""
+        return {
+            "queue_depth": self._depth,
+            "max_queue_depth": self.max_depth,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_conflicted": self.rows_conflicted,
+            "flush_latency": self.flush_latency.snapshot(),
+        }
@@ -0,0 +1 @@
+"""Microbenchmarks for the ingest and analysis paths."""
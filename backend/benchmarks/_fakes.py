@@ -0,0 +1,60 @@
+"""In-process stand-ins for Telegram and the database used by the benchmarks."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from benchmarks._synthetic import generate_messages
+
+
+class NullSession:
+    """AsyncSession stand-in that accepts writes and discards them."""
+
+    def __init__(self, write_delay: float = 0.0):
+        self.write_delay = write_delay
+        self.rows = 0
+
+    async def execute(self, statement, params=None):
+        if self.write_delay:
+            await asyncio.sleep(self.write_delay)
+        self.rows += len(params or [])
+        # INSERT ... RETURNING: report every row as inserted
+        columns = [column.name for column in getattr(statement, "_returning", ())]
+        keys = [tuple(row[name] for name in columns) for row in params or []] if columns else []
+        return SimpleNamespace(all=lambda: keys)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeHistoryClient:
+    """TelegramClient stand-in serving synthetic channel history page by page."""
+
+    PAGE_SIZE = 100
+
+    def __init__(self, channels: list[str], per_channel: int, page_delay: float):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.page_delay = page_delay
+        # A different seed per channel, so channels are not forwards of each other
+        self.history = {
+            channel: [
+                (i + 1, start + timedelta(seconds=30 * i), text)
+                for i, text in enumerate(generate_messages(per_channel, seed=seed))
+            ]
+            for seed, channel in enumerate(channels)
+        }
+
+    async def get_entity(self, channel: str):
+        return SimpleNamespace(username=channel.lstrip("@"), id=hash(channel))
+
+    async def iter_messages(self, entity, offset_date=None, reverse=False, min_id=0):
+        for index, (message_id, date, text) in enumerate(self.history[f"@{entity.username}"]):
+            if index % self.PAGE_SIZE == 0:
+                await asyncio.sleep(self.page_delay)
+            if message_id > min_id:
+                yield SimpleNamespace(id=message_id, date=date, text=text)
+
+    async def disconnect(self):
+        pass
@@ -0,0 +1,39 @@
+"""Synthetic Telegram message generator shared by the benchmarks."""
+import random
+
+PRICE_TEMPLATES = [
+    "سعر الدولار الآن: {usd:.2f}",
+    "سعر الدولار شراء {usd:.2f} بيع {usd_sell:.2f}",
+    "سعر اليورو بيع {eur:.2f}",
+    "الدولار بـ {usd:.2f} دينار",
+    "USD/LYD: {usd:.2f}",
+    "EUR/LYD buy {eur:.2f} sell {eur_sell:.2f}",
+    "USD rate: {usd:.2f} | EUR rate: {eur:.2f}",
+    "الدولار شراء {usd:.2f} بيع {usd_sell:.2f} - اليورو شراء {eur:.2f} بيع {eur_sell:.2f}",
+]
+
+CHATTER_TEMPLATES = [
+    "أهلاً وسهلاً بكم في قناتنا",
+    "السوق هادئ اليوم، ننتظر تحديث الأسعار",
+    "تحذير: أزمة سيولة في المصارف والسوق السوداء تتحرك",
+    "Liquidity crisis deepens as banks limit withdrawals",
+    "Join our channel for daily updates on the black market",
+    "Inflation fears grow across Tripoli markets",
+]
+
+
+def generate_messages(count: int, price_ratio: float = 0.6, seed: int = 42) -> list[str]:
+    """Return ``count`` realistic channel posts, ``price_ratio`` of them quoting prices."""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        usd = rng.uniform(6.5, 7.5)
+        eur = rng.uniform(7.2, 8.2)
+        if rng.random() < price_ratio:
+            text = rng.choice(PRICE_TEMPLATES).format(
+                usd=usd, usd_sell=usd + 0.05, eur=eur, eur_sell=eur + 0.05,
+            )
+        else:
+            text = rng.choice(CHATTER_TEMPLATES)
+        messages.append(text)
+    return messages
@@ -0,0 +1,52 @@
+"""
+Benchmark: historical backfill throughput vs channel concurrency.
+
+Pages through a fake history source with a simulated per-page round-trip and
+a simulated per-insert DB latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_backfill [--channels 8] [--per-channel 2000]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from app.services.backfill import BackfillCheckpoints
+from app.services.telegram_scraper import TelegramPriceScraper
+from benchmarks._fakes import FakeHistoryClient, NullSession
+
+
+async def run(channels: list[str], per_channel: int, concurrency: int, args) -> float:
+    client = FakeHistoryClient(channels, per_channel, page_delay=args.page_delay)
+    scraper = TelegramPriceScraper(api_id="0", api_hash="0", client=client, channels=channels)
+    await scraper.set_db_session(NullSession(write_delay=args.write_delay))
+
+    started = time.perf_counter()
+    await scraper.backfill(
+        start_date=datetime(2023, 12, 31),
+        end_date=datetime(2030, 1, 1),
+        concurrency=concurrency,
+        batch_size=args.batch_size,
+        checkpoints=BackfillCheckpoints(path=""),
+    )
+    return len(channels) * per_channel / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--per-channel", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--page-delay", type=float, default=0.02)
+    parser.add_argument("--write-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    channels = [f"@channel{i}" for i in range(args.channels)]
+    for concurrency in sorted({1, 2, 4, args.channels}):
+        rate = asyncio.run(run(channels, args.per_channel, concurrency, args))
+        print(f"concurrency {concurrency:>3}: {rate:>10,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
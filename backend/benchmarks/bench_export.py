@@ -0,0 +1,110 @@
+"""
+Benchmark: pulling daily history into a DataFrame, /data/daily JSON vs Arrow export.
+
+Loads synthetic daily bars for one pair into a scratch SQLite database, then
+times the full round trip both ways: the ``/data/daily`` handler (ORM objects,
+Pydantic response model, JSON) followed by ``pd.DataFrame(json.loads(...))``,
+and the Arrow IPC export followed by ``read_pandas()``. Reports wall time,
+payload size and peak Python heap (a second, traced pass). Needs pyarrow.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export [--rows 100000] [--batch-size 5000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.data import get_daily_data
+from app.models.data import DailyData
+from app.schemas.data import DailyDataSchema
+from app.services.export import export_chunks
+
+PAIR = "USD/LYD"
+
+
+async def load(engine, rows: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(DailyData.__table__.create)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        for start in range(0, rows, 10_000):
+            await conn.execute(DailyData.__table__.insert(), [
+                {
+                    "id": i + 1, "date": today - timedelta(days=i), "currency_pair": PAIR,
+                    "open": 6.8, "high": 6.9, "low": 6.7, "close": 6.85, "volume": 1000.0,
+                    "source": "fulus.ly",
+                }
+                for i in range(start, min(start + 10_000, rows))
+            ])
+
+
+async def via_json(sessions, rows: int) -> tuple[pd.DataFrame, int]:
+    async with sessions() as session:
+        records = await get_daily_data(currency_pair=PAIR, days=rows + 1, db=session)
+        body = TypeAdapter(list[DailyDataSchema]).dump_json(records)
+    return pd.DataFrame(json.loads(body)), len(body)
+
+
+async def via_arrow(sessions, batch_size: int) -> tuple[pd.DataFrame, int]:
+    async with sessions() as session:
+        body = b"".join([
+            chunk async for chunk in export_chunks(
+                session, "daily", "arrow", PAIR, batch_size=batch_size,
+            )
+        ])
+    return pa.ipc.open_stream(body).read_pandas(), len(body)
+
+
+async def measure(path, sessions) -> dict:
+    started = time.perf_counter()
+    frame, size = await path(sessions)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    await path(sessions)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": len(frame), "seconds": seconds, "bytes": size, "peak_heap": peak}
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        await load(engine, args.rows)
+        sessions = async_sessionmaker(engine, class_=AsyncSession)
+        try:
+            return {
+                "json": await measure(lambda s: via_json(s, args.rows), sessions),
+                "arrow": await measure(lambda s: via_arrow(s, args.batch_size), sessions),
+            }
+        finally:
+            await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    for name, result in results.items():
+        print(
+            f"{name:>6}: {result['rows']:>9,} rows  {result['seconds']:>7.2f} s  "
+            f"{result['bytes'] / 1e6:>8.1f} MB payload  "
+            f"{result['peak_heap'] / 1e6:>8.1f} MB peak heap"
+        )
+    print(f"speedup: {results['json']['seconds'] / results['arrow']['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
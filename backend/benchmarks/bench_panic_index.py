@@ -0,0 +1,122 @@
+"""
+Benchmark: market panic index from a database query vs the streaming window.
+
+Loads a day of synthetic channel posts (``--messages`` over the last 24
+hours, 100k by default) into a scratch SQLite database. For each window
+definition it then times the database path (``_compute_market_panic_index``:
+query the window, score every text) against feeding the same posts through
+``PanicWindow`` once (ingest cost per message) and reading the index
+(``calculate_market_panic_index`` on the hydrated window), and checks that
+both give the same value.
+
+Usage (from backend/):
+    python -m benchmarks.bench_panic_index [--messages 100000] [--reads 1000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import TelegramMessage
+from app.services import panic_index
+from app.services.analysis import AnalysisService
+from app.services.panic_index import PanicWindow
+from benchmarks._synthetic import generate_messages
+
+# (label, max_messages, max_age_hours)
+WINDOWS = [
+    ("last 100 in 24h", 100, 24),
+    ("all of 24h", 0, 24),
+    ("last 1000", 1000, 0),
+]
+
+
+def posts(count: int) -> list[tuple[datetime, str]]:
+    """``count`` posts evenly spread over the last 24 hours (minus a margin), oldest first."""
+    newest = datetime.now()
+    step = (timedelta(hours=24) - timedelta(minutes=10)) / count
+    texts = generate_messages(count, price_ratio=0.4)
+    return [(newest - (count - i) * step, text) for i, text in enumerate(texts)]
+
+
+async def load(engine, messages: list[tuple[datetime, str]]):
+    async with engine.begin() as conn:
+        await conn.run_sync(TelegramMessage.__table__.create)
+        for start in range(0, len(messages), 10_000):
+            await conn.execute(TelegramMessage.__table__.insert(), [
+                {"timestamp": timestamp, "channel": "EwanLibya", "message_id": i,
+                 "text": text, "contains_price": 0}
+                for i, (timestamp, text) in enumerate(messages[start:start + 10_000], start=start)
+            ])
+
+
+async def run_window(session, messages, max_messages: int, max_age_hours: float, args) -> dict:
+    window = PanicWindow(max_messages=max_messages, max_age_hours=max_age_hours)
+    panic_index._panic_window = window
+    service = AnalysisService()
+    await service.set_db_session(session)
+
+    started = time.perf_counter()
+    for _ in range(args.queries):
+        from_db = await service._compute_market_panic_index()
+    query_seconds = (time.perf_counter() - started) / args.queries
+
+    started = time.perf_counter()
+    for timestamp, text in messages:
+        window.add_text(timestamp, text)
+    ingest_seconds = (time.perf_counter() - started) / len(messages)
+    window.hydrated = True
+
+    started = time.perf_counter()
+    for _ in range(args.reads):
+        from_window = await service.calculate_market_panic_index()
+    read_seconds = (time.perf_counter() - started) / args.reads
+
+    return {
+        "query": query_seconds, "ingest": ingest_seconds, "read": read_seconds,
+        "from_db": from_db, "from_window": from_window, "window": len(window),
+    }
+
+
+async def run(args) -> dict:
+    messages = posts(args.messages)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        await load(engine, messages)
+        try:
+            async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+                return {
+                    label: await run_window(session, messages, max_messages, hours, args)
+                    for label, max_messages, hours in WINDOWS
+                }
+        finally:
+            panic_index._panic_window = None
+            await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{args.messages:,} messages over 24h")
+    for label, result in results.items():
+        print(
+            f"{label:>16}: query {result['query'] * 1000:>9.2f} ms  "
+            f"read {result['read'] * 1e6:>6.2f} us  "
+            f"ingest {result['ingest'] * 1e6:>5.2f} us/msg  "
+            f"window {result['window']:>7,}  "
+            f"index {result['from_db']:.2f} vs {result['from_window']:.2f}"
+        )
+        assert result["from_db"] == result["from_window"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: PriceExtractor.parse_many vs calling parse_price in a loop.
+
+parse_price keeps one quote per message; parse_many returns every quote, so
+the report also counts how many quotes each approach recovers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_parse_many [--messages 200000]
+"""
+import argparse
+import time
+
+from app.services.price_parser import PriceExtractor
+from benchmarks._synthetic import generate_messages
+
+
+def measure(run, messages: list[str], repeat: int = 3) -> tuple[float, int]:
+    """Return the best messages/sec over ``repeat`` runs and the quotes found."""
+    best, quotes = 0.0, 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        quotes = run(messages)
+        best = max(best, len(messages) / (time.perf_counter() - started))
+    return best, quotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    messages = generate_messages(args.messages)
+    extractor = PriceExtractor()
+
+    def loop(texts):
+        parse = extractor.parse
+        return sum(1 for text in texts if parse(text))
+
+    def batch(texts):
+        return sum(len(quotes) for quotes in extractor.parse_many(texts))
+
+    loop_rate, loop_quotes = measure(loop, messages)
+    batch_rate, batch_quotes = measure(batch, messages)
+
+    print(f"messages:             {len(messages)}")
+    print(f"parse_price loop:     {loop_rate:>10,.0f} msg/s  {loop_quotes:>8} quotes")
+    print(f"parse_many:           {batch_rate:>10,.0f} msg/s  {batch_quotes:>8} quotes")
+    print(f"quotes per second:    {loop_rate * loop_quotes / len(messages):>10,.0f} -> "
+          f"{batch_rate * batch_quotes / len(messages):,.0f}")
+
+
+if __name__ == "__main__":
+    main()
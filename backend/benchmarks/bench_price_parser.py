@@ -0,0 +1,46 @@
+"""
+Microbenchmark: PriceExtractor vs the original PRICE_PATTERNS loop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_price_parser [--messages 200000]
+"""
+import argparse
+import time
+
+from app.services.price_parser import PriceExtractor, parse_price_reference
+from benchmarks._synthetic import generate_messages
+
+
+def measure(parse, messages: list[str], repeat: int = 3) -> float:
+    """Return the best messages/sec over ``repeat`` runs."""
+    best = 0.0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in messages:
+            parse(text)
+        elapsed = time.perf_counter() - started
+        best = max(best, len(messages) / elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    messages = generate_messages(args.messages)
+    extractor = PriceExtractor()
+
+    mismatches = sum(extractor.parse(t) != parse_price_reference(t) for t in messages)
+    before = measure(parse_price_reference, messages)
+    after = measure(extractor.parse, messages)
+
+    print(f"messages:        {len(messages)}")
+    print(f"mismatches:      {mismatches}")
+    print(f"before (loop):   {before:,.0f} msg/s")
+    print(f"after (engine):  {after:,.0f} msg/s")
+    print(f"speedup:         {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
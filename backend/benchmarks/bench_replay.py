@@ -0,0 +1,77 @@
+"""
+Benchmark: end-to-end scraper ingest via the offline replay harness.
+
+Replays a recording (or synthetic traffic) through handle_message as fast as
+possible. Without --database-url, writes go to an in-process session with a
+simulated per-insert latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_replay [--messages 20000] [--recording dump.jsonl]
+                                      [--database-url postgresql+asyncpg://...]
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.replay import (
+    RecordedMessage,
+    ReplayClock,
+    build_scraper,
+    load_recording,
+    replay,
+    run_replay,
+)
+from benchmarks._fakes import NullSession
+from benchmarks._synthetic import generate_messages
+
+
+def synthetic_recording(count: int, spacing: float, channels: int = 4) -> list[RecordedMessage]:
+    """A message every ``spacing`` seconds, round-robin over ``channels`` channels."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        RecordedMessage(
+            channel=f"@channel{i % channels}",
+            id=i + 1,
+            timestamp=start + timedelta(seconds=spacing * i),
+            text=text,
+        )
+        for i, text in enumerate(generate_messages(count))
+    ]
+
+
+async def run(args) -> dict:
+    if args.database_url:
+        return await run_replay(SimpleNamespace(
+            recording=args.recording, speed=0.0, database_url=args.database_url,
+        ))
+
+    if args.recording:
+        messages = load_recording(args.recording)
+    else:
+        messages = synthetic_recording(args.messages, args.spacing)
+    clock = ReplayClock()
+    scraper = build_scraper(clock)
+    await scraper.set_db_session(NullSession(write_delay=args.write_delay))
+    return await replay(scraper, messages, speed=0.0, clock=clock)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument(
+        "--spacing", type=float, default=10.0, help="Recorded seconds between messages",
+    )
+    parser.add_argument("--recording", default=None)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--write-delay", type=float, default=0.005)
+    args = parser.parse_args()
+
+    if args.database_url and not args.recording:
+        parser.error("--database-url requires --recording")
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
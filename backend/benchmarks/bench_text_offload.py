@@ -0,0 +1,83 @@
+"""
+Benchmark: event-loop latency under a message flood, inline vs process-pool text work.
+
+A producer pushes bursts of synthetic messages into an IngestQueue whose
+workers extract prices and score panic keywords. A probe task sleeps in short
+ticks and records how late it wakes up: that lateness is what API requests
+and WebSocket fan-out would see.
+
+Usage (from backend/):
+    python -m benchmarks.bench_text_offload [--messages 100000] [--burst 500]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.metrics import LatencyRecorder
+from app.services.ingest_queue import IngestQueue
+from app.services.text_processor import TextProcessor
+from benchmarks._synthetic import generate_messages
+
+PROBE_INTERVAL = 0.005
+
+
+async def probe(lag: LatencyRecorder, done: asyncio.Event):
+    """Record event-loop lag until ``done`` is set."""
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lag.record(max(time.perf_counter() - started - PROBE_INTERVAL, 0.0))
+
+
+async def run(mode: str, messages: list[str], args) -> dict:
+    processor = TextProcessor(mode=mode, workers=args.workers, batch_size=args.batch_size)
+    await processor.start()
+
+    async def handle_burst(burst: list[str]):
+        await asyncio.gather(*(processor.extract(text) for text in burst))
+        await processor.count_panic(burst)
+
+    queue = IngestQueue(handle_burst, maxsize=10_000, workers=args.workers, policy="block")
+    await queue.start()
+
+    lag, done = LatencyRecorder(maxlen=100_000), asyncio.Event()
+    probe_task = asyncio.create_task(probe(lag, done))
+
+    started = time.perf_counter()
+    for i in range(0, len(messages), args.burst):
+        await queue.put(messages[i:i + args.burst])
+        await asyncio.sleep(args.burst_interval)
+    await queue.stop()
+    elapsed = time.perf_counter() - started
+
+    done.set()
+    await probe_task
+    await processor.stop()
+    return {"msg_per_s": len(messages) / elapsed, **lag.snapshot()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--burst", type=int, default=500)
+    parser.add_argument("--burst-interval", type=float, default=0.005)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--length", type=int, default=1, help="Posts concatenated per message")
+    args = parser.parse_args()
+
+    posts = generate_messages(args.messages * args.length)
+    messages = [
+        "\n".join(posts[i:i + args.length]) for i in range(0, len(posts), args.length)
+    ]
+    print(f"{'mode':<8} {'msg/s':>10} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}")
+    for mode in TextProcessor.MODES:
+        r = asyncio.run(run(mode, messages, args))
+        print(
+            f"{mode:<8} {r['msg_per_s']:>10,.0f} {r['p50_ms']:>7.2f}ms "
+            f"{r['p99_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
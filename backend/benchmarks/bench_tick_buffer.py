@@ -0,0 +1,119 @@
+"""
+Benchmark: RSI and daily aggregation from tick_data queries vs the in-memory tick buffers.
+
+Loads synthetic ticks for one pair (spread over the last 30 days) into a
+scratch SQLite database, then times ``AnalysisService.calculate_rsi`` and
+``ForecastingService._get_tick_data_aggregated`` reading through the
+database (ORM objects, list of dicts, DataFrame) and reading zero-copy views
+of the warm-loaded ring buffer. Reports mean latency per call, peak Python
+heap per call (a traced pass) and the buffer's fixed memory.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tick_buffer [--ticks 50000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import Channel, TickData
+from app.services import tick_buffer
+from app.services.analysis import AnalysisService
+from app.services.forecasting import ForecastingService
+from app.services.tick_buffer import TickBuffers
+
+PAIR = "USD/LYD"
+
+
+async def load(engine, ticks: int):
+    rng = np.random.default_rng(42)
+    prices = 6.85 + np.cumsum(rng.normal(0, 0.005, ticks))
+    start = datetime.now() - timedelta(days=29)
+    step = timedelta(days=29) / ticks
+    async with engine.begin() as conn:
+        for model in (Channel, TickData):
+            await conn.run_sync(model.__table__.create)
+        await conn.execute(Channel.__table__.insert(), {"id": 1, "name": "EwanLibya"})
+        for first in range(0, ticks, 10_000):
+            await conn.execute(TickData.__table__.insert(), [
+                {
+                    "id": i + 1, "timestamp": start + i * step, "currency_pair": PAIR,
+                    "price": float(prices[i]), "price_type": ("buy", "sell")[i % 2],
+                    "source_channel": "EwanLibya", "message_id": i + 1,
+                }
+                for i in range(first, min(first + 10_000, ticks))
+            ])
+
+
+async def measure(call, repeat: int) -> dict:
+    await call()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    seconds = (time.perf_counter() - started) / repeat
+
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": seconds, "peak_heap": peak}
+
+
+async def run_paths(session, repeat: int) -> dict:
+    analysis = AnalysisService()
+    await analysis.set_db_session(session)
+    forecasting = ForecastingService()
+    await forecasting.set_db_session(session)
+    return {
+        "rsi": await measure(lambda: analysis.calculate_rsi(PAIR), repeat),
+        "daily": await measure(lambda: forecasting._get_tick_data_aggregated(PAIR, 30), repeat),
+    }
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        await load(engine, args.ticks)
+        sessions = async_sessionmaker(engine, class_=AsyncSession)
+        # Room for every tick, so the buffer covers the whole 30 days
+        buffers = TickBuffers(capacity=args.ticks + 1000, days=30)
+        tick_buffer._tick_buffers = buffers
+        try:
+            async with sessions() as session:
+                query = await run_paths(session, args.repeat)
+                await buffers.load(session)
+                assert buffers.window(PAIR, datetime.now() - timedelta(days=30)) is not None
+                buffer = await run_paths(session, args.repeat)
+            return {"query": query, "buffer": buffer, "buffer_bytes": buffers.stats()["bytes"]}
+        finally:
+            tick_buffer._tick_buffers = None
+            await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    for reader in ("rsi", "daily"):
+        for path in ("query", "buffer"):
+            result = results[path][reader]
+            print(
+                f"{reader:>5} {path:>6}: {result['seconds'] * 1000:>9.2f} ms/call  "
+                f"{result['peak_heap'] / 1e6:>8.2f} MB peak heap"
+            )
+        speedup = results["query"][reader]["seconds"] / results["buffer"][reader]["seconds"]
+        print(f"{reader:>5} speedup: {speedup:.0f}x")
+    print(f"buffer memory: {results['buffer_bytes'] / 1e6:.1f} MB for {args.ticks + 1000:,} slots")
+
+
+if __name__ == "__main__":
+    main()
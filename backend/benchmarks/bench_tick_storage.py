@@ -0,0 +1,176 @@
+"""
+Benchmark: tick_data table and index size, string columns vs SMALLINT keys.
+
+Loads the same synthetic ticks (generated server-side) into two scratch
+tables in a ``bench_storage`` schema: the old layout with VARCHAR pair, side
+and channel, and the current model's layout with SMALLINT keys. Reports heap
+and index sizes, ticks per 8 kB page and the buffers/time of a one-day range
+scan for one pair. Needs PostgreSQL; the schema is dropped afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.bench_tick_storage [--ticks 10000000] [--channels 20]
+                                            [--database-url postgresql+asyncpg://...]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    text,
+)
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.models.data import CURRENCY_PAIRS, PRICE_TYPES, TickData
+
+SCHEMA = "bench_storage"
+
+
+def layouts() -> MetaData:
+    """The string layout as it was, and tick_data as the model defines it now."""
+    metadata = MetaData(schema=SCHEMA)
+    Table(
+        "ticks_text", metadata,
+        Column("id", Integer, nullable=False),
+        Column("timestamp", DateTime, nullable=False, index=True),
+        Column("currency_pair", String(10), nullable=False, index=True),
+        Column("price", Float, nullable=False),
+        Column("price_type", String(10), nullable=False),
+        Column("source_channel", String(100), nullable=False),
+        Column("message_id", Integer),
+        PrimaryKeyConstraint("id", "timestamp"),
+        Index("ix_ticks_text_timestamp_pair", "timestamp", "currency_pair"),
+    )
+    coded = TickData.__table__.to_metadata(metadata, schema=SCHEMA, name="ticks_coded")
+    for index in coded.indexes:
+        index.name = index.name.replace("tick_data", "ticks_coded")
+    return metadata
+
+
+def fill_sql(table: str, coded: bool, ticks: int, channels: int) -> str:
+    """INSERT ... SELECT of ``ticks`` ticks, one every 3 seconds, mostly USD/LYD."""
+    pair = "(CASE WHEN random() < 0.8 THEN {usd} ELSE {eur} END)"
+    side = "({sides})[1 + floor(random() * 3)::int]"
+    channel = "{channel}"
+    if coded:
+        pair = pair.format(usd=1, eur=2)
+        side = side.format(sides="ARRAY[1, 2, 3]::smallint[]")
+        channel = channel.format(channel=f"1 + (i % {channels})")
+    else:
+        pair = pair.format(usd=f"'{CURRENCY_PAIRS[0]}'", eur=f"'{CURRENCY_PAIRS[1]}'")
+        side = side.format(sides="ARRAY[" + ", ".join(f"'{s}'" for s in PRICE_TYPES) + "]")
+        channel = channel.format(
+            channel=f"'exchange_house_' || lpad((i % {channels})::text, 2, '0')",
+        )
+    return f"""
+        INSERT INTO {SCHEMA}.{table}
+            (id, timestamp, currency_pair, price, price_type, source_channel, message_id)
+        SELECT
+            i,
+            TIMESTAMP '2024-01-01' + i * INTERVAL '3 seconds',
+            {pair},
+            6.5 + random(),
+            {side},
+            {channel},
+            i
+        FROM generate_series(1, {ticks}) AS i
+    """
+
+
+async def measure(conn, table: str, coded: bool) -> dict:
+    """Sizes, density and a one-day range scan for one table."""
+    qualified = f"{SCHEMA}.{table}"
+    sizes = (await conn.execute(text(f"""
+        SELECT
+            pg_relation_size('{qualified}') AS heap,
+            pg_indexes_size('{qualified}') AS indexes,
+            (SELECT relpages FROM pg_class WHERE oid = '{qualified}'::regclass) AS pages,
+            (SELECT reltuples FROM pg_class WHERE oid = '{qualified}'::regclass) AS rows
+    """))).one()
+    per_index = {
+        row.indexrelname: row.size
+        for row in await conn.execute(text(f"""
+            SELECT indexrelname, pg_relation_size(indexrelid) AS size
+            FROM pg_stat_user_indexes
+            WHERE schemaname = '{SCHEMA}' AND relname = '{table}'
+        """))
+    }
+
+    pair = "1" if coded else f"'{CURRENCY_PAIRS[0]}'"
+    plan = (await conn.execute(text(f"""
+        EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+        SELECT timestamp, price FROM {qualified}
+        WHERE timestamp >= TIMESTAMP '2024-01-10' AND timestamp < TIMESTAMP '2024-01-11'
+          AND currency_pair = {pair}
+    """))).scalar()[0]
+
+    return {
+        "heap_mb": round(sizes.heap / 2**20, 1),
+        "indexes_mb": round(sizes.indexes / 2**20, 1),
+        "index_mb": {name: round(size / 2**20, 1) for name, size in per_index.items()},
+        "ticks_per_page": round(sizes.rows / sizes.pages, 1) if sizes.pages else None,
+        "range_scan_ms": round(plan["Execution Time"], 2),
+        "range_scan_buffers": (
+            plan["Plan"].get("Shared Hit Blocks", 0) + plan["Plan"].get("Shared Read Blocks", 0)
+        ),
+    }
+
+
+async def run(args) -> dict:
+    engine = create_async_engine(args.database_url)
+    metadata = layouts()
+    report = {"ticks": args.ticks}
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(metadata.create_all)
+
+        for table, coded in (("ticks_text", False), ("ticks_coded", True)):
+            async with engine.begin() as conn:
+                started = time.perf_counter()
+                await conn.execute(text(fill_sql(table, coded, args.ticks, args.channels)))
+                load_seconds = time.perf_counter() - started
+            # VACUUM cannot run in a transaction
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                await conn.execute(text(f"VACUUM ANALYZE {SCHEMA}.{table}"))
+                report[table] = await measure(conn, table, coded)
+                report[table]["load_seconds"] = round(load_seconds, 1)
+
+        text_layout, coded_layout = report["ticks_text"], report["ticks_coded"]
+        report["saved"] = {
+            "heap": f"{1 - coded_layout['heap_mb'] / text_layout['heap_mb']:.0%}",
+            "indexes": f"{1 - coded_layout['indexes_mb'] / text_layout['indexes_mb']:.0%}",
+        }
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=10_000_000)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--database-url", default=get_settings().DATABASE_URL)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench_storage schema")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
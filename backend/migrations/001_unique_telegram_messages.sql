@@ -0,0 +1,29 @@
+-- Deduplicate telegram_messages and tick_data, then enforce one row per post.
+--
+-- New databases get the unique index from the models (create_all); run this
+-- once on databases created before it existed:
+--   psql "$DATABASE_URL" -f migrations/001_unique_telegram_messages.sql
+
+BEGIN;
+
+-- Keep the first tick per (channel, message, pair, side)
+DELETE FROM tick_data t
+USING tick_data keep
+WHERE t.message_id IS NOT NULL
+  AND t.source_channel = keep.source_channel
+  AND t.message_id = keep.message_id
+  AND t.currency_pair = keep.currency_pair
+  AND t.price_type = keep.price_type
+  AND t.id > keep.id;
+
+-- Keep the first copy of each message
+DELETE FROM telegram_messages m
+USING telegram_messages keep
+WHERE m.channel = keep.channel
+  AND m.message_id = keep.message_id
+  AND m.id > keep.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_telegram_messages_channel_message
+    ON telegram_messages (channel, message_id);
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Make tick_data's primary key (id, timestamp) so it can become a hypertable.
+--
+-- TimescaleDB requires every unique key of a hypertable to include its time
+-- column; with PRIMARY KEY (id) create_hypertable fails and the OHLC
+-- continuous aggregates are never created. New databases get the composite
+-- key from the models; run this once on older ones, then restart the API so
+-- it creates the hypertable (migrating existing rows) and the aggregates:
+--   psql "$DATABASE_URL" -f migrations/002_tick_data_time_primary_key.sql
+
+BEGIN;
+
+ALTER TABLE tick_data DROP CONSTRAINT IF EXISTS tick_data_pkey;
+ALTER TABLE tick_data ADD PRIMARY KEY (id, timestamp);
+
+COMMIT;
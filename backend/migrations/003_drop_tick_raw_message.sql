@@ -0,0 +1,26 @@
+-- Stop storing message text on every tick; it lives once in telegram_messages.
+--
+-- Ticks reference their message by (source_channel, message_id), the unique
+-- key of telegram_messages. Messages missing for some tick are first restored
+-- from its raw_message, then the column is dropped and the table rewritten to
+-- give the space back:
+--   psql "$DATABASE_URL" -f migrations/003_drop_tick_raw_message.sql
+--
+-- VACUUM FULL locks tick_data while it runs; schedule it off-peak. Chunks that
+-- are already compressed keep their old size until they are recompressed.
+
+BEGIN;
+
+INSERT INTO telegram_messages (timestamp, channel, message_id, text, contains_price)
+SELECT DISTINCT ON (source_channel, message_id)
+    timestamp, source_channel, message_id, raw_message, 1
+FROM tick_data
+WHERE message_id IS NOT NULL AND raw_message IS NOT NULL
+ORDER BY source_channel, message_id, timestamp
+ON CONFLICT (channel, message_id) DO NOTHING;
+
+ALTER TABLE tick_data DROP COLUMN IF EXISTS raw_message;
+
+COMMIT;
+
+VACUUM FULL ANALYZE tick_data;
@@ -0,0 +1,90 @@
+-- Store tick_data's pair, side and channel as SMALLINT keys instead of strings.
+--
+-- Pairs and sides use the fixed codes of CURRENCY_PAIRS / PRICE_TYPES in
+-- app/models/data.py (mirrored in currency_pairs / price_types for SQL
+-- readers); channels get ids in the channels lookup table. Run once on
+-- databases created before the change, then restart the API, which recreates
+-- the OHLC continuous aggregates and the compression settings:
+--   psql "$DATABASE_URL" -f migrations/004_tick_data_smallint_keys.sql
+--
+-- The ALTERs rewrite tick_data and hold an exclusive lock while they run.
+-- A pair that is not in CURRENCY_PAIRS fails the NOT NULL check and aborts
+-- the migration; add it to the tuple (and below) first.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS currency_pairs (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(10) NOT NULL UNIQUE
+);
+INSERT INTO currency_pairs (id, name) VALUES
+    (1, 'USD/LYD'), (2, 'EUR/LYD'), (3, 'GBP/LYD'), (4, 'TRY/LYD'), (5, 'EGP/LYD'),
+    (6, 'TND/LYD'), (7, 'AED/LYD'), (8, 'SAR/LYD'), (9, 'CNY/LYD')
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS price_types (
+    id SMALLINT PRIMARY KEY,
+    name VARCHAR(10) NOT NULL UNIQUE
+);
+INSERT INTO price_types (id, name) VALUES (1, 'buy'), (2, 'sell'), (3, 'mid')
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS channels (
+    id SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+INSERT INTO channels (name)
+SELECT DISTINCT source_channel FROM tick_data
+ON CONFLICT DO NOTHING;
+
+-- Continuous aggregates depend on currency_pair and compressed chunks cannot
+-- change column types: drop the aggregates and decompress first
+DROP MATERIALIZED VIEW IF EXISTS tick_ohlc_1m;
+DROP MATERIALIZED VIEW IF EXISTS tick_ohlc_5m;
+DROP MATERIALIZED VIEW IF EXISTS tick_ohlc_1h;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'timescaledb') THEN
+        IF EXISTS (
+            SELECT 1 FROM timescaledb_information.hypertables
+            WHERE hypertable_name = 'tick_data' AND compression_enabled
+        ) THEN
+            PERFORM remove_compression_policy('tick_data', if_exists => TRUE);
+            PERFORM decompress_chunk(c, if_compressed => TRUE) FROM show_chunks('tick_data') c;
+            ALTER TABLE tick_data SET (timescaledb.compress = false);
+        END IF;
+    END IF;
+END $$;
+
+ALTER TABLE tick_data
+    ALTER COLUMN currency_pair TYPE SMALLINT USING CASE currency_pair
+        WHEN 'USD/LYD' THEN 1
+        WHEN 'EUR/LYD' THEN 2
+        WHEN 'GBP/LYD' THEN 3
+        WHEN 'TRY/LYD' THEN 4
+        WHEN 'EGP/LYD' THEN 5
+        WHEN 'TND/LYD' THEN 6
+        WHEN 'AED/LYD' THEN 7
+        WHEN 'SAR/LYD' THEN 8
+        WHEN 'CNY/LYD' THEN 9
+    END,
+    ALTER COLUMN price_type TYPE SMALLINT USING CASE price_type
+        WHEN 'buy' THEN 1
+        WHEN 'sell' THEN 2
+        WHEN 'mid' THEN 3
+    END,
+    ADD COLUMN channel_id SMALLINT;
+
+UPDATE tick_data t
+SET channel_id = c.id
+FROM channels c
+WHERE c.name = t.source_channel;
+
+ALTER TABLE tick_data DROP COLUMN source_channel;
+ALTER TABLE tick_data RENAME COLUMN channel_id TO source_channel;
+ALTER TABLE tick_data ALTER COLUMN source_channel SET NOT NULL;
+
+COMMIT;
+
+VACUUM FULL ANALYZE tick_data;
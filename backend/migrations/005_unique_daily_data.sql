@@ -0,0 +1,26 @@
+-- Enforce one daily_data row per (currency_pair, date) for the bulk upsert.
+--
+-- FulusSyncService.save_daily_data now upserts with
+-- ON CONFLICT (currency_pair, date), which needs this unique index. The
+-- primary key becomes (id, date) as well, since TimescaleDB requires every
+-- unique key of a hypertable to include its time column. New databases get
+-- both from the models; run this once on older ones, then restart the API so
+-- it creates the daily_data hypertable:
+--   psql "$DATABASE_URL" -f migrations/005_unique_daily_data.sql
+
+BEGIN;
+
+-- Keep the most recently synced row per pair and day, as the upsert would
+DELETE FROM daily_data d
+USING daily_data keep
+WHERE d.currency_pair = keep.currency_pair
+  AND d.date = keep.date
+  AND d.id < keep.id;
+
+ALTER TABLE daily_data DROP CONSTRAINT IF EXISTS daily_data_pkey;
+ALTER TABLE daily_data ADD PRIMARY KEY (id, date);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_daily_data_pair_date
+    ON daily_data (currency_pair, date);
+
+COMMIT;
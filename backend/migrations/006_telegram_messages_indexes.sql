@@ -0,0 +1,27 @@
+-- Add a BRIN index on telegram_messages' timestamp and a partial index for
+-- price-bearing messages.
+--
+-- Messages are inserted in time order, so a BRIN index on timestamp answers
+-- unordered range scans (retention purges) from a few pages. It cannot
+-- return rows in order, so the btree ix_telegram_messages_timestamp stays
+-- for the newest-first reads (/data/messages, the panic window, the AI
+-- context). The partial index serves the newest price-bearing messages
+-- (/data/messages?price_only=true) in index order. The unique
+-- (channel, message_id) index comes from migration 001.
+--
+-- New databases get these from the models; run this once on older ones. It
+-- builds concurrently, so it must run outside a transaction (no BEGIN):
+--   psql "$DATABASE_URL" -f migrations/006_telegram_messages_indexes.sql
+-- An earlier version of this file dropped the btree; rerunning it restores it.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_messages_timestamp
+    ON telegram_messages (timestamp);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_messages_timestamp_brin
+    ON telegram_messages USING brin (timestamp);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_telegram_messages_price_timestamp
+    ON telegram_messages (timestamp)
+    WHERE contains_price = 1;
+
+ANALYZE telegram_messages;
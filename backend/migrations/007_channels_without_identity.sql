@@ -0,0 +1,10 @@
+-- Stop assigning channels ids from an identity sequence.
+--
+-- Every INSERT ... ON CONFLICT DO NOTHING of a known channel name consumed a
+-- sequence value, so the SMALLINT id ran out and ingest stopped. Ids are now
+-- max(id) + 1, assigned by the insert (app.models.data.insert_channels);
+-- existing ids stay as they are. Run once on databases created before the
+-- change:
+--   psql "$DATABASE_URL" -f migrations/007_channels_without_identity.sql
+
+ALTER TABLE channels ALTER COLUMN id DROP IDENTITY IF EXISTS;
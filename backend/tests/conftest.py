@@ -3,6 +3,8 @@ import os
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
+from app.core import cache
+
 
 @pytest.fixture
 def fulus_api_key() -> str | None:
@@ -16,12 +18,28 @@ def fulus_api_url() -> str:
     return os.environ.get("FULUS_API_URL", "https://api.fulus.ly/v1")
 
 
+def _echo_returning(statement, params=None):
+    """Result for ``execute``: INSERT ... RETURNING yields every row's key (no conflicts)."""
+    result = MagicMock()
+    columns = [column.name for column in getattr(statement, "_returning", ())]
+    result.all.return_value = [
+        tuple(row[name] for name in columns) for row in params or []
+    ] if columns else []
+    return result
+
+
 @pytest.fixture
 def mock_db_session():
     """Return a mock async database session."""
     session = AsyncMock()
-    session.execute = AsyncMock()
+    session.execute = AsyncMock(side_effect=_echo_returning)
     session.add = MagicMock()
     session.commit = AsyncMock()
     session.rollback = AsyncMock()
     return session
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    """Give every test an empty process-wide result cache."""
+    monkeypatch.setattr(cache, "_cache", cache.Cache())
@@ -0,0 +1,141 @@
+"""Test doubles for the Telegram client and Redis."""
+import asyncio
+import fnmatch
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional
+
+
+class FakeTelegramClient:
+    """
+    In-memory stand-in for ``telethon.TelegramClient``.
+
+    ``history`` maps a channel to its messages as (id, aware UTC date, text).
+    ``page_delay`` simulates the network round-trip of each history page.
+    ``emit`` delivers a live message to the handlers subscribed to its channel.
+    ``joined`` holds the channels the account joined through requests.
+    """
+
+    PAGE_SIZE = 100
+
+    def __init__(self, history: Optional[dict] = None, page_delay: float = 0.0):
+        self.history = history or {}
+        self.page_delay = page_delay
+        self.requests: list[tuple] = []
+        self.handlers: list[tuple] = []
+        self.connected = False
+        self.refuse_connect = False
+        self.joined: set[str] = set()
+
+    async def __call__(self, request):
+        if type(request).__name__ == "JoinChannelRequest":
+            self.joined.add(request.channel)
+        elif type(request).__name__ == "LeaveChannelRequest":
+            self.joined.discard(request.channel)
+
+    async def start(self, phone=None):
+        await self.connect()
+
+    async def connect(self):
+        if self.refuse_connect:
+            raise ConnectionError("connection refused")
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def add_event_handler(self, callback, event):
+        self.handlers.append((callback, set(event.chats)))
+
+    def remove_event_handler(self, callback):
+        self.handlers = [(cb, chats) for cb, chats in self.handlers if cb != callback]
+
+    def subscribed(self) -> set[str]:
+        return set().union(*(chats for _, chats in self.handlers))
+
+    async def emit(self, channel: str, message_id: int, text: str) -> bool:
+        """Deliver a new message; returns False if nobody listens to the channel."""
+        event = SimpleNamespace(
+            message=SimpleNamespace(id=message_id, text=text),
+            chat=SimpleNamespace(username=channel.lstrip("@")),
+            chat_id=message_id,
+        )
+        delivered = False
+        for callback, chats in list(self.handlers):
+            if self.connected and channel in chats:
+                await callback(event)
+                delivered = True
+        return delivered
+
+    async def get_entity(self, channel: str):
+        return SimpleNamespace(username=channel.lstrip("@"), id=abs(hash(channel)))
+
+    async def iter_messages(
+        self,
+        entity,
+        offset_date: Optional[datetime] = None,
+        reverse: bool = False,
+        min_id: int = 0,
+    ):
+        self.requests.append((entity.username, offset_date, reverse, min_id))
+        messages = sorted(self.history.get(f"@{entity.username}", []), reverse=not reverse)
+        for index, (message_id, date, text) in enumerate(messages):
+            if index % self.PAGE_SIZE == 0 and self.page_delay:
+                await asyncio.sleep(self.page_delay)
+            if message_id <= min_id:
+                continue
+            if offset_date and reverse and date < offset_date:
+                continue
+            yield SimpleNamespace(id=message_id, date=date, text=text)
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the ``redis.asyncio.Redis`` calls the cache makes.
+
+    One instance plays the shared server: give it to several caches to model
+    several workers. ``fail`` makes every call raise, like a lost connection.
+    """
+
+    def __init__(self):
+        self.data: dict[str, tuple[Optional[float], bytes]] = {}
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis unavailable")
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self._check()
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, px: Optional[int] = None, nx: bool = False):
+        self._check()
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (time.monotonic() + px / 1000 if px else None, value)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self._check()
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match: str = "*"):
+        self._check()
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match) and self._live(key) is not None:
+                yield key.encode()
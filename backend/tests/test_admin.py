@@ -0,0 +1,42 @@
+"""Tests for the admin API key check."""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import admin
+
+KEY = "s3cret"
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/api/v1/admin")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestAdminKey:
+    @pytest.mark.asyncio
+    async def test_disabled_without_a_configured_key(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_KEY", None)
+        response = await client.delete("/api/v1/admin/cache", headers={"X-Admin-Key": ""})
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [{}, {"X-Admin-Key": "wrong"}])
+    async def test_missing_or_wrong_key_rejected(self, client, monkeypatch, headers):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_KEY", KEY)
+        for method, path in [
+            ("GET", "/pool"), ("GET", "/storage"), ("GET", "/cache"), ("DELETE", "/cache"),
+        ]:
+            response = await client.request(method, f"/api/v1/admin{path}", headers=headers)
+            assert response.status_code == 401, path
+
+    @pytest.mark.asyncio
+    async def test_configured_key_admitted(self, client, monkeypatch):
+        monkeypatch.setattr(admin.settings, "ADMIN_API_KEY", KEY)
+        response = await client.delete("/api/v1/admin/cache", headers={"X-Admin-Key": KEY})
+        assert response.status_code == 200
+        assert response.json() == {"invalidated": 0}
@@ -0,0 +1,264 @@
+"""Tests for the result cache and its use by the analysis and forecasting services."""
+import asyncio
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import Cache, MemoryBackend, RedisBackend
+from app.services.analysis import AnalysisService
+from app.services.forecasting import ForecastingService
+from app.services.fulus_sync import FulusSyncService
+from tests.fakes import FakeRedis
+
+WORKERS = 4
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Computation:
+    """Counts calls and takes a while, so concurrent callers overlap."""
+
+    def __init__(self, value=42, delay=0.05):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+@pytest.fixture
+def redis() -> FakeRedis:
+    return FakeRedis()
+
+
+def workers(redis: FakeRedis, count: int = WORKERS, **kwargs) -> list[Cache]:
+    """One Cache per simulated uvicorn worker, all on the same Redis."""
+    return [Cache(RedisBackend(redis), poll_interval=0.01, **kwargs) for _ in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class TestCache:
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = Cache(MemoryBackend(clock))
+        await cache.set("panic_index", 35.2, ttl=30)
+
+        clock.now = 29
+        assert await cache.get("panic_index") == 35.2
+        clock.now = 31
+        assert await cache.get("panic_index") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_by_key_and_prefix(self, redis):
+        cache = Cache(RedisBackend(redis))
+        for key in ("forecast:USD/LYD:24", "forecast:USD/LYD:48", "forecast:EUR/LYD:24",
+                    "analysis:USD/LYD"):
+            await cache.set(key, {"key": key}, ttl=60)
+
+        assert await cache.invalidate_prefix("forecast:USD/LYD:") == 2
+        assert await cache.invalidate("analysis:USD/LYD") == 1
+        assert await cache.get("forecast:USD/LYD:24") is None
+        assert await cache.get("forecast:EUR/LYD:24") == {"key": "forecast:EUR/LYD:24"}
+
+    @pytest.mark.asyncio
+    async def test_hit_after_compute(self):
+        cache = Cache()
+        compute = Computation()
+
+        assert await cache.get_or_compute("k", compute, ttl=60) == 42
+        assert await cache.get_or_compute("k", compute, ttl=60) == 42
+        assert compute.calls == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_cache_rejects_value(self):
+        cache = Cache()
+        compute = Computation(value={"error": "Insufficient data"})
+
+        for _ in range(2):
+            await cache.get_or_compute("k", compute, ttl=60,
+                                       should_cache=lambda value: "error" not in value)
+        assert compute.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_in_one_worker_share_a_computation(self):
+        cache = Cache()
+        compute = Computation()
+
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute, 60) for _ in range(10)))
+
+        assert results == [42] * 10
+        assert compute.calls == 1
+        assert cache.stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter_and_are_not_cached(self):
+        cache = Cache()
+        calls = 0
+
+        async def failing():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("model failed")
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("k", failing, 60) for _ in range(3)), return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert calls == 1
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_first_caller_does_not_fail_waiters(self):
+        cache = Cache()
+        compute = Computation(value=7, delay=0.05)
+        first = asyncio.create_task(cache.get_or_compute("k", compute, 60))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(cache.get_or_compute("k", compute, 60))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        assert await second == 7
+        assert first.cancelled()
+        assert compute.calls == 1
+        # The computation finished and was cached for later callers
+        assert await cache.get("k") == 7
+        assert cache.stats()["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fails_open_when_backend_is_down(self, redis):
+        redis.fail = True
+        cache = Cache(RedisBackend(redis))
+        compute = Computation()
+
+        assert await cache.get_or_compute("k", compute, ttl=60) == 42
+        assert await cache.invalidate_prefix("") == 0
+        assert cache.stats()["errors"] > 0
+
+
+class TestSharedAcrossWorkers:
+    @pytest.mark.asyncio
+    async def test_workers_share_one_computation(self, redis):
+        caches = workers(redis)
+        compute = Computation(delay=0.1)
+
+        results = await asyncio.gather(*(
+            cache.get_or_compute("analysis:USD/LYD", compute, 60)
+            for cache in caches for _ in range(3)
+        ))
+
+        assert results == [42] * (WORKERS * 3)
+        assert compute.calls == 1
+        assert sum(cache.stats()["computes"] for cache in caches) == 1
+        # The lock was released
+        assert list(redis.data) == ["terminal:analysis:USD/LYD"]
+
+    @pytest.mark.asyncio
+    async def test_later_workers_hit_the_shared_entry(self, redis):
+        first, second = workers(redis, 2)
+        compute = Computation()
+
+        await first.get_or_compute("k", compute, 60)
+        await second.get_or_compute("k", compute, 60)
+
+        assert compute.calls == 1
+        assert second.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waiters_take_over_from_a_dead_lock_holder(self, redis):
+        (cache,) = workers(redis, 1, lock_ttl=0.1)
+        # Another worker took the lock and died
+        await redis.set("terminal:lock:k", b"other", px=100, nx=True)
+        compute = Computation(delay=0)
+
+        assert await cache.get_or_compute("k", compute, 60) == 42
+        assert compute.calls == 1
+
+
+# ---------------------------------------------------------------------------
+# Services
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def shared(monkeypatch, redis) -> Cache:
+    cache = Cache(RedisBackend(redis), poll_interval=0.01)
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    return cache
+
+
+class TestServiceCaching:
+    @pytest.mark.asyncio
+    async def test_panic_index_cached(self, shared, mock_db_session, monkeypatch):
+        compute = Computation(value=35.2)
+        monkeypatch.setattr(AnalysisService, "_compute_market_panic_index",
+                            lambda self: compute())
+        services = [AnalysisService() for _ in range(3)]
+        for service in services:
+            await service.set_db_session(mock_db_session)
+
+        results = await asyncio.gather(*(s.calculate_market_panic_index() for s in services))
+
+        assert results == [35.2] * 3
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_analysis_cached_per_pair(self, shared, monkeypatch):
+        calls = []
+
+        async def analyze(self, currency_pair):
+            calls.append(currency_pair)
+            return {"currency_pair": currency_pair, "current_price": 6.85}
+
+        monkeypatch.setattr(AnalysisService, "_analyze", analyze)
+        service = AnalysisService()
+
+        for pair in ("USD/LYD", "USD/LYD", "EUR/LYD"):
+            assert (await service.analyze(pair))["currency_pair"] == pair
+        assert calls == ["USD/LYD", "EUR/LYD"]
+
+    @pytest.mark.asyncio
+    async def test_failed_forecasts_are_not_cached(self, shared, monkeypatch):
+        results = iter([{"error": "Insufficient data"}, {"forecast": [1.0]}, {"forecast": [2.0]}])
+
+        async def forecast(self, currency_pair, hours):
+            return next(results)
+
+        monkeypatch.setattr(ForecastingService, "_forecast_currency", forecast)
+        service = ForecastingService()
+
+        assert "error" in await service.forecast_currency("USD/LYD", 24)
+        assert await service.forecast_currency("USD/LYD", 24) == {"forecast": [1.0]}
+        assert await service.forecast_currency("USD/LYD", 24) == {"forecast": [1.0]}
+
+    @pytest.mark.asyncio
+    async def test_fulus_sync_invalidates_the_pair(self, shared, mock_db_session):
+        for key in ("forecast:USD/LYD:24", "forecast:USD/LYD:48", "analysis:USD/LYD",
+                    "forecast:EUR/LYD:24", "panic_index"):
+            await shared.set(key, 1, ttl=60)
+        service = FulusSyncService()
+        await service.set_db_session(mock_db_session)
+
+        await service.save_daily_data("USD/LYD", [{
+            "date": "2024-02-07",
+            "open": 6.8, "high": 6.9, "low": 6.7, "close": 6.85, "volume": 0,
+        }])
+
+        assert await shared.get("forecast:USD/LYD:24") is None
+        assert await shared.get("forecast:USD/LYD:48") is None
+        assert await shared.get("analysis:USD/LYD") is None
+        assert await shared.get("forecast:EUR/LYD:24") == 1
+        assert await shared.get("panic_index") == 1
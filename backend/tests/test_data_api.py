@@ -0,0 +1,181 @@
+"""Tests for the data API endpoints."""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.data import decode_cursor, encode_cursor, get_tick_data
+from app.api.v1.routes import api_router
+from app.core import database
+from app.core.database import ReadSessionLocal
+from app.models.data import Channel, TelegramMessage, TickData
+
+
+async def fetch_ticks(db, **params):
+    """Call the /tick handler directly with its query defaults."""
+    response = Response()
+    params = {
+        "currency_pair": "USD/LYD", "hours": 24, "start": None, "end": None,
+        "cursor": None, "limit": 1000, "include_raw": False, **params,
+    }
+    ticks = await get_tick_data(response=response, db=db, **params)
+    return ticks, response.headers.get("X-Next-Cursor")
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'data.db'}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(engine):
+    async with engine.begin() as conn:
+        for model in (Channel, TickData, TelegramMessage):
+            await conn.run_sync(model.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        now = datetime.now()
+        session.add(Channel(id=1, name="EwanLibya"))
+        await session.flush()
+        session.add_all([
+            TelegramMessage(
+                id=1, timestamp=now, channel="EwanLibya", message_id=10,
+                text="USD/LYD: 6.85 / 6.90", contains_price=1,
+            ),
+            TickData(
+                id=1, timestamp=now, currency_pair="USD/LYD", price=6.85,
+                price_type="buy", source_channel="EwanLibya", message_id=10,
+            ),
+            TickData(
+                id=2, timestamp=now, currency_pair="USD/LYD", price=6.90,
+                price_type="sell", source_channel="EwanLibya", message_id=10,
+            ),
+            # Its message was purged by retention
+            TickData(
+                id=3, timestamp=now - timedelta(hours=1), currency_pair="USD/LYD",
+                price=6.80, price_type="buy", source_channel="EwanLibya", message_id=9,
+            ),
+        ])
+        await session.commit()
+        yield session
+
+
+class TestTickEndpoint:
+    @pytest.mark.asyncio
+    async def test_raw_text_not_joined_by_default(self, db):
+        ticks, _ = await fetch_ticks(db)
+        assert len(ticks) == 3
+        assert ticks[0].raw_message is None
+        assert ticks[0].source_channel == "EwanLibya"
+
+    @pytest.mark.asyncio
+    async def test_include_raw_joins_message_text(self, db):
+        ticks, _ = await fetch_ticks(db, include_raw=True)
+        by_id = {tick.id: tick for tick in ticks}
+        assert by_id[1].raw_message == "USD/LYD: 6.85 / 6.90"
+        assert by_id[2].raw_message == "USD/LYD: 6.85 / 6.90"
+        assert by_id[3].raw_message is None
+        assert by_id[1].price_type == "buy"
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_every_tick_once(self, db):
+        first, cursor = await fetch_ticks(db, limit=2)
+        assert [tick.id for tick in first] == [2, 1]
+        assert cursor is not None
+
+        second, last_cursor = await fetch_ticks(db, limit=2, cursor=cursor)
+        assert [tick.id for tick in second] == [3]
+        assert last_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_pages_with_raw_text(self, db):
+        _, cursor = await fetch_ticks(db, limit=1, include_raw=True)
+        ticks, _ = await fetch_ticks(db, limit=5, include_raw=True, cursor=cursor)
+        assert [tick.id for tick in ticks] == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_start_and_end_bound_the_range(self, db):
+        now = datetime.now()
+        ticks, _ = await fetch_ticks(
+            db, start=now - timedelta(hours=2), end=now - timedelta(minutes=30),
+        )
+        assert [tick.id for tick in ticks] == [3]
+
+
+class TestCursor:
+    def test_round_trip(self):
+        timestamp = datetime(2024, 2, 8, 12, 30, 15, 250000)
+        assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+
+    @pytest.mark.parametrize(
+        "cursor", ["not-base64!", "aGVsbG8=", encode_cursor(datetime.now(), 1)[:-4]],
+    )
+    def test_rejects_garbage(self, cursor):
+        with pytest.raises(HTTPException) as error:
+            decode_cursor(cursor)
+        assert error.value.status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# /tick/export
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def client(engine, db):
+    ReadSessionLocal.configure(bind=engine)
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    ReadSessionLocal.configure(bind=database.read_engine)
+
+
+class TestTickExport:
+    @pytest.mark.asyncio
+    async def test_ndjson_streams_oldest_first(self, client):
+        response = await client.get("/api/v1/data/tick/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["id"] for record in records] == [3, 1, 2]
+        assert records[0]["currency_pair"] == "USD/LYD"
+        assert records[0]["source_channel"] == "EwanLibya"
+        assert records[1]["price_type"] == "buy"
+
+    @pytest.mark.asyncio
+    async def test_csv_has_a_header_row(self, client):
+        response = await client.get("/api/v1/data/tick/export", params={"format": "csv"})
+        assert response.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == ["3", "1", "2"]
+        assert rows[2]["price"] == "6.9"
+
+    @pytest.mark.asyncio
+    async def test_parquet_download(self, client):
+        pq = pytest.importorskip("pyarrow.parquet")
+        response = await client.get("/api/v1/data/tick/export", params={"format": "parquet"})
+        assert response.headers["content-type"] == "application/vnd.apache.parquet"
+        assert 'filename="tick_USDLYD.parquet"' in response.headers["content-disposition"]
+
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.column("id").to_pylist() == [3, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_columnar_formats_need_pyarrow(self, client, monkeypatch):
+        monkeypatch.setattr("app.api.v1.data.arrow_available", lambda: False)
+        response = await client.get("/api/v1/data/tick/export", params={"format": "arrow"})
+        assert response.status_code == 501
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_a_bad_request(self, client):
+        response = await client.get("/api/v1/data/tick", params={"cursor": "garbage"})
+        assert response.status_code == 400
@@ -0,0 +1,86 @@
+"""Tests for the instrumented connection pool."""
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.admin import get_pool
+from app.core.database import InstrumentedPool, engine_options, pool_stats
+
+
+@pytest.fixture
+async def small_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+class TestEngineOptions:
+    def test_postgres_gets_pool_and_statement_cache(self):
+        options = engine_options("postgresql+asyncpg://u:p@localhost/db")
+        assert options["poolclass"] is InstrumentedPool
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"]["statement_cache_size"] == 100
+
+    def test_sqlite_keeps_defaults(self):
+        assert engine_options("sqlite+aiosqlite:///:memory:") == {}
+
+
+class TestPoolStats:
+    @pytest.mark.asyncio
+    async def test_reports_checkouts_and_overflow(self, small_engine):
+        async with small_engine.connect() as first, small_engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            stats = pool_stats(small_engine)
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+            assert stats["capacity"] == 2
+
+        stats = pool_stats(small_engine)
+        assert stats["checked_out"] == 0
+        assert stats["checkout_wait"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_exhaustion_is_counted(self, small_engine):
+        async with small_engine.connect(), small_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                async with small_engine.connect():
+                    pass
+
+        stats = pool_stats(small_engine)
+        assert stats["timeouts"] == 1
+        assert stats["checkout_wait"]["max_ms"] >= 100
+
+    @pytest.mark.asyncio
+    async def test_waiting_checkout_is_timed(self, small_engine):
+        async def hold(seconds: float):
+            async with small_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await asyncio.sleep(seconds)
+
+        async with small_engine.connect():
+            holder = asyncio.create_task(hold(0.05))
+            await asyncio.sleep(0.01)
+            # Pool and overflow are both in use until the holder finishes
+            async def late():
+                async with small_engine.connect():
+                    pass
+            await asyncio.gather(holder, late())
+
+        stats = pool_stats(small_engine)
+        assert stats["timeouts"] == 0
+        assert stats["checkout_wait"]["max_ms"] >= 25
+
+    @pytest.mark.asyncio
+    async def test_admin_endpoint(self):
+        stats = await get_pool()
+        assert stats["pool"] == "InstrumentedPool"
+        assert {"checked_out", "overflow", "checkout_wait", "timeouts"} <= set(stats)
@@ -0,0 +1,281 @@
+"""Tests for duplicate suppression: the in-memory front and the ON CONFLICT backstop."""
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import Channel, TelegramMessage, TickData, insert_channels
+from app.services.dedup import MessageDeduplicator
+from app.services.telegram_scraper import TelegramPriceScraper
+from app.services.write_behind import WriteBehindBuffer
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def make_event(channel: str, message_id: int, text: str):
+    return SimpleNamespace(
+        message=SimpleNamespace(id=message_id, text=text),
+        chat=SimpleNamespace(username=channel),
+        chat_id=message_id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# MessageDeduplicator
+# ---------------------------------------------------------------------------
+
+class TestMessageDeduplicator:
+    def test_same_message_id_is_duplicate(self):
+        dedup = MessageDeduplicator(max_ids=10, max_hashes=10, window_seconds=60)
+        assert dedup.check("@A", 1, "USD/LYD: 6.85") is None
+        assert dedup.check("@A", 1, "USD/LYD: 6.85 (edited)") == MessageDeduplicator.BY_ID
+        # Same id in another channel is a different message
+        assert dedup.check("@B", 1, "something else") is None
+
+    def test_forward_with_cosmetic_changes_is_duplicate(self):
+        dedup = MessageDeduplicator(max_ids=10, max_hashes=10, window_seconds=60)
+        assert dedup.check("@A", 1, "سعر الدولار  6.85") is None
+        assert dedup.check("@B", 7, "‏سعـر الدولار\n6.85 ") == MessageDeduplicator.BY_TEXT
+        assert dedup.stats()["suppressed_by_text"] == 1
+
+    def test_text_window_expires(self):
+        clock = FakeClock()
+        dedup = MessageDeduplicator(max_ids=10, max_hashes=10, window_seconds=60, clock=clock)
+        dedup.check("@A", 1, "USD/LYD: 6.85")
+        clock.advance(61)
+        # Same quote an hour later is a new observation
+        assert dedup.check("@A", 2, "USD/LYD: 6.85") is None
+
+    def test_empty_text_is_only_checked_by_id(self):
+        dedup = MessageDeduplicator(max_ids=10, max_hashes=10, window_seconds=60)
+        assert dedup.check("@A", 1, "") is None
+        assert dedup.check("@A", 2, "  ") is None
+
+    def test_memory_is_bounded(self):
+        dedup = MessageDeduplicator(max_ids=3, max_hashes=2, window_seconds=60)
+        for i in range(10):
+            dedup.check("@A", i, f"message {i}")
+        stats = dedup.stats()
+        assert stats["tracked_ids"] == 3
+        assert stats["tracked_hashes"] == 2
+        # The oldest id was evicted, so only the database index would catch it
+        assert dedup.check("@A", 0, "another text") is None
+
+
+# ---------------------------------------------------------------------------
+# WriteBehindBuffer conflict handling
+# ---------------------------------------------------------------------------
+
+class TestWriterConflicts:
+    @pytest.fixture
+    def buffer(self) -> WriteBehindBuffer:
+        return WriteBehindBuffer(
+            max_batch_size=100,
+            flush_interval=60,
+            conflict_keys={TelegramMessage: ("channel", "message_id")},
+            dependents={TickData: (TelegramMessage, ("source_channel", "message_id"))},
+        )
+
+    @pytest.mark.asyncio
+    async def test_ticks_of_existing_messages_are_skipped(self, buffer, mock_db_session):
+        # The database already has message 2
+        result = MagicMock()
+        result.all.return_value = [("@A", 1), ("@A", 3)]
+        mock_db_session.execute.side_effect = None
+        mock_db_session.execute.return_value = result
+        await buffer.set_db_session(mock_db_session)
+
+        for message_id in (1, 2, 3):
+            await buffer.put_many([
+                (TelegramMessage, {"channel": "@A", "message_id": message_id}),
+                (TickData, {"source_channel": "@A", "message_id": message_id, "price": 6.8}),
+            ])
+        await buffer.flush()
+
+        message_call, tick_call = mock_db_session.execute.await_args_list
+        assert "ON CONFLICT" in str(message_call.args[0].compile(dialect=postgresql.dialect()))
+        assert [row["message_id"] for row in tick_call.args[1]] == [1, 3]
+        assert buffer.stats()["rows_written"] == 4
+        assert buffer.stats()["rows_conflicted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_conflict_tables_are_inserted_first(self, buffer, mock_db_session):
+        await buffer.set_db_session(mock_db_session)
+        await buffer.put(TickData, {"source_channel": "@A", "message_id": 1})
+        await buffer.put(TelegramMessage, {"channel": "@A", "message_id": 1})
+        await buffer.flush()
+
+        tables = [call.args[0].table.name for call in mock_db_session.execute.await_args_list]
+        assert tables == ["telegram_messages", "tick_data"]
+
+    @pytest.mark.asyncio
+    async def test_message_repeated_in_a_batch_keeps_one_copy_of_its_ticks(
+        self, buffer, mock_db_session,
+    ):
+        await buffer.set_db_session(mock_db_session)
+        for price in (6.80, 6.85):
+            await buffer.put_many([
+                (TelegramMessage, {"channel": "@A", "message_id": 1}),
+                (TickData, {"source_channel": "@A", "message_id": 1, "price": price}),
+                (TickData, {"source_channel": "@A", "message_id": 1, "price": price + 1}),
+            ])
+        await buffer.flush()
+
+        message_call, tick_call = mock_db_session.execute.await_args_list
+        assert len(message_call.args[1]) == 1
+        assert [row["price"] for row in tick_call.args[1]] == [6.80, 7.80]
+        assert buffer.stats()["rows_conflicted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_message_repeated_after_a_failed_flush(self, buffer, mock_db_session):
+        await buffer.set_db_session(mock_db_session)
+        first = [
+            (TelegramMessage, {"channel": "@A", "message_id": 1}),
+            (TickData, {"source_channel": "@A", "message_id": 1, "price": 6.80}),
+        ]
+        await buffer.put_many(first)
+        mock_db_session.commit.side_effect = RuntimeError("db down")
+        await buffer.flush()
+        mock_db_session.commit.side_effect = None
+        mock_db_session.execute.reset_mock()
+
+        await buffer.put_many([
+            (TelegramMessage, {"channel": "@A", "message_id": 1}),
+            (TickData, {"source_channel": "@A", "message_id": 1, "price": 6.85}),
+        ])
+        assert buffer.depth == 2
+        await buffer.put_many(first[:1] + [
+            (TickData, {"source_channel": "@A", "message_id": 1, "price": 6.90}),
+        ])
+        await buffer.flush()
+
+        message_call, tick_call = mock_db_session.execute.await_args_list
+        assert len(message_call.args[1]) == 1
+        assert [row["price"] for row in tick_call.args[1]] == [6.80]
+
+    @pytest.mark.asyncio
+    async def test_repeated_keys_in_a_batch_are_inserted_once(self, mock_db_session):
+        buffer = WriteBehindBuffer(
+            max_batch_size=100, flush_interval=60, conflict_keys={Channel: ("name",)},
+        )
+        await buffer.set_db_session(mock_db_session)
+        for _ in range(3):
+            await buffer.put(Channel, {"name": "@A"})
+        await buffer.put(Channel, {"name": "@B"})
+        await buffer.flush()
+
+        rows = mock_db_session.execute.await_args.args[1]
+        assert [row["name"] for row in rows] == ["@A", "@B"]
+        assert buffer.stats()["rows_written"] == 2
+        assert buffer.stats()["rows_conflicted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_remembered_keys_skip_later_flushes(self, mock_db_session):
+        buffer = WriteBehindBuffer(
+            max_batch_size=100, flush_interval=60, conflict_keys={Channel: ("name",)},
+            remembered=(Channel,), inserts={Channel: insert_channels},
+        )
+        await buffer.set_db_session(mock_db_session)
+        for _ in range(3):
+            await buffer.put(Channel, {"name": "@A"})
+            await buffer.flush()
+        await buffer.put(Channel, {"name": "@B"})
+        await buffer.flush()
+
+        calls = mock_db_session.execute.await_args_list
+        assert [[row["name"] for row in call.args[1]] for call in calls] == [["@A"], ["@B"]]
+        sql = str(calls[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "max(channels.id)" in sql and "RETURNING" not in sql
+        assert buffer.stats()["rows_conflicted"] == 2
+
+
+# ---------------------------------------------------------------------------
+# TelegramPriceScraper
+# ---------------------------------------------------------------------------
+
+class TestScraperDedup:
+    @pytest.mark.asyncio
+    async def test_duplicates_are_dropped_before_processing(self, mock_db_session):
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        await scraper.set_db_session(mock_db_session)
+
+        await scraper.handle_message(make_event("A", 1, "USD/LYD: 6.85"))
+        await scraper.handle_message(make_event("A", 1, "USD/LYD: 6.85"))
+        await scraper.handle_message(make_event("B", 9, "USD/LYD: 6.85"))
+
+        stats = scraper.get_stats()
+        assert stats["dedup"]["suppressed_total"] == 2
+        assert stats["rate_limiter"]["passed"] == 1
+        # One message, its tick and its channel
+        assert scraper.writer.depth == 3
+        await scraper.stop()
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL (requires TEST_DATABASE_URL)
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def pg_session():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set – skipping PostgreSQL ingest tests")
+    schema = "test_dedup"
+    setup = create_async_engine(TEST_DATABASE_URL)
+    async with setup.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    await setup.dispose()
+
+    engine = create_async_engine(
+        TEST_DATABASE_URL, connect_args={"server_settings": {"search_path": schema}},
+    )
+    async with engine.begin() as conn:
+        for model in (Channel, TelegramMessage, TickData):
+            await conn.run_sync(model.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    await engine.dispose()
+
+
+class TestChannelIds:
+    @pytest.mark.asyncio
+    async def test_flushes_of_a_known_channel_take_no_ids(self, pg_session):
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        await scraper.set_db_session(pg_session)
+        for message_id in range(1, 51):
+            await scraper.process_message("@A", message_id, "USD/LYD: 6.85", [
+                {"currency_pair": "USD/LYD", "price": 6.85, "price_type": "mid"},
+            ], False)
+            await scraper.writer.flush()
+        # A restarted process preloads the channels it would otherwise re-send
+        restarted = TelegramPriceScraper(api_id="0", api_hash="0")
+        await restarted.set_db_session(pg_session)
+        assert await restarted.writer.preload(Channel) == 1
+        await restarted.process_message("@B", 1, "USD/LYD: 6.90", [
+            {"currency_pair": "USD/LYD", "price": 6.90, "price_type": "mid"},
+        ], False)
+        await restarted.writer.flush()
+
+        channels = (await pg_session.execute(text("SELECT id, name FROM channels"))).all()
+        assert sorted(channels) == [(1, "@A"), (2, "@B")]
+        ticks = await pg_session.execute(text("SELECT count(*) FROM tick_data"))
+        assert ticks.scalar_one() == 51
+        assert scraper.writer.stats()["failed_flushes"] == 0
@@ -0,0 +1,114 @@
+"""Tests for the tick and daily history export."""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import Channel, DailyData, TickData
+from app.services import export
+from app.services.export import EXPORT_TABLES, export_chunks
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for model in (Channel, TickData, DailyData):
+            await conn.run_sync(model.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        session.add(Channel(id=1, name="EwanLibya"))
+        await session.flush()
+        session.add_all([
+            TickData(
+                id=i + 1, timestamp=START + timedelta(minutes=i), currency_pair="USD/LYD",
+                price=6.8 + i / 100, price_type="mid", source_channel="EwanLibya",
+                message_id=i if i % 2 else None,
+            )
+            for i in range(7)
+        ])
+        session.add_all([
+            DailyData(
+                id=2 * i + j + 1, date=START + timedelta(days=i), currency_pair=pair,
+                open=6.8, high=6.9, low=6.7, close=6.8 + i / 100,
+                volume=None if i == 0 else 1000.0,
+            )
+            for i in range(5)
+            for j, pair in enumerate(("USD/LYD", "EUR/LYD"))
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def collect(session, *args, **kwargs) -> bytes:
+    return b"".join([chunk async for chunk in export_chunks(session, *args, **kwargs)])
+
+
+class TestTextExport:
+    @pytest.mark.asyncio
+    async def test_ndjson_ticks(self, session):
+        data = await collect(session, "tick", "ndjson", "USD/LYD", batch_size=3)
+        records = [json.loads(line) for line in data.decode().splitlines()]
+
+        assert [record["id"] for record in records] == list(range(1, 8))
+        assert records[1] == {
+            "timestamp": "2024-01-01T00:01:00", "id": 2, "currency_pair": "USD/LYD",
+            "price": 6.81, "price_type": "mid", "source_channel": "EwanLibya", "message_id": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_csv_daily_range(self, session):
+        data = await collect(
+            session, "daily", "csv", "EUR/LYD",
+            start=START + timedelta(days=1), end=START + timedelta(days=3),
+        )
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+
+        assert [row["date"] for row in rows] == ["2024-01-02T00:00:00", "2024-01-03T00:00:00"]
+        assert rows[0]["currency_pair"] == "EUR/LYD"
+
+
+class TestColumnarExport:
+    @pytest.mark.asyncio
+    async def test_arrow_stream_in_batches(self, session):
+        pa = pytest.importorskip("pyarrow")
+        data = await collect(session, "tick", "arrow", "USD/LYD", batch_size=3)
+
+        reader = pa.ipc.open_stream(data)
+        batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [3, 3, 1]
+
+        table = pa.Table.from_batches(batches)
+        assert table.schema.names == EXPORT_TABLES["tick"].names
+        assert table.schema.field("timestamp").type == pa.timestamp("us")
+        assert table.column("price_type").to_pylist() == ["mid"] * 7
+        assert table.column("message_id").to_pylist()[:3] == [None, 1, None]
+
+    @pytest.mark.asyncio
+    async def test_parquet_row_groups(self, session):
+        pq = pytest.importorskip("pyarrow.parquet")
+        data = await collect(session, "daily", "parquet", "USD/LYD", batch_size=2)
+
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        assert parquet.metadata.num_row_groups == 3
+        frame = parquet.read().to_pandas()
+        assert list(frame["close"]) == pytest.approx([6.8, 6.81, 6.82, 6.83, 6.84])
+        assert frame["volume"].isna().tolist() == [True, False, False, False, False]
+        assert frame["date"].iloc[-1] == START + timedelta(days=4)
+
+    @pytest.mark.asyncio
+    async def test_empty_range_is_a_valid_file(self, session):
+        pq = pytest.importorskip("pyarrow.parquet")
+        data = await collect(session, "tick", "parquet", "GBP/LYD")
+        assert pq.read_table(io.BytesIO(data)).num_rows == 0
+
+    @pytest.mark.asyncio
+    async def test_needs_pyarrow(self, session, monkeypatch):
+        monkeypatch.setattr(export, "pa", None)
+        with pytest.raises(RuntimeError, match="pyarrow"):
+            await collect(session, "tick", "parquet", "USD/LYD")
@@ -10,8 +10,9 @@ from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 import httpx
+from sqlalchemy.dialects import postgresql
 
-from app.services.fulus_sync import FulusSyncService
+from app.services.fulus_sync import UPSERT_BATCH_SIZE, FulusSyncService
 
 
 @pytest.fixture
@@ -206,6 +207,81 @@ class TestFetchRates:
         assert len(result) == 3
 
 
+# ---------------------------------------------------------------------------
+# save_daily_data
+# ---------------------------------------------------------------------------
+
+def _rows(days: int) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=i)).strftime("%Y-%m-%d"),
+            "open": 6.8, "high": 6.9, "low": 6.7, "close": 6.85, "volume": 1000,
+        }
+        for i in range(days)
+    ]
+
+
+class TestSaveDailyData:
+    @pytest.mark.asyncio
+    async def test_upserts_in_one_statement(self, mock_db_session):
+        svc = FulusSyncService()
+        await svc.set_db_session(mock_db_session)
+
+        saved = await svc.save_daily_data("USD/LYD", _rows(30))
+
+        assert saved == 30
+        mock_db_session.add.assert_not_called()
+        assert mock_db_session.execute.await_count == 1
+        mock_db_session.commit.assert_awaited_once()
+
+        statement = mock_db_session.execute.await_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (currency_pair, date) DO UPDATE SET" in sql
+        assert "close = excluded.close" in sql
+        assert "source = excluded.source" in sql
+
+    @pytest.mark.asyncio
+    async def test_batches_large_backfills(self, mock_db_session):
+        svc = FulusSyncService()
+        await svc.set_db_session(mock_db_session)
+
+        saved = await svc.save_daily_data("USD/LYD", _rows(UPSERT_BATCH_SIZE + 5))
+
+        assert saved == UPSERT_BATCH_SIZE + 5
+        assert mock_db_session.execute.await_count == 2
+        mock_db_session.commit.assert_awaited_once()
+
+    def test_repeated_dates_keep_the_last_record(self):
+        data = _rows(2) + [{**_rows(1)[0], "close": 7.0}]
+
+        rows = FulusSyncService._daily_rows("USD/LYD", data)
+
+        assert len(rows) == 2
+        assert rows[0]["close"] == 7.0
+        assert rows[0]["source"] == "fulus.ly"
+
+    @pytest.mark.asyncio
+    async def test_rolls_back_on_error(self, mock_db_session):
+        mock_db_session.execute.side_effect = RuntimeError("boom")
+        svc = FulusSyncService()
+        await svc.set_db_session(mock_db_session)
+
+        with pytest.raises(RuntimeError):
+            await svc.save_daily_data("USD/LYD", _rows(3))
+
+        mock_db_session.rollback.assert_awaited_once()
+        mock_db_session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_without_session_or_data(self, mock_db_session):
+        assert await FulusSyncService().save_daily_data("USD/LYD", _rows(3)) == 0
+        svc = FulusSyncService()
+        await svc.set_db_session(mock_db_session)
+        assert await svc.save_daily_data("USD/LYD", []) == 0
+        mock_db_session.execute.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Integration test – requires live FULUS_LY_API_KEY
 # ---------------------------------------------------------------------------
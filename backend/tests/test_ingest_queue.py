@@ -0,0 +1,115 @@
+"""Unit tests for IngestQueue – bounded queue and worker pool."""
+import asyncio
+
+import pytest
+
+from app.services.ingest_queue import IngestQueue
+
+
+class SlowHandler:
+    """Handler that blocks until released, recording what it processed."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.items = []
+
+    async def __call__(self, item):
+        await self.release.wait()
+        self.items.append(item)
+
+
+class TestIngestQueue:
+    @pytest.mark.asyncio
+    async def test_put_does_not_wait_for_slow_handler(self):
+        handler = SlowHandler()
+        queue = IngestQueue(handler, maxsize=100, workers=2, policy="block")
+        await queue.start()
+
+        started = asyncio.get_running_loop().time()
+        for i in range(50):
+            assert await queue.put(i)
+        assert asyncio.get_running_loop().time() - started < 0.5
+
+        handler.release.set()
+        await queue.stop()
+        assert sorted(handler.items) == list(range(50))
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_newest_items(self):
+        handler = SlowHandler()
+        queue = IngestQueue(handler, maxsize=3, workers=1, policy="drop_oldest")
+
+        results = [await queue.put(i) for i in range(5)]
+        assert results == [True, True, True, False, False]
+
+        handler.release.set()
+        await queue.start()
+        await queue.stop()
+        assert handler.items == [2, 3, 4]
+        assert queue.stats()["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_rejects_when_full(self):
+        handler = SlowHandler()
+        queue = IngestQueue(handler, maxsize=2, workers=1, policy="drop_newest")
+
+        results = [await queue.put(i) for i in range(4)]
+        assert results == [True, True, False, False]
+
+        handler.release.set()
+        await queue.start()
+        await queue.stop()
+        assert handler.items == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self):
+        handler = SlowHandler()
+        queue = IngestQueue(handler, maxsize=1, workers=1, policy="block")
+        await queue.put(0)
+
+        blocked = asyncio.create_task(queue.put(1))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        handler.release.set()
+        await queue.start()
+        await blocked
+        await queue.stop()
+        assert handler.items == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_do_not_kill_workers(self):
+        async def flaky(item):
+            if item == 0:
+                raise RuntimeError("boom")
+
+        queue = IngestQueue(flaky, maxsize=10, workers=1, policy="block")
+        await queue.start()
+        await queue.put(0)
+        await queue.put(1)
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["failed"] == 1
+        assert stats["processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stats_report_lag_and_depth(self):
+        handler = SlowHandler()
+        queue = IngestQueue(handler, maxsize=10, workers=1, policy="block")
+        for i in range(3):
+            await queue.put(i)
+        assert queue.stats()["queue_depth"] == 3
+
+        handler.release.set()
+        await queue.start()
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] == 3
+        assert stats["lag"]["count"] == 3
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            IngestQueue(lambda item: None, policy="spill")
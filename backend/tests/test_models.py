@@ -0,0 +1,79 @@
+"""Tests for the SMALLINT-keyed tick columns."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import (
+    CURRENCY_PAIRS,
+    PRICE_TYPES,
+    Channel,
+    CurrencyPair,
+    PriceType,
+    TickData,
+)
+from app.models.types import CodedString
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for model in (Channel, CurrencyPair, PriceType, TickData):
+            await conn.run_sync(model.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        yield session
+    await engine.dispose()
+
+
+class TestCodedString:
+    def test_round_trip(self):
+        pairs = CodedString(CURRENCY_PAIRS)
+        assert pairs.process_bind_param("USD/LYD", None) == 1
+        assert pairs.process_bind_param("EUR/LYD", None) == 2
+        assert pairs.process_result_value(2, None) == "EUR/LYD"
+        assert pairs.process_bind_param("XYZ/LYD", None) is None
+
+    def test_codes_are_append_only(self):
+        # Stored rows depend on these positions; only ever append
+        assert CURRENCY_PAIRS[:2] == ("USD/LYD", "EUR/LYD")
+        assert PRICE_TYPES == ("buy", "sell", "mid")
+
+
+class TestTickStorage:
+    @pytest.mark.asyncio
+    async def test_strings_in_smallints_on_disk(self, session):
+        session.add_all([Channel(id=1, name="EwanLibya"), Channel(id=2, name="AlMushir")])
+        await session.flush()
+        session.add(TickData(
+            id=1, timestamp=datetime(2024, 2, 8, 12), currency_pair="EUR/LYD",
+            price=7.4, price_type="sell", source_channel="AlMushir", message_id=5,
+        ))
+        await session.commit()
+
+        raw = (await session.execute(text(
+            "SELECT currency_pair, price_type, source_channel FROM tick_data"
+        ))).one()
+        assert tuple(raw) == (2, 2, 2)
+
+        tick, channel = (await session.execute(
+            select(TickData, Channel.name)
+            .join(Channel, Channel.id == TickData.source_channel)
+            .where(TickData.source_channel == "AlMushir")
+        )).one()
+        # The channel reads as its key; its name comes from joining the lookup table
+        assert (tick.currency_pair, tick.price_type, tick.source_channel, channel) == (
+            "EUR/LYD", "sell", 2, "AlMushir",
+        )
+        missing = await session.execute(
+            select(TickData).where(TickData.currency_pair == "USD/LYD")
+        )
+        assert missing.scalars().all() == []
+
+    @pytest.mark.asyncio
+    async def test_lookup_tables_are_seeded(self, session):
+        pairs = (await session.execute(select(CurrencyPair.id, CurrencyPair.name))).all()
+        assert dict(pairs) == dict(enumerate(CURRENCY_PAIRS, start=1))
+        sides = (await session.execute(select(PriceType.name).order_by(PriceType.id))).scalars()
+        assert tuple(sides) == PRICE_TYPES
@@ -0,0 +1,155 @@
+"""Tests for the streaming market panic index."""
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import TelegramMessage
+from app.services import panic_index as panic_index_module
+from app.services.analysis import AnalysisService
+from app.services.panic_index import PanicWindow
+from app.services.telegram_scraper import TelegramPriceScraper
+
+NOW = datetime(2024, 2, 8, 12, 0)
+CALM = "السوق هادئ اليوم"
+PANIC = "تحذير: أزمة سيولة في المصارف"
+
+
+def stream(count: int, seed: int = 5) -> list[tuple[datetime, bool]]:
+    """Messages over the 48 hours before NOW, a quarter of them panicky."""
+    rng = random.Random(seed)
+    seconds = sorted(rng.sample(range(48 * 3600), count))
+    start = NOW - timedelta(hours=48)
+    return [(start + timedelta(seconds=s), rng.random() < 0.25) for s in seconds]
+
+
+def reference(entries, now: datetime, max_messages: int, max_age_hours: float) -> float:
+    """The database path's formula, by brute force."""
+    kept = sorted(
+        e for e in entries if not max_age_hours or e[0] >= now - timedelta(hours=max_age_hours)
+    )
+    if max_messages:
+        kept = kept[-max_messages:]
+    if not kept:
+        return 0.0
+    return round(min(sum(panic for _, panic in kept) / len(kept) * 100, 100), 2)
+
+
+@pytest.fixture
+def window(monkeypatch) -> PanicWindow:
+    """A fresh default window installed as the process-wide one."""
+    window = PanicWindow(max_messages=100, max_age_hours=24)
+    monkeypatch.setattr(panic_index_module, "_panic_window", window)
+    return window
+
+
+class TestPanicWindow:
+    @pytest.mark.parametrize("max_messages, max_age_hours", [(100, 24), (0, 24), (100, 0), (5, 1)])
+    def test_matches_the_formula_as_messages_arrive(self, max_messages, max_age_hours):
+        entries = stream(3000)
+        window = PanicWindow(max_messages=max_messages, max_age_hours=max_age_hours)
+
+        for i, (timestamp, panic) in enumerate(entries):
+            window.add(timestamp, panic)
+            if i % 37 == 0:
+                now = timestamp + timedelta(minutes=5)
+                expected = reference(entries[:i + 1], now, max_messages, max_age_hours)
+                assert window.index(now) == expected
+
+    @pytest.mark.parametrize("max_messages, max_age_hours", [(100, 24), (0, 24), (50, 0)])
+    def test_out_of_order_messages(self, max_messages, max_age_hours):
+        entries = stream(1000)
+        shuffled = entries[:]
+        random.Random(1).shuffle(shuffled)
+        window = PanicWindow(max_messages=max_messages, max_age_hours=max_age_hours)
+
+        for timestamp, panic in shuffled:
+            window.add(timestamp, panic)
+
+        assert window.index(NOW) == reference(entries, NOW, max_messages, max_age_hours)
+
+    def test_window_empties_with_time(self):
+        window = PanicWindow(max_messages=100, max_age_hours=24)
+        window.add_text(NOW, PANIC)
+        window.add_text(NOW, CALM)
+
+        assert window.index(NOW) == 50.0
+        assert window.index(NOW + timedelta(hours=25)) == 0.0
+        assert len(window) == 0 and window.panic == 0
+
+    def test_memory_is_bounded_without_reads(self):
+        window = PanicWindow(max_messages=0, max_age_hours=1)
+        for minute in range(600):
+            window.add(NOW + timedelta(minutes=minute), False)
+        assert len(window) == 61
+
+    def test_needs_a_bound(self):
+        with pytest.raises(ValueError):
+            PanicWindow(max_messages=0, max_age_hours=0)
+
+
+# ---------------------------------------------------------------------------
+# Hydration and readers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def sessions(tmp_path):
+    """A scratch telegram_messages with 300 messages over the last 30 hours."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'messages.db'}")
+    now = datetime.now()
+    async with engine.begin() as conn:
+        await conn.run_sync(TelegramMessage.__table__.create)
+        await conn.execute(TelegramMessage.__table__.insert(), [
+            {"timestamp": now - timedelta(minutes=6 * i), "channel": "EwanLibya",
+             "message_id": i, "text": PANIC if i % 3 == 0 else CALM, "contains_price": 0}
+            for i in range(1, 301)
+        ])
+    yield async_sessionmaker(engine, class_=AsyncSession)
+    await engine.dispose()
+
+
+class TestReaders:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_messages, max_age_hours", [(100, 24), (0, 24), (250, 0)])
+    async def test_hydrated_window_matches_the_database_path(
+        self, monkeypatch, sessions, max_messages, max_age_hours,
+    ):
+        window = PanicWindow(max_messages=max_messages, max_age_hours=max_age_hours)
+        monkeypatch.setattr(panic_index_module, "_panic_window", window)
+        async with sessions() as session:
+            service = AnalysisService()
+            await service.set_db_session(session)
+            from_db = await service.calculate_market_panic_index()
+
+            await window.hydrate(session)
+            from_memory = await service.calculate_market_panic_index()
+
+        assert window.hydrated
+        assert from_memory == from_db > 0
+
+    @pytest.mark.asyncio
+    async def test_read_from_memory_without_a_session(self, window):
+        window.hydrated = True
+        window.add_text(datetime.now(), PANIC)
+        assert await AnalysisService().calculate_market_panic_index() == 100.0
+
+    @pytest.mark.asyncio
+    async def test_scraper_scores_each_message_once(self, window, monkeypatch):
+        scored = []
+        monkeypatch.setattr(
+            panic_index_module.sentiment, "is_panic", lambda text: scored.append(text) or True,
+        )
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        # Scored by the text processor, in the same pass as the price extraction
+        for message_id, (channel, text) in enumerate([("A", PANIC), ("B", CALM)], start=1):
+            await scraper.handle_message(SimpleNamespace(
+                message=SimpleNamespace(id=message_id, text=text),
+                chat=SimpleNamespace(username=channel),
+                chat_id=message_id,
+            ))
+
+        assert scored == [PANIC, CALM]
+        assert window.stats()["window"] == 2
+        assert window.panic == 2
@@ -0,0 +1,165 @@
+"""Differential tests for PriceExtractor against the original parser."""
+import random
+
+import pytest
+
+from app.services.price_parser import PriceExtractor, parse_price_reference
+
+# Texts used by test_telegram_scraper.py
+KNOWN_MESSAGES = [
+    "سعر الدولار الآن: 6.85",
+    "سعر الدولار شراء 6.80 بيع 6.90",
+    "سعر اليورو بيع 7.50",
+    "الدولار بـ 6.75 دينار",
+    "USD/LYD: 6.85",
+    "EUR/LYD: 7.40",
+    "USD rate: 6.90",
+    "USD/LYD buy 6.80",
+    "USD/LYD sell 6.95",
+    "أهلاً وسهلاً بكم في قناتنا",
+    "USD/LYD: 150.00",
+    "USD/LYD: 0",
+    "GBP rate: 8.00",
+    "سعر الدولار الآن: 6.875",
+]
+
+FRAGMENTS = [
+    "سعر", "صرف", "الدولار", "اليورو", "دولار", "يورو", "دينار", "الآن", "بـ",
+    "شراء", "بيع", "USD", "usd", "Usd", "EUR", "eur", "LYD", "lyd", "/LYD", "/lyd",
+    "USD/LYD", "EUR/LYD", "dollar", "DOLLAR", "buy", "BUY", "buying", "bid", "sell",
+    "SELL", "selling", "ask", "rate", "price", "GBP", ":", "/", "-", "\n",
+    "usdollar", "bidollar", "sellyd", "ıs", "uſd", "İ", "bİd", "USḊ",
+    "market", "السوق", "أزمة", "today",
+]
+
+
+def random_price(rng: random.Random) -> str:
+    return rng.choice([
+        f"{rng.uniform(0, 12):.2f}",
+        f"{rng.uniform(0, 200):.3f}",
+        str(rng.randint(0, 150)),
+        f"{rng.randint(1, 9)}.",
+        "0",
+        "0.0",
+    ])
+
+
+def corpus(size: int, seed: int = 1234) -> list[str]:
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 10)):
+            if rng.random() < 0.3:
+                parts.append(random_price(rng))
+            else:
+                parts.append(rng.choice(FRAGMENTS))
+        joiner = rng.choice([" ", "", "  ", " : "])
+        texts.append(joiner.join(parts))
+    return texts
+
+
+@pytest.fixture(scope="module")
+def extractor() -> PriceExtractor:
+    return PriceExtractor()
+
+
+class TestPriceExtractor:
+    @pytest.mark.parametrize("text", KNOWN_MESSAGES)
+    def test_matches_reference_on_known_messages(self, extractor, text):
+        assert extractor.parse(text) == parse_price_reference(text)
+
+    def test_matches_reference_on_random_corpus(self, extractor):
+        mismatches = [
+            (text, extractor.parse(text), parse_price_reference(text))
+            for text in corpus(20000)
+            if extractor.parse(text) != parse_price_reference(text)
+        ]
+        assert mismatches == []
+
+    def test_corpus_exercises_every_outcome(self, extractor):
+        results = [extractor.parse(text) for text in corpus(5000)]
+        found = {(r["currency_pair"], r["price_type"]) for r in results if r}
+        assert None in results
+        assert found == {
+            (pair, side)
+            for pair in ("USD/LYD", "EUR/LYD")
+            for side in ("buy", "sell", "mid")
+        }
+
+    def test_overlapping_keywords_are_not_skipped(self, extractor):
+        # "dollar" starts inside "usd" / "bid"; "lyd" starts inside "sell"
+        for text in ["bidollar 6.5 lyd", "xusdollar 6.5", "sellyd 5.5 dinar buy"]:
+            assert extractor.parse(text) == parse_price_reference(text)
+
+    def test_casefold_hazards_fall_back_to_all_patterns(self, extractor):
+        # IGNORECASE matches "uſd" as "usd" although lower() does not
+        text = "dollar uſd 6.5"
+        assert extractor.parse(text) == parse_price_reference(text)
+        assert extractor.parse(text)["price"] == pytest.approx(6.5)
+
+
+def quote(pair: str, price: float, side: str = "mid") -> dict:
+    return {"currency_pair": pair, "price": price, "price_type": side}
+
+
+class TestExtractAll:
+    @pytest.mark.parametrize("text, expected", [
+        (
+            "الدولار شراء 6.90 بيع 6.95 - اليورو شراء 7.40 بيع 7.45",
+            [
+                quote("USD/LYD", 6.90, "buy"), quote("USD/LYD", 6.95, "sell"),
+                quote("EUR/LYD", 7.40, "buy"), quote("EUR/LYD", 7.45, "sell"),
+            ],
+        ),
+        ("USD rate: 6.80 | EUR rate: 7.50", [quote("USD/LYD", 6.80), quote("EUR/LYD", 7.50)]),
+        (
+            "EUR/LYD buy 7.40 sell 7.45",
+            [quote("EUR/LYD", 7.40, "buy"), quote("EUR/LYD", 7.45, "sell")],
+        ),
+        (
+            "USD buy/sell: 6.90/6.95",
+            [quote("USD/LYD", 6.90, "buy"), quote("USD/LYD", 6.95, "sell")],
+        ),
+        # Times and other numbers are not quotes
+        ("10:30 سعر الدولار الآن: 6.85 الساعة 11:00", [quote("USD/LYD", 6.85)]),
+        ("السوق هادئ اليوم 5", []),
+        # Queued sides do not reach unrelated numbers later in the message
+        ("USD buy/sell: 6.90 updated 20 minutes ago", []),
+        ("سعر الدولار شراء وبيع 6.90 آخر تحديث 10 دقائق", []),
+        ("USD buy 6.90. Updated 20 minutes ago, sell soon", [quote("USD/LYD", 6.90, "buy")]),
+        (
+            "EUR/LYD buy 7.40 sell 7.45 USD 50 dollars bank note",
+            [quote("EUR/LYD", 7.40, "buy"), quote("EUR/LYD", 7.45, "sell")],
+        ),
+        # A side may come before its currency
+        (
+            "buy USD 6.90, buy EUR 7.40",
+            [quote("USD/LYD", 6.90, "buy"), quote("EUR/LYD", 7.40, "buy")],
+        ),
+        (
+            "شراء الدولار 6.90 شراء اليورو 7.40",
+            [quote("USD/LYD", 6.90, "buy"), quote("EUR/LYD", 7.40, "buy")],
+        ),
+        ("1 USD = 6.85 LYD", [quote("USD/LYD", 6.85)]),
+        (
+            "1 USD = 6.85 LYD, 1 EUR = 7.45 LYD",
+            [quote("USD/LYD", 6.85), quote("EUR/LYD", 7.45)],
+        ),
+    ])
+    def test_every_quote_is_returned(self, extractor, text, expected):
+        assert extractor.extract_all(text) == expected
+
+    @pytest.mark.parametrize("text", KNOWN_MESSAGES)
+    def test_single_quote_is_included(self, extractor, text):
+        single = extractor.parse(text)
+        quotes = extractor.extract_all(text)
+        assert (single in quotes) if single else quotes == []
+
+    def test_one_quote_messages_keep_parse_semantics(self, extractor):
+        # A side label after the price still applies, as it does in parse()
+        assert extractor.extract_all("الدولار 6.90 شراء") == [quote("USD/LYD", 6.90, "buy")]
+
+    def test_parse_many_is_batch_of_extract_all(self, extractor):
+        texts = KNOWN_MESSAGES + corpus(200)
+        assert extractor.parse_many(texts) == [extractor.extract_all(text) for text in texts]
@@ -0,0 +1,159 @@
+"""Tests for the in-memory latest quote store."""
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.routes import api_router
+from app.core import database
+from app.core.database import ReadSessionLocal
+from app.models.data import Channel, TickData
+from app.services import price_state as price_state_module
+from app.services.analysis import AnalysisService
+from app.services.price_state import LatestQuoteStore
+from app.services.telegram_scraper import TelegramPriceScraper
+
+NOW = datetime(2024, 2, 8, 12, 0)
+
+
+@pytest.fixture
+def store(monkeypatch) -> LatestQuoteStore:
+    """A fresh store installed as the process-wide one."""
+    store = LatestQuoteStore(stale_after_seconds=600)
+    monkeypatch.setattr(price_state_module, "_price_state", store)
+    return store
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ticks.db'}")
+    async with engine.begin() as conn:
+        for model in (Channel, TickData):
+            await conn.run_sync(model.__table__.create)
+        await conn.execute(Channel.__table__.insert(), {"id": 1, "name": "EwanLibya"})
+        await conn.execute(TickData.__table__.insert(), [
+            {"id": i, "timestamp": timestamp, "currency_pair": pair, "price": price,
+             "price_type": side, "source_channel": "EwanLibya", "message_id": i}
+            for i, (timestamp, pair, side, price) in enumerate([
+                (NOW - timedelta(hours=2), "USD/LYD", "buy", 6.80),
+                (NOW - timedelta(hours=1), "USD/LYD", "buy", 6.85),
+                (NOW - timedelta(minutes=30), "USD/LYD", "sell", 6.95),
+                (NOW - timedelta(days=1), "EUR/LYD", "mid", 7.40),
+            ], start=1)
+        ])
+    yield engine
+    await engine.dispose()
+
+
+class TestLatestQuoteStore:
+    def test_latest_per_side_and_overall(self, store):
+        store.update("USD/LYD", "buy", 6.85, NOW - timedelta(minutes=5), "EwanLibya")
+        store.update("USD/LYD", "sell", 6.95, NOW, "AlMushir")
+
+        assert store.latest("USD/LYD", "buy").price == 6.85
+        assert store.latest("USD/LYD").price_type == "sell"
+        assert store.latest("USD/LYD", "mid") is None
+        assert store.latest("EUR/LYD") is None
+
+    def test_older_quotes_do_not_replace_newer(self, store):
+        assert store.update("USD/LYD", "buy", 6.85, NOW, "EwanLibya")
+        assert not store.update("USD/LYD", "buy", 6.10, NOW - timedelta(days=3), "EwanLibya")
+        assert store.latest("USD/LYD", "buy").price == 6.85
+
+    def test_staleness(self, store):
+        store.update("USD/LYD", "buy", 6.85, NOW, "EwanLibya")
+        quote = store.latest("USD/LYD")
+
+        assert store.age_seconds(quote, NOW + timedelta(minutes=5)) == 300
+        assert not store.is_stale(quote, NOW + timedelta(minutes=5))
+        assert store.is_stale(quote, NOW + timedelta(minutes=11))
+
+    @pytest.mark.asyncio
+    async def test_hydrate_from_ticks(self, store, engine):
+        async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+            await store.hydrate(session)
+
+        assert store.hydrated
+        assert store.latest("USD/LYD", "buy").price == 6.85
+        assert store.latest("USD/LYD").price == 6.95
+        assert store.latest("EUR/LYD").source_channel == "EwanLibya"
+        assert store.stats()["keys"] == 3
+
+
+# ---------------------------------------------------------------------------
+# Feeding and reading the store
+# ---------------------------------------------------------------------------
+
+class TestScraperUpdates:
+    @pytest.mark.asyncio
+    async def test_accepted_quotes_update_the_store(self, store):
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        await scraper.process_message("EwanLibya", 1, "USD buy 6.80 sell 6.90", [
+            {"currency_pair": "USD/LYD", "price": 6.80, "price_type": "buy"},
+            {"currency_pair": "USD/LYD", "price": 6.90, "price_type": "sell"},
+        ], False)
+
+        assert store.latest("USD/LYD", "buy").price == 6.80
+        assert store.latest("USD/LYD", "sell").source_channel == "EwanLibya"
+
+
+@pytest.fixture
+async def client(engine):
+    ReadSessionLocal.configure(bind=engine)
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    ReadSessionLocal.configure(bind=database.read_engine)
+
+
+class TestLatestPriceEndpoint:
+    @pytest.mark.asyncio
+    async def test_served_from_memory_once_hydrated(self, store, client):
+        store.hydrated = True
+        store.update("USD/LYD", "buy", 7.00, datetime.now(), "AlMushir")
+
+        response = await client.get(
+            "/api/v1/data/latest-price", params={"currency_pair": "USD/LYD"},
+        )
+        data = response.json()
+        assert data["served_from"] == "memory"
+        assert data["price"] == 7.00
+        assert data["source"] == "AlMushir"
+        assert data["stale"] is False
+        assert data["age_seconds"] < 60
+
+    @pytest.mark.asyncio
+    async def test_database_fallback_reports_staleness(self, store, client):
+        response = await client.get(
+            "/api/v1/data/latest-price",
+            params={"currency_pair": "USD/LYD", "price_type": "buy"},
+        )
+        data = response.json()
+        assert data["served_from"] == "database"
+        assert data["price"] == 6.85
+        assert data["price_type"] == "buy"
+        assert data["stale"] is True
+
+    @pytest.mark.asyncio
+    async def test_unknown_pair(self, store, client):
+        store.hydrated = True
+        response = await client.get(
+            "/api/v1/data/latest-price", params={"currency_pair": "GBP/LYD"},
+        )
+        assert response.json()["price"] is None
+
+
+class TestAnalysisCurrentPrice:
+    @pytest.mark.asyncio
+    async def test_current_price_from_memory(self, store, mock_db_session):
+        store.hydrated = True
+        store.update("EUR/LYD", "mid", 7.45, NOW, "EwanLibya")
+
+        service = AnalysisService()
+        await service.set_db_session(mock_db_session)
+        assert await service.get_current_price("EUR/LYD") == 7.45
+        mock_db_session.execute.assert_not_called()
@@ -0,0 +1,140 @@
+"""Unit tests for the per-channel token-bucket rate limiter."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.rate_limiter import ChannelRateLimiter, TokenBucket
+from app.services.telegram_scraper import TelegramPriceScraper
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+def make_event(channel: str, message_id: int, text: str | None = None):
+    # Distinct text per message so the duplicate filter lets them all through
+    text = text or f"USD/LYD: {6.5 + message_id / 1000:.3f}"
+    return SimpleNamespace(
+        message=SimpleNamespace(id=message_id, text=text),
+        chat=SimpleNamespace(username=channel),
+        chat_id=message_id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# TokenBucket
+# ---------------------------------------------------------------------------
+
+class TestTokenBucket:
+    def test_allows_burst_then_refuses(self):
+        bucket = TokenBucket(rate=1.0, capacity=3, now=0.0)
+        assert [bucket.try_take(0.0) for _ in range(4)] == [True, True, True, False]
+
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=0.5, capacity=1, now=0.0)
+        assert bucket.try_take(0.0)
+        assert bucket.time_until_token(0.0) == pytest.approx(2.0)
+        assert not bucket.try_take(1.0)
+        assert bucket.try_take(2.0)
+
+
+# ---------------------------------------------------------------------------
+# ChannelRateLimiter
+# ---------------------------------------------------------------------------
+
+class TestChannelRateLimiter:
+    def test_burst_in_one_channel_does_not_throttle_another(self):
+        limiter = ChannelRateLimiter(rate=1.0, burst=2, policy="drop", clock=FakeClock())
+        decisions = [limiter.admit("@A", i) for i in range(5)]
+        assert decisions.count(ChannelRateLimiter.PASSED) == 2
+        assert limiter.admit("@B", 0) == ChannelRateLimiter.PASSED
+        assert limiter.stats()["dropped"] == 3
+
+    def test_per_pair_keys_are_independent(self):
+        limiter = ChannelRateLimiter(
+            rate=1.0, burst=1, policy="drop", per_pair=True, clock=FakeClock()
+        )
+        usd = limiter.key("@A", "USD/LYD")
+        eur = limiter.key("@A", "EUR/LYD")
+        assert limiter.admit(usd, 1) == ChannelRateLimiter.PASSED
+        assert limiter.admit(eur, 2) == ChannelRateLimiter.PASSED
+        assert limiter.admit(usd, 3) == ChannelRateLimiter.DROPPED
+
+    def test_coalesce_keeps_latest_and_releases_after_refill(self):
+        clock = FakeClock()
+        limiter = ChannelRateLimiter(rate=0.5, burst=1, policy="coalesce", clock=clock)
+        assert limiter.admit("@A", "first") == ChannelRateLimiter.PASSED
+        assert limiter.admit("@A", "second") == ChannelRateLimiter.COALESCED
+        assert limiter.admit("@A", "third") == ChannelRateLimiter.COALESCED
+
+        assert limiter.release("@A") is None
+        assert limiter.release_delay("@A") == pytest.approx(2.0)
+
+        clock.advance(2.0)
+        assert limiter.release("@A") == "third"
+        assert limiter.stats() == {
+            "policy": "coalesce",
+            "passed": 1,
+            "dropped": 1,
+            "delayed": 1,
+            "pending": 0,
+            "tracked_keys": 1,
+        }
+
+    def test_new_message_does_not_overtake_held_one(self):
+        clock = FakeClock()
+        limiter = ChannelRateLimiter(rate=1.0, burst=1, policy="coalesce", clock=clock)
+        limiter.admit("@A", "first")
+        limiter.admit("@A", "held")
+        clock.advance(1.0)
+        # A token is available, but a message is still held for this channel
+        assert limiter.admit("@A", "newer") == ChannelRateLimiter.COALESCED
+        assert limiter.release("@A") == "newer"
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            ChannelRateLimiter(policy="sleep")
+
+
+# ---------------------------------------------------------------------------
+# TelegramPriceScraper.handle_message
+# ---------------------------------------------------------------------------
+
+class TestHandleMessageRateLimiting:
+    @pytest.fixture
+    def scraper(self) -> TelegramPriceScraper:
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        scraper.rate_limiter = ChannelRateLimiter(rate=20.0, burst=1, policy="coalesce")
+        scraper.process_message = AsyncMock()
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_burst_does_not_block_other_channels(self, scraper):
+        for i in range(10):
+            await scraper.handle_message(make_event("A", i))
+        await scraper.handle_message(make_event("B", 100))
+
+        processed = [call.args[1] for call in scraper.process_message.await_args_list]
+        assert processed == [0, 100]
+        await scraper.stop()
+
+    @pytest.mark.asyncio
+    async def test_coalesced_message_is_processed_later(self, scraper):
+        await scraper.handle_message(make_event("A", 1))
+        await scraper.handle_message(make_event("A", 2))
+        await scraper.handle_message(make_event("A", 3))
+
+        await asyncio.sleep(0.1)
+        processed = [call.args[1] for call in scraper.process_message.await_args_list]
+        assert processed == [1, 3]
+        assert scraper.get_stats()["rate_limiter"]["delayed"] == 1
+        await scraper.stop()
@@ -0,0 +1,81 @@
+"""Tests for routing reads to the replica and writes to the primary."""
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.v1.routes import api_router
+from app.core import database
+from app.core.database import AsyncSessionLocal, Base, ReadSessionLocal, get_db
+from app.models.data import Channel, TickData
+
+
+async def make_database(path, price: float):
+    """A SQLite database holding one USD/LYD tick at ``price``."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with engine.begin() as conn:
+        await conn.execute(Channel.__table__.insert(), {"id": 1, "name": "EwanLibya"})
+        await conn.execute(TickData.__table__.insert(), {
+            "id": 1, "timestamp": datetime.now(), "currency_pair": "USD/LYD",
+            "price": price, "price_type": "mid", "source_channel": "EwanLibya",
+            "message_id": 1,
+        })
+    return engine
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    """Point the session makers at two local databases: primary and replica."""
+    primary = await make_database(tmp_path / "primary.db", price=6.85)
+    replica = await make_database(tmp_path / "replica.db", price=7.10)
+    AsyncSessionLocal.configure(bind=primary)
+    ReadSessionLocal.configure(bind=replica)
+    yield primary, replica
+    AsyncSessionLocal.configure(bind=database.engine)
+    ReadSessionLocal.configure(bind=database.read_engine)
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.fixture
+async def client(databases):
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+class TestReadRouting:
+    @pytest.mark.asyncio
+    async def test_data_endpoints_read_the_replica(self, client):
+        response = await client.get(
+            "/api/v1/data/latest-price", params={"currency_pair": "USD/LYD"},
+        )
+        assert response.status_code == 200
+        assert response.json()["price"] == 7.10
+
+        response = await client.get("/api/v1/data/tick", params={"include_raw": "true"})
+        assert [tick["price"] for tick in response.json()] == [7.10]
+
+    @pytest.mark.asyncio
+    async def test_ingestion_sessions_use_the_primary(self, databases):
+        primary, _ = databases
+        async with AsyncSessionLocal() as session:
+            assert session.bind is primary
+            price = (await session.execute(select(TickData.price))).scalar_one()
+        assert price == 6.85
+
+        sessions = get_db()
+        session = await anext(sessions)
+        assert session.bind is primary
+        await sessions.aclose()
+
+    def test_read_engine_defaults_to_primary(self):
+        # No DATABASE_READ_URL in the test settings
+        assert database.read_engine is database.engine
@@ -0,0 +1,59 @@
+"""Tests for Telegram message retention."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.data import TelegramMessage
+from app.services.retention import RetentionService
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(TelegramMessage.__table__.create)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        # One message a day for 100 days
+        session.add_all([
+            TelegramMessage(
+                timestamp=NOW - timedelta(days=day, hours=1),
+                channel="@A", message_id=day, text=f"message {day}",
+            )
+            for day in range(100)
+        ])
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+async def remaining(session) -> int:
+    return (await session.execute(select(func.count(TelegramMessage.id)))).scalar()
+
+
+class TestRetentionService:
+    @pytest.mark.asyncio
+    async def test_deletes_only_expired_messages_in_batches(self, session):
+        retention = RetentionService(retention_days=30, batch_size=7)
+        await retention.set_db_session(session)
+
+        assert await retention.purge_telegram_messages(now=NOW) == 70
+        assert await remaining(session) == 30
+        oldest = (await session.execute(select(func.min(TelegramMessage.timestamp)))).scalar()
+        assert oldest >= NOW - timedelta(days=30)
+
+        # Nothing left to delete on the next run
+        assert await retention.purge_telegram_messages(now=NOW) == 0
+        assert retention.get_stats()["deleted"] == 70
+        assert retention.get_stats()["runs"] == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_days_keeps_everything(self, session):
+        retention = RetentionService(retention_days=0)
+        await retention.set_db_session(session)
+
+        assert await retention.purge_telegram_messages(now=NOW) == 0
+        assert await remaining(session) == 100
@@ -0,0 +1,168 @@
+"""Tests for the incremental RSI engine."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+
+from app.services import rsi as rsi_module
+from app.services import tick_buffer as tick_buffer_module
+from app.services.analysis import AnalysisService
+from app.services.rsi import RSIEngine, WilderRSI
+from app.services.telegram_scraper import TelegramPriceScraper
+from app.services.tick_buffer import TickBuffers
+
+
+def prices(count: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 6.85 + np.cumsum(rng.normal(0, 0.01, count))
+
+
+def reference(values, period: int = 14) -> pd.Series:
+    return RSIIndicator(close=pd.Series(values), window=period).rsi()
+
+
+@pytest.fixture
+def buffers(monkeypatch) -> TickBuffers:
+    """Loaded, empty tick buffers installed as the process-wide ones."""
+    buffers = TickBuffers(capacity=5000, days=30)
+    buffers.loaded_from = datetime.now() - timedelta(days=30)
+    monkeypatch.setattr(tick_buffer_module, "_tick_buffers", buffers)
+    return buffers
+
+
+@pytest.fixture
+def engine(monkeypatch) -> RSIEngine:
+    """A fresh engine installed as the process-wide one."""
+    engine = RSIEngine()
+    monkeypatch.setattr(rsi_module, "_rsi_engine", engine)
+    return engine
+
+
+def fill(buffers: TickBuffers, values, pair: str = "USD/LYD", start: datetime = None):
+    start = start or datetime.now() - timedelta(days=2)
+    for i, price in enumerate(values):
+        buffers.append(pair, "buy", float(price), start + timedelta(minutes=i))
+
+
+class TestWilderRSI:
+    @pytest.mark.parametrize("period", [2, 14, 30])
+    def test_every_step_matches_rsi_indicator(self, period):
+        values = prices(500)
+        expected = reference(values, period)
+        series = WilderRSI(period)
+
+        for i, price in enumerate(values):
+            series.update(price)
+            # calculate_rsi needs one price more than RSIIndicator
+            if i < period:
+                assert series.value is None
+                continue
+            assert series.value == pytest.approx(expected.iloc[i], abs=1e-9)
+
+    def test_from_prices_then_updates(self):
+        values = prices(400)
+        series = WilderRSI.from_prices(14, values[:300])
+        for price in values[300:]:
+            series.update(price)
+
+        assert series.count == 400
+        assert series.value == pytest.approx(reference(values).iloc[-1], abs=1e-9)
+
+    def test_neutral_until_period_plus_one_prices(self):
+        series = WilderRSI.from_prices(14, prices(14))
+        assert series.value is None
+        series.update(6.9)
+        assert series.value is not None
+
+    def test_no_losses_is_100(self):
+        series = WilderRSI.from_prices(14, np.linspace(6.5, 7.0, 30))
+        assert series.value == 100.0
+        assert reference(np.linspace(6.5, 7.0, 30)).iloc[-1] == 100.0
+
+
+class TestRSIEngine:
+    def test_unloaded_engine_is_not_read(self, engine):
+        assert engine.rsi("USD/LYD") is None
+
+    def test_built_from_buffers_and_followed(self, buffers, engine):
+        values = prices(1000)
+        fill(buffers, values[:600], start=datetime.now() - timedelta(days=2))
+        engine.load(buffers)
+        start = datetime.now() - timedelta(days=1)
+        for i, price in enumerate(values[600:]):
+            buffers.append("USD/LYD", "buy", float(price), start + timedelta(minutes=i))
+            engine.update("USD/LYD", float(price))
+
+        assert engine.rsi("USD/LYD") == pytest.approx(reference(values).iloc[-1], abs=1e-9)
+        assert engine.stats()["rebuilds"] == len(rsi_module.CURRENCY_PAIRS)
+
+    def test_other_periods_built_on_request(self, buffers, engine):
+        values = prices(300)
+        fill(buffers, values)
+        engine.load(buffers)
+
+        assert engine.rsi("USD/LYD", 7) == pytest.approx(reference(values, 7).iloc[-1], abs=1e-9)
+        assert "USD/LYD 7" in engine.stats()["rsi"]
+
+    def test_pairs_without_ticks_are_neutral(self, buffers, engine):
+        engine.load(buffers)
+        assert engine.rsi("EUR/LYD") == 50.0
+
+    def test_series_rebuilt_as_the_window_slides(self, buffers, engine):
+        fill(buffers, prices(300))
+        engine.load(buffers)
+        series = engine._series["USD/LYD"][14]
+        series.origin -= timedelta(days=2)
+
+        engine.rsi("USD/LYD")
+        assert engine._series["USD/LYD"][14] is not series
+
+    def test_incomplete_buffer_is_not_served(self, buffers, engine):
+        fill(buffers, prices(300))
+        engine.load(buffers)
+        # A backfilled tick older than the buffered ones
+        assert not buffers.append("USD/LYD", "buy", 6.8, datetime.now() - timedelta(days=3))
+        engine.discard("USD/LYD")
+
+        assert engine.rsi("USD/LYD") is None
+
+
+# ---------------------------------------------------------------------------
+# Readers and the scraper
+# ---------------------------------------------------------------------------
+
+class TestLiveRSI:
+    @pytest.mark.asyncio
+    async def test_calculate_rsi_is_a_lookup(self, buffers, engine, mock_db_session):
+        values = prices(200)
+        fill(buffers, values)
+        engine.load(buffers)
+
+        service = AnalysisService()
+        await service.set_db_session(mock_db_session)
+        assert await service.calculate_rsi("USD/LYD") == pytest.approx(
+            reference(values).iloc[-1], abs=1e-9,
+        )
+        mock_db_session.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_scraper_updates_and_pushes_rsi(self, buffers, engine):
+        values = prices(100)
+        fill(buffers, values[:-1])
+        engine.load(buffers)
+        updates = []
+
+        async def collect(message):
+            updates.append(message)
+
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        scraper.set_websocket_callback(collect)
+        await scraper.process_message("EwanLibya", 1, "USD buy", [
+            {"currency_pair": "USD/LYD", "price": float(values[-1]), "price_type": "buy"},
+        ], False)
+
+        expected = reference(values).iloc[-1]
+        assert engine.rsi("USD/LYD") == pytest.approx(expected, abs=1e-9)
+        assert updates[0]["data"]["rsi"] == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,134 @@
+"""Tests for sharded Telegram ingestion with fake client sessions."""
+import asyncio
+
+import pytest
+
+from app.services.sharding import ShardedIngestion, assign_channels, assign_shard
+from app.services.telegram_scraper import TelegramPriceScraper
+from tests.fakes import FakeTelegramClient
+
+CHANNELS = [f"@exchange{i}" for i in range(200)]
+
+
+@pytest.fixture
+def clients() -> dict[int, FakeTelegramClient]:
+    return {}
+
+
+@pytest.fixture
+async def sharding(clients):
+    scraper = TelegramPriceScraper(api_id="0", api_hash="0", channels=list(CHANNELS))
+    scraper.ingest_queue.handler = _noop_handler
+    await scraper.ingest_queue.start()
+
+    def factory(index: int) -> FakeTelegramClient:
+        clients[index] = FakeTelegramClient()
+        return clients[index]
+
+    ingestion = ShardedIngestion(scraper, shard_count=4, client_factory=factory, health_interval=0)
+    await ingestion.start()
+    yield ingestion
+    await ingestion.stop()
+    await scraper.ingest_queue.stop()
+
+
+async def _noop_handler(event):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Assignment
+# ---------------------------------------------------------------------------
+
+class TestAssignment:
+    def test_deterministic_and_roughly_even(self):
+        shards = ["shard0", "shard1", "shard2", "shard3"]
+        assignment = assign_channels(CHANNELS, shards)
+        reordered = assign_channels(list(reversed(CHANNELS)), shards)
+        assert {k: sorted(v) for k, v in assignment.items()} == {
+            k: sorted(v) for k, v in reordered.items()
+        }
+        assert sum(len(channels) for channels in assignment.values()) == len(CHANNELS)
+        assert min(len(channels) for channels in assignment.values()) > 30
+
+    def test_adding_a_shard_only_moves_channels_to_it(self):
+        before = {c: assign_shard(c, ["shard0", "shard1", "shard2"]) for c in CHANNELS}
+        after = {c: assign_shard(c, ["shard0", "shard1", "shard2", "shard3"]) for c in CHANNELS}
+        moved = [c for c in CHANNELS if before[c] != after[c]]
+        assert moved
+        assert all(after[c] == "shard3" for c in moved)
+
+
+# ---------------------------------------------------------------------------
+# ShardedIngestion
+# ---------------------------------------------------------------------------
+
+class TestShardedIngestion:
+    @pytest.mark.asyncio
+    async def test_every_channel_has_exactly_one_shard(self, sharding, clients):
+        subscribed = [clients[i].subscribed() for i in range(4)]
+        assert set().union(*subscribed) == set(CHANNELS)
+        assert sum(len(s) for s in subscribed) == len(CHANNELS)
+        # Each account only joins its own channels, so it only gets their updates
+        assert [clients[i].joined for i in range(4)] == subscribed
+
+    def test_each_shard_needs_its_own_account(self):
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0", channels=list(CHANNELS))
+        with pytest.raises(ValueError):
+            ShardedIngestion(scraper, shard_count=2, phones=["+218910000001"])
+        with pytest.raises(ValueError):
+            ShardedIngestion(scraper, shard_count=2, phones=["+218910000001"] * 2)
+        ShardedIngestion(scraper, shard_count=2, phones=["+218910000001", "+218910000002"])
+
+    @pytest.mark.asyncio
+    async def test_messages_reach_the_shared_queue(self, sharding, clients):
+        for i, channel in enumerate(CHANNELS[:20]):
+            delivered = [await client.emit(channel, i, "x") for client in clients.values()]
+            assert delivered.count(True) == 1
+
+        await asyncio.sleep(0)
+        stats = sharding.stats()
+        assert sum(s["received"] for s in stats["shards"].values()) == 20
+        assert sharding.scraper.ingest_queue.enqueued == 20
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_shard_channels_move_and_come_back(self, sharding, clients):
+        original = sharding.assignment()
+        lost = original["shard1"]
+
+        # shard1's session drops and cannot reconnect
+        clients[1].connected = False
+        clients[1].refuse_connect = True
+        await sharding.check_health()
+
+        assignment = sharding.assignment()
+        assert assignment["shard1"] == []
+        assert sorted(sum(assignment.values(), [])) == sorted(CHANNELS)
+        # Healthy shards joined the moved channels
+        assert set(lost) <= clients[0].joined | clients[2].joined | clients[3].joined
+        # Channels of healthy shards did not move
+        for name in ("shard0", "shard2", "shard3"):
+            assert set(original[name]) <= set(assignment[name])
+        assert any([await clients[i].emit(lost[0], 1, "x") for i in (0, 2, 3)])
+        assert sharding.stats()["healthy"] == 3
+
+        # It reconnects on the next health check and gets its channels back
+        clients[1].refuse_connect = False
+        await sharding.check_health()
+        assert sharding.assignment() == original
+        assert sharding.stats()["shards"]["shard1"]["reconnects"] == 1
+        # ...and the others left them again
+        assert {i: clients[i].joined for i in (0, 2, 3)} == {
+            i: set(original[f"shard{i}"]) for i in (0, 2, 3)
+        }
+
+    @pytest.mark.asyncio
+    async def test_rebalance_with_new_channels_and_shards(self, sharding, clients):
+        await sharding.add_shards(1)
+        assert len(clients) == 5
+        assert clients[4].subscribed()
+
+        await sharding.rebalance(CHANNELS + ["@newhouse"])
+        owners = [i for i, client in clients.items() if "@newhouse" in client.subscribed()]
+        assert len(owners) == 1
+        assert sharding.stats()["rebalances"] >= 2
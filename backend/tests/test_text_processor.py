@@ -0,0 +1,91 @@
+"""Tests for panic scoring and the inline / process-pool text processor."""
+import asyncio
+
+import pytest
+
+from app.services import sentiment
+from app.services.price_parser import PriceExtractor
+from app.services.text_processor import TextProcessor
+
+CORPUS = [
+    "سعر الدولار الآن: 6.85",
+    "الدولار شراء 6.90 بيع 6.95",
+    "EUR/LYD buy 7.40 sell 7.45",
+    "USD rate: 6.80 | EUR rate: 7.50",
+    "تحذير: أزمة سيولة في المصارف",
+    "Liquidity crisis deepens as banks limit withdrawals",
+    "Join our channel for daily updates on the black market",
+    "السوق هادئ اليوم",
+    "",
+]
+
+
+def generate_messages(count: int) -> list[str]:
+    return [f"{CORPUS[i % len(CORPUS)]} {i}".strip() for i in range(count)]
+
+
+def count_panic_reference(texts: list[str]) -> int:
+    """The original per-keyword substring loop."""
+    count = 0
+    for text in texts:
+        text_lower = text.lower()
+        for keyword in sentiment.PANIC_KEYWORDS:
+            if keyword.lower() in text_lower:
+                count += 1
+                break
+    return count
+
+
+# ---------------------------------------------------------------------------
+# sentiment
+# ---------------------------------------------------------------------------
+
+class TestPanicScoring:
+    def test_matches_keyword_loop(self):
+        texts = generate_messages(2000) + ["BLACK MARKET rates", "Panicking buyers", "هدوء"]
+        assert sentiment.count_panic(texts) == count_panic_reference(texts)
+
+    def test_substring_semantics(self):
+        assert sentiment.is_panic("Liquidity crunch")
+        assert sentiment.is_panic("أزمةالسيولة")
+        assert not sentiment.is_panic("calm market")
+
+
+# ---------------------------------------------------------------------------
+# TextProcessor
+# ---------------------------------------------------------------------------
+
+class TestTextProcessor:
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            TextProcessor(mode="threads")
+
+    @pytest.mark.asyncio
+    async def test_inline_mode_does_not_start_a_pool(self):
+        processor = TextProcessor(mode="inline")
+        expected = PriceExtractor().extract_all("USD/LYD: 6.85")
+        assert await processor.extract("USD/LYD: 6.85") == expected
+        assert processor.stats()["batches"] == 0
+        await processor.stop()
+
+    @pytest.mark.asyncio
+    async def test_process_mode_matches_inline(self):
+        texts = generate_messages(300)
+        processor = TextProcessor(mode="process", workers=2, batch_size=50, batch_delay=0.01)
+        try:
+            await processor.start()
+            single = await asyncio.gather(*(processor.extract(text) for text in texts))
+            many = await processor.extract_many(texts)
+            panic = await processor.count_panic(texts)
+            analyzed = await processor.analyze_many(texts)
+        finally:
+            await processor.stop()
+
+        expected = PriceExtractor().parse_many(texts)
+        assert single == expected
+        assert many == expected
+        assert panic == count_panic_reference(texts)
+        assert [quotes for quotes, _ in analyzed] == expected
+        assert sum(is_panic for _, is_panic in analyzed) == panic
+        # Concurrent single extractions were sent in batches, not one by one
+        assert processor.stats()["avg_batch_size"] > 10
@@ -0,0 +1,203 @@
+"""Tests for the per-pair tick ring buffers and their readers."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from ta.momentum import RSIIndicator
+
+from app.models.data import Channel, TickData
+from app.services import tick_buffer as tick_buffer_module
+from app.services.analysis import AnalysisService
+from app.services.forecasting import ForecastingService
+from app.services.telegram_scraper import TelegramPriceScraper
+from app.services.tick_buffer import SIDE_CODES, TickBuffers, TickRingBuffer
+
+START = datetime(2024, 2, 1)
+
+
+def ticks(count: int, start: datetime = START, step: timedelta = timedelta(minutes=7)):
+    """(timestamp, price, side) tuples in time order, prices wandering around 6.85."""
+    rng = np.random.default_rng(7)
+    prices = 6.85 + np.cumsum(rng.normal(0, 0.01, count))
+    return [
+        (start + i * step, float(price), i % 3)
+        for i, price in enumerate(prices)
+    ]
+
+
+@pytest.fixture
+def buffers(monkeypatch) -> TickBuffers:
+    """Fresh buffers installed as the process-wide ones."""
+    buffers = TickBuffers(capacity=5000, days=30)
+    monkeypatch.setattr(tick_buffer_module, "_tick_buffers", buffers)
+    return buffers
+
+
+class TestTickRingBuffer:
+    def test_window_after_wrapping_is_the_latest_ticks_in_order(self):
+        buffer = TickRingBuffer(capacity=5)
+        for timestamp, price, side in ticks(13):
+            buffer.append(timestamp, price, side)
+
+        window = buffer.window()
+        expected = ticks(13)[-5:]
+        assert len(buffer) == 5
+        assert list(window.prices) == [price for _, price, _ in expected]
+        assert list(window.sides) == [side for _, _, side in expected]
+        assert window.timestamps[0].astype(datetime) == expected[0][0]
+
+    def test_windows_are_views(self):
+        buffer = TickRingBuffer(capacity=5)
+        for timestamp, price, side in ticks(8):
+            buffer.append(timestamp, price, side)
+
+        window = buffer.window()
+        assert np.shares_memory(window.prices, buffer.prices)
+        assert np.shares_memory(window.timestamps, buffer.timestamps)
+
+    def test_window_since(self):
+        buffer = TickRingBuffer(capacity=100)
+        for timestamp, price, side in ticks(10, step=timedelta(hours=1)):
+            buffer.append(timestamp, price, side)
+
+        assert len(buffer.window(START + timedelta(hours=7)).prices) == 3
+        assert len(buffer.window(START + timedelta(hours=6, minutes=30)).prices) == 3
+        assert len(buffer.window(START + timedelta(days=1)).prices) == 0
+
+    def test_memory_is_fixed(self):
+        buffer = TickRingBuffer(capacity=50_000)
+        assert buffer.nbytes == 50_000 * TickRingBuffer.BYTES_PER_SLOT == 1_700_000
+
+    def test_coverage_moves_past_overwritten_ticks(self):
+        buffer = TickRingBuffer(capacity=3)
+        buffer.load([], [], [], complete_from=START)
+        for timestamp, price, side in ticks(5, step=timedelta(hours=1)):
+            buffer.append(timestamp, price, side)
+
+        assert not buffer.covers(START)
+        assert not buffer.covers(START + timedelta(hours=1))
+        assert buffer.covers(START + timedelta(hours=2))
+
+    def test_out_of_order_ticks_are_dropped(self):
+        buffer = TickRingBuffer(capacity=10)
+        buffer.load([], [], [], complete_from=START)
+        buffer.append(START + timedelta(hours=2), 6.9, 0)
+
+        assert not buffer.append(START + timedelta(hours=1), 6.8, 0)
+        assert buffer.dropped == 1
+        assert not buffer.covers(START)
+        assert buffer.covers(START + timedelta(hours=1, seconds=1))
+
+    def test_coverage_unknown_until_loaded(self):
+        buffer = TickRingBuffer(capacity=10)
+        buffer.append(START, 6.9, 0)
+        assert not buffer.covers(START - timedelta(days=1))
+
+
+# ---------------------------------------------------------------------------
+# Warm load and readers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def sessions(tmp_path):
+    """A scratch tick_data with about 10 days of USD/LYD ticks."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ticks.db'}")
+    now = datetime.now().replace(microsecond=0)
+    history = ticks(2000, start=now - timedelta(days=10))
+    async with engine.begin() as conn:
+        for model in (Channel, TickData):
+            await conn.run_sync(model.__table__.create)
+        await conn.execute(Channel.__table__.insert(), {"id": 1, "name": "EwanLibya"})
+        await conn.execute(TickData.__table__.insert(), [
+            {"id": i, "timestamp": timestamp, "currency_pair": "USD/LYD", "price": price,
+             "price_type": ("buy", "sell", "mid")[side], "source_channel": "EwanLibya",
+             "message_id": i}
+            for i, (timestamp, price, side) in enumerate(history, start=1)
+        ])
+    yield async_sessionmaker(engine, class_=AsyncSession)
+    await engine.dispose()
+
+
+class TestWarmLoad:
+    @pytest.mark.asyncio
+    async def test_load_keeps_the_latest_ticks(self, sessions):
+        buffers = TickBuffers(capacity=500, days=30)
+        async with sessions() as session:
+            await buffers.load(session)
+
+        stats = buffers.stats()
+        assert stats["loaded"]
+        assert stats["pairs"]["USD/LYD"]["ticks"] == 500
+        window = buffers.window("USD/LYD", datetime.now() - timedelta(days=1))
+        assert window is not None and len(window.prices) > 0
+        # Beyond the 500 held ticks: not covered
+        assert buffers.window("USD/LYD", datetime.now() - timedelta(days=5)) is None
+
+    @pytest.mark.asyncio
+    async def test_pairs_without_ticks_have_empty_windows(self, sessions):
+        buffers = TickBuffers(capacity=500, days=30)
+        async with sessions() as session:
+            await buffers.load(session)
+
+        assert len(buffers.window("EUR/LYD", datetime.now() - timedelta(days=1)).prices) == 0
+        assert buffers.window("EUR/LYD", datetime.now() - timedelta(days=60)) is None
+
+    def test_unloaded_buffers_are_never_read(self):
+        buffers = TickBuffers(capacity=10, days=30)
+        buffers.append("USD/LYD", "buy", 6.85, datetime.now())
+        assert buffers.window("USD/LYD", datetime.now() - timedelta(days=1)) is None
+
+
+class TestReaders:
+    @pytest.mark.asyncio
+    async def test_rsi_matches_the_database_path(self, buffers, sessions):
+        async with sessions() as session:
+            service = AnalysisService()
+            await service.set_db_session(session)
+            from_db = await service.calculate_rsi("USD/LYD")
+
+            await buffers.load(session)
+            assert buffers.window("USD/LYD", datetime.now() - timedelta(days=30)) is not None
+            from_memory = await service.calculate_rsi("USD/LYD")
+
+        assert from_memory == pytest.approx(from_db, abs=1e-9)
+
+    @pytest.mark.asyncio
+    async def test_rsi_from_memory_without_a_session(self, buffers):
+        buffers.loaded_from = datetime.now() - timedelta(days=30)
+        history = ticks(100, start=datetime.now() - timedelta(days=1), step=timedelta(minutes=1))
+        for timestamp, price, side in history:
+            buffers.append("USD/LYD", ("buy", "sell", "mid")[side], price, timestamp)
+
+        expected = RSIIndicator(pd.Series([price for _, price, _ in history]), window=14).rsi()
+        assert await AnalysisService().calculate_rsi("USD/LYD") == pytest.approx(expected.iloc[-1])
+
+    @pytest.mark.asyncio
+    async def test_daily_aggregation_matches_the_database_path(self, buffers, sessions):
+        async with sessions() as session:
+            service = ForecastingService()
+            await service.set_db_session(session)
+            from_db = await service._get_tick_data_aggregated("USD/LYD", 30)
+
+            await buffers.load(session)
+            assert buffers.window("USD/LYD", datetime.now() - timedelta(days=30)) is not None
+            from_memory = await service._get_tick_data_aggregated("USD/LYD", 30)
+
+        assert len(from_db) >= 10
+        assert list(from_memory["ds"]) == list(from_db["ds"])
+        np.testing.assert_allclose(from_memory["y"], from_db["y"], rtol=1e-12)
+
+    @pytest.mark.asyncio
+    async def test_scraper_appends_accepted_ticks(self, buffers):
+        buffers.loaded_from = datetime.now() - timedelta(days=30)
+        scraper = TelegramPriceScraper(api_id="0", api_hash="0")
+        await scraper.process_message("EwanLibya", 1, "USD buy 6.80 sell 6.90", [
+            {"currency_pair": "USD/LYD", "price": 6.80, "price_type": "buy"},
+            {"currency_pair": "USD/LYD", "price": 6.90, "price_type": "sell"},
+        ], False)
+
+        window = buffers.window("USD/LYD", datetime.now() - timedelta(minutes=1))
+        assert list(window.prices) == [6.80, 6.90]
+        assert list(window.sides) == [SIDE_CODES["buy"], SIDE_CODES["sell"]]
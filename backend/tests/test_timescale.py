@@ -0,0 +1,255 @@
+"""Tests for the OHLC continuous aggregates and the /data/ohlc query."""
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.data import get_ohlc_data
+from app.core import timescale
+from app.core.timescale import (
+    OHLC_RESOLUTIONS,
+    compression_sql,
+    continuous_aggregate_sql,
+    fetch_ohlc,
+    ohlc_sql,
+    refresh_policy_sql,
+    setup_timescale,
+    storage_report,
+)
+from app.models.data import Channel, TickData
+
+START = datetime(2024, 2, 8, 10, 0)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def bar_rows(count: int) -> list[SimpleNamespace]:
+    """Rows as the query returns them: newest bucket first."""
+    return [
+        SimpleNamespace(
+            bucket=START + timedelta(minutes=5 * i),
+            open=6.80 + i / 100, high=6.90 + i / 100, low=6.75 + i / 100,
+            close=6.85 + i / 100, ticks=3,
+        )
+        for i in reversed(range(count))
+    ]
+
+
+@pytest.fixture
+def db_session():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=bar_rows(3))
+    return session
+
+
+@pytest.fixture
+def aggregates(monkeypatch):
+    monkeypatch.setattr(timescale, "_aggregates_ready", True)
+    monkeypatch.setattr(timescale.settings, "TIMESCALE_ENABLED", True)
+
+
+def executed_sql(session) -> str:
+    return str(session.execute.call_args.args[0])
+
+
+# ---------------------------------------------------------------------------
+# SQL
+# ---------------------------------------------------------------------------
+
+class TestSql:
+    @pytest.mark.parametrize("resolution", list(OHLC_RESOLUTIONS))
+    def test_continuous_aggregate(self, resolution):
+        spec = OHLC_RESOLUTIONS[resolution]
+        sql = continuous_aggregate_sql(spec)
+        assert f"CREATE MATERIALIZED VIEW IF NOT EXISTS {spec.view}" in sql
+        assert "timescaledb.continuous" in sql
+        assert f"time_bucket(INTERVAL '{spec.interval}', timestamp)" in sql
+        assert "first(price, timestamp)" in sql and "last(price, timestamp)" in sql
+        assert "price_type," in sql
+        assert "GROUP BY bucket, currency_pair, price_type" in sql
+
+    def test_refresh_policy(self):
+        sql = refresh_policy_sql(OHLC_RESOLUTIONS["5m"])
+        assert "add_continuous_aggregate_policy('tick_ohlc_5m'" in sql
+        assert "if_not_exists => TRUE" in sql
+
+    def test_compression_segmented_by_pair(self):
+        alter, policy = compression_sql(14)
+        assert "timescaledb.compress_segmentby = 'currency_pair'" in alter
+        assert "add_compression_policy('tick_data'" in policy
+        assert "INTERVAL '14 days'" in policy
+
+    def test_fallback_groups_by_bucket(self):
+        sql = ohlc_sql(OHLC_RESOLUTIONS["1h"], use_aggregate=False)
+        assert "FROM tick_data" in sql
+        assert "date_trunc('hour', timestamp)" in sql
+        assert "GROUP BY 1" in sql
+        assert "tick_ohlc" not in sql
+
+    @pytest.mark.parametrize("use_aggregate", [True, False])
+    def test_bars_are_one_side(self, use_aggregate):
+        sql = ohlc_sql(OHLC_RESOLUTIONS["5m"], use_aggregate=use_aggregate)
+        assert "price_type = :price_type" in sql
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+class TestFetchOhlc:
+    @pytest.mark.asyncio
+    async def test_reads_the_aggregate_when_available(self, db_session, aggregates):
+        await fetch_ohlc(db_session, "USD/LYD", "1m", START, START + timedelta(hours=1), 100)
+        assert "FROM tick_ohlc_1m" in executed_sql(db_session)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_timescale(self, db_session, monkeypatch):
+        monkeypatch.setattr(timescale, "_aggregates_ready", False)
+        await fetch_ohlc(db_session, "USD/LYD", "5m", START, START + timedelta(hours=1), 100)
+        sql = executed_sql(db_session)
+        assert "FROM tick_data" in sql and "date_trunc" in sql
+
+    @pytest.mark.asyncio
+    async def test_bars_oldest_first(self, db_session, aggregates):
+        bars = await fetch_ohlc(db_session, "USD/LYD", "5m", START, START + timedelta(hours=1), 2)
+        assert [b["timestamp"] for b in bars] == sorted(b["timestamp"] for b in bars)
+        assert bars[0] == {
+            "timestamp": START, "open": 6.80, "high": 6.90, "low": 6.75, "close": 6.85, "ticks": 3,
+        }
+        params = db_session.execute.call_args.args[1]
+        assert params["limit"] == 2 and params["currency_pair"] == "USD/LYD"
+        assert params["price_type"] == "mid"
+
+    @pytest.mark.asyncio
+    async def test_endpoint(self, db_session, aggregates):
+        bars = await get_ohlc_data(
+            currency_pair="USD/LYD", resolution="1h", hours=48, limit=500,
+            price_type="sell", db=db_session,
+        )
+        assert len(bars) == 3
+        assert "FROM tick_ohlc_1h" in executed_sql(db_session)
+        params = db_session.execute.call_args.args[1]
+        assert params["end"] - params["start"] == timedelta(hours=48)
+        assert params["price_type"] == "sell"
+
+    @pytest.mark.asyncio
+    async def test_setup_skipped_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(timescale.settings, "TIMESCALE_ENABLED", False)
+        engine = AsyncMock()
+        assert await setup_timescale(engine) is False
+        engine.connect.assert_not_called()
+
+
+@pytest.fixture
+async def tick_session():
+    """tick_data in a scratch PostgreSQL schema (needs TEST_DATABASE_URL)."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set – skipping PostgreSQL OHLC tests")
+    schema = "test_timescale"
+    setup = create_async_engine(TEST_DATABASE_URL)
+    async with setup.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {schema}"))
+    await setup.dispose()
+
+    engine = create_async_engine(
+        TEST_DATABASE_URL, connect_args={"server_settings": {"search_path": schema}},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Channel.__table__.create)
+        await conn.run_sync(TickData.__table__.create)
+        await conn.execute(Channel.__table__.insert(), {"id": 1, "name": "EwanLibya"})
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    await engine.dispose()
+
+
+class TestMixedSides:
+    @pytest.mark.asyncio
+    async def test_buy_and_sell_ticks_make_separate_bars(self, tick_session, monkeypatch):
+        monkeypatch.setattr(timescale, "_aggregates_ready", False)
+        # Interleaved buy and sell quotes in one 5-minute bucket
+        ticks = [("buy", 6.90), ("sell", 6.95), ("buy", 6.88), ("sell", 6.99), ("buy", 6.92)]
+        tick_session.add_all([
+            TickData(
+                id=i, timestamp=START + timedelta(seconds=30 * i), currency_pair="USD/LYD",
+                price=price, price_type=side, source_channel="EwanLibya",
+            )
+            for i, (side, price) in enumerate(ticks)
+        ])
+        await tick_session.flush()
+
+        window = (START, START + timedelta(hours=1), 10)
+        buy = await fetch_ohlc(tick_session, "USD/LYD", "5m", *window, price_type="buy")
+        sell = await fetch_ohlc(tick_session, "USD/LYD", "5m", *window, price_type="sell")
+
+        assert [(b["open"], b["high"], b["low"], b["close"], b["ticks"]) for b in buy] == [
+            (6.90, 6.92, 6.88, 6.92, 3),
+        ]
+        assert [(b["open"], b["high"], b["low"], b["close"], b["ticks"]) for b in sell] == [
+            (6.95, 6.99, 6.95, 6.99, 2),
+        ]
+        assert await fetch_ohlc(tick_session, "USD/LYD", "5m", *window) == []
+
+
+# ---------------------------------------------------------------------------
+# Storage report
+# ---------------------------------------------------------------------------
+
+def chunk_row(name: str, compressed: bool, before=None, after=None, total=0):
+    return SimpleNamespace(
+        hypertable_name="tick_data", chunk_name=name,
+        range_start=START, range_end=START + timedelta(days=1),
+        is_compressed=compressed,
+        before_compression_total_bytes=before, after_compression_total_bytes=after,
+        total_bytes=after if compressed else total,
+    )
+
+
+class TestStorageReport:
+    @pytest.mark.asyncio
+    async def test_plain_postgres_reports_table_sizes(self, monkeypatch):
+        monkeypatch.setattr(timescale, "_timescale_ready", False)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=[
+            SimpleNamespace(table_name="telegram_messages", total_bytes=4096),
+        ])
+
+        report = await storage_report(session)
+
+        assert report["timescale"] is False
+        assert report["tables"]["telegram_messages"]["total_bytes"] == 4096
+        assert report["chunks"] == []
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_chunk_sizes_before_and_after_compression(self, monkeypatch):
+        monkeypatch.setattr(timescale, "_timescale_ready", True)
+        monkeypatch.setattr(timescale.settings, "TIMESCALE_ENABLED", True)
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[
+            [SimpleNamespace(table_name="tick_data", total_bytes=8192)],
+            [
+                chunk_row("_hyper_1_1_chunk", True, before=1_000_000, after=100_000),
+                chunk_row("_hyper_1_2_chunk", True, before=3_000_000, after=300_000),
+                chunk_row("_hyper_1_3_chunk", False, total=2_000_000),
+            ],
+        ])
+
+        report = await storage_report(session)
+
+        ticks = report["hypertables"]["tick_data"]
+        assert ticks["chunks"] == 3
+        assert ticks["compressed_chunks"] == 2
+        assert ticks["before_compression_bytes"] == 4_000_000
+        assert ticks["after_compression_bytes"] == 400_000
+        assert ticks["compression_ratio"] == 10.0
+        assert ticks["total_bytes"] == 2_400_000
+        assert report["tables"]["tick_data"]["total_bytes"] == 2_400_000
+        assert [c["compressed"] for c in report["chunks"]] == [True, True, False]
@@ -0,0 +1,136 @@
+"""Unit tests for WriteBehindBuffer – batched ingest writes."""
+import asyncio
+
+import pytest
+
+from app.models.data import TelegramMessage, TickData
+from app.services.write_behind import WriteBehindBuffer
+
+
+def tick_row(price: float = 6.85) -> dict:
+    return {"currency_pair": "USD/LYD", "price": price, "price_type": "mid"}
+
+
+def message_row(message_id: int = 1) -> dict:
+    return {"channel": "@EwanLibya", "message_id": message_id, "text": "x"}
+
+
+class TestWriteBehindBuffer:
+    @pytest.mark.asyncio
+    async def test_flush_issues_one_insert_per_table(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60)
+        await buffer.set_db_session(mock_db_session)
+
+        for i in range(5):
+            await buffer.put(TelegramMessage, message_row(i))
+            await buffer.put(TickData, tick_row())
+
+        written = await buffer.flush()
+
+        assert written == 10
+        assert mock_db_session.execute.await_count == 2
+        assert mock_db_session.commit.await_count == 1
+        # Messages were queued first, so they are inserted first
+        first_rows = mock_db_session.execute.await_args_list[0].args[1]
+        assert len(first_rows) == 5
+        assert first_rows[0]["channel"] == "@EwanLibya"
+
+    @pytest.mark.asyncio
+    async def test_size_trigger_flushes_without_loop(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=3, flush_interval=60)
+        await buffer.set_db_session(mock_db_session)
+
+        await buffer.put(TickData, tick_row())
+        await buffer.put(TickData, tick_row())
+        assert mock_db_session.commit.await_count == 0
+
+        await buffer.put(TickData, tick_row())
+        assert mock_db_session.commit.await_count == 1
+        assert buffer.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_time_trigger_flushes_in_background(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=0.01)
+        await buffer.set_db_session(mock_db_session)
+        await buffer.start()
+
+        await buffer.put(TickData, tick_row())
+        await asyncio.sleep(0.05)
+
+        assert buffer.rows_written == 1
+        await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_pending_rows(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60)
+        await buffer.set_db_session(mock_db_session)
+        await buffer.start()
+
+        for _ in range(7):
+            await buffer.put(TickData, tick_row())
+        await buffer.stop()
+
+        assert buffer.depth == 0
+        assert buffer.rows_written == 7
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rows_for_retry(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60)
+        await buffer.set_db_session(mock_db_session)
+        mock_db_session.commit.side_effect = [RuntimeError("db down"), None]
+
+        await buffer.put(TickData, tick_row())
+        assert await buffer.flush() == 0
+        assert buffer.depth == 1
+        assert mock_db_session.rollback.await_count == 1
+
+        assert await buffer.flush() == 1
+        assert buffer.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_drops_rows_when_full(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60, max_pending=2)
+        await buffer.set_db_session(mock_db_session)
+
+        async def fail_after_new_row():
+            # A row arrives while the flush is in flight
+            await buffer.put(TickData, tick_row())
+            raise RuntimeError("db down")
+
+        mock_db_session.commit.side_effect = fail_after_new_row
+
+        await buffer.put(TickData, tick_row())
+        await buffer.put(TickData, tick_row())
+        await buffer.flush()
+
+        assert buffer.depth == 1
+        assert buffer.rows_dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_new_rows_are_dropped_when_full(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60, max_pending=3)
+        await buffer.set_db_session(mock_db_session)
+
+        await buffer.put_many([(TelegramMessage, message_row(1)), (TickData, tick_row())])
+        # Would make 4 pending: dropped together, message and tick alike
+        await buffer.put_many([(TelegramMessage, message_row(2)), (TickData, tick_row())])
+        await buffer.put(TickData, tick_row())
+
+        assert buffer.depth == 3
+        assert buffer.rows_dropped == 2
+        assert await buffer.flush() == 3
+
+    @pytest.mark.asyncio
+    async def test_stats_report_depth_and_latency(self, mock_db_session):
+        buffer = WriteBehindBuffer(max_batch_size=100, flush_interval=60)
+        await buffer.set_db_session(mock_db_session)
+
+        await buffer.put(TickData, tick_row())
+        assert buffer.stats()["queue_depth"] == 1
+
+        await buffer.flush()
+        stats = buffer.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["max_queue_depth"] == 1
+        assert stats["flushes"] == 1
+        assert stats["flush_latency"]["count"] == 1
@@ -8,6 +8,9 @@ interface ChartProps {
   currencyPair?: string
 }
 
+// Hours of intraday bars loaded per timeframe
+const OHLC_HOURS = { "1m": 6, "5m": 24, "1h": 168 } as const
+
 export function PriceChart({ currencyPair = "USD/LYD" }: ChartProps) {
   const chartContainerRef = useRef<HTMLDivElement>(null)
   const chartRef = useRef<IChartApi | null>(null)
@@ -82,22 +85,40 @@ export function PriceChart({ currencyPair = "USD/LYD" }: ChartProps) {
     try {
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000"
       
-      // Fetch historical data
-      const response = await fetch(
-        `${apiUrl}/api/v1/data/daily?currency_pair=${currencyPair}&days=30`
+      // Fetch intraday bars for the selected timeframe
+      const ohlcResponse = await fetch(
+        `${apiUrl}/api/v1/data/ohlc?currency_pair=${currencyPair}&resolution=${timeframe}&hours=${OHLC_HOURS[timeframe]}`
       )
-      const data = await response.json()
-
-      if (data.length > 0 && candlestickSeriesRef.current) {
-        const candlestickData = data.map((d: any) => ({
-          time: new Date(d.date).getTime() / 1000,
-          open: d.open,
-          high: d.high,
-          low: d.low,
-          close: d.close,
+      const bars = ohlcResponse.ok ? await ohlcResponse.json() : []
+
+      if (bars.length > 0 && candlestickSeriesRef.current) {
+        const candlestickData = bars.map((b: any) => ({
+          time: new Date(b.timestamp).getTime() / 1000,
+          open: b.open,
+          high: b.high,
+          low: b.low,
+          close: b.close,
         }))
 
         candlestickSeriesRef.current.setData(candlestickData)
+      } else {
+        // No ticks yet: fall back to daily history
+        const response = await fetch(
+          `${apiUrl}/api/v1/data/daily?currency_pair=${currencyPair}&days=30`
+        )
+        const data = await response.json()
+
+        if (data.length > 0 && candlestickSeriesRef.current) {
+          const candlestickData = data.map((d: any) => ({
+            time: new Date(d.date).getTime() / 1000,
+            open: d.open,
+            high: d.high,
+            low: d.low,
+            close: d.close,
+          }))
+
+          candlestickSeriesRef.current.setData(candlestickData)
+        }
       }
 
       // Fetch forecast data